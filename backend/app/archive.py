@@ -0,0 +1,193 @@
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import Column, Index, MetaData, Table, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+from app.database import ARCHIVED_TABLES, SessionLocal, engine
+from app.models import Base, Meeting, RecurrenceRule, Reminder, Task
+from app.search import index_archived_rows, retain_search_entries
+from app.sync import next_version
+
+# Meetings and tasks dated, and reminders due, more than this many days ago
+# are moved to the archive database (0 disables archiving)
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ARCHIVE_AFTER_DAYS", "365"))
+# How often the background job runs (seconds)
+ARCHIVE_INTERVAL = float(os.environ.get("ARCHIVE_INTERVAL", "86400"))
+# Rows moved per transaction, so the write lock is only held briefly
+ARCHIVE_BATCH_SIZE = int(os.environ.get("ARCHIVE_BATCH_SIZE", "500"))
+
+archive_metadata = MetaData()
+
+
+def _archive_table(source: Table) -> Table:
+    """Same columns as `source` in the archive schema, without foreign keys
+    (participants and categories stay in the main database)."""
+    table = Table(
+        source.name,
+        archive_metadata,
+        *(
+            Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+            for column in source.columns
+        ),
+        schema="archive",
+    )
+    for index in source.indexes:
+        # Partial indexes serve hot-set jobs (e.g. pending reminders) only
+        if index.dialect_options["sqlite"]["where"] is None:
+            Index(index.name, *(table.c[column.name] for column in index.columns))
+    return table
+
+
+archive_tables = {name: _archive_table(Base.metadata.tables[name]) for name in ARCHIVED_TABLES}
+
+archive_metadata.create_all(bind=engine)
+with engine.begin() as connection:
+    index_archived_rows(connection)
+
+
+def archive_cutoff() -> date:
+    return date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+
+def _move(db: Session, name: str, ids: list[int], links: tuple[tuple[str, str], ...]):
+    """Copy rows `ids` of table `name`, and their rows in the `links`
+    association tables, to the archive and delete them from the hot tables."""
+
+    def copy(table: Table, condition):
+        columns = [column.name for column in table.columns]
+        # OR REPLACE makes a batch safe to move again if a previous run
+        # committed the archive copy but not the delete
+        db.execute(
+            insert(archive_tables[table.name])
+            .prefix_with("OR REPLACE")
+            .from_select(columns, select(table).where(condition))
+        )
+        db.execute(delete(table).where(condition))
+
+    for link_name, owner_column in links:
+        link = Base.metadata.tables[link_name]
+        copy(link, link.c[owner_column].in_(ids))
+    table = Base.metadata.tables[name]
+    copy(table, table.c.id.in_(ids))
+
+
+def _move_all(db: Session, name: str, id_query, links: tuple[tuple[str, str], ...]) -> int:
+    moved = 0
+    while True:
+        ids = db.scalars(id_query.limit(ARCHIVE_BATCH_SIZE)).all()
+        if not ids:
+            return moved
+        # Archived rows stay searchable with include_archived
+        with retain_search_entries(db):
+            _move(db, name, ids, links)
+        # Nothing is reported to /sync clients, but the version is what
+        # validates cached exports (the calendar feed's ETag), which no
+        # longer contain these rows
+        next_version(db)
+        db.commit()
+        moved += len(ids)
+
+
+def archive_before(db: Session, cutoff: date) -> dict:
+    """Move meetings and tasks dated before `cutoff`, and reminders due
+    before it or belonging to an archived meeting or task, to the archive.
+
+    Meetings with a recurrence rule stay hot, since the series (and its
+    stored occurrences) may continue past the cutoff. Archived rows no
+    longer change: they aren't reported as deletions to /sync clients and
+    can't be updated through the API. They keep their search index entries
+    and are found by GET /search/?include_archived=true.
+    """
+    counts = {
+        "meetings": _move_all(
+            db,
+            "meetings",
+            select(Meeting.id)
+            .where(Meeting.date < cutoff, Meeting.id.not_in(select(RecurrenceRule.meeting_id)))
+            .order_by(Meeting.id),
+            (("meeting_participant", "meeting_id"), ("category_meeting", "meeting_id")),
+        ),
+        "tasks": _move_all(
+            db,
+            "tasks",
+            select(Task.id).where(Task.due_date < cutoff).order_by(Task.id),
+            (("task_participant", "task_id"), ("category_task", "task_id")),
+        ),
+    }
+    counts["reminders"] = _move_all(
+        db,
+        "reminders",
+        select(Reminder.id)
+        .where(
+            or_(
+                Reminder.reminder_time < datetime.combine(cutoff, time.min),
+                Reminder.meeting_id.in_(select(archive_tables["meetings"].c.id)),
+                Reminder.task_id.in_(select(archive_tables["tasks"].c.id)),
+            )
+        )
+        .order_by(Reminder.id),
+        (("reminder_participant", "reminder_id"),),
+    )
+    return counts
+
+
+def archive_stats(db: Session) -> dict:
+    stats = {}
+    for name in ("meetings", "tasks", "reminders"):
+        stats[name] = {
+            "hot": db.scalar(select(func.count()).select_from(Base.metadata.tables[name])),
+            "archived": db.scalar(select(func.count()).select_from(archive_tables[name])),
+        }
+    return stats
+
+
+class Archiver:
+    """Background job that moves old rows out of the hot tables."""
+
+    def __init__(self, interval: float = ARCHIVE_INTERVAL):
+        self.interval = interval
+        self.last_run = None
+        self._thread = None
+        self._stopping = threading.Event()
+        # Keeps a manual run and the scheduled one from moving the same rows
+        self._running = threading.Lock()
+
+    def run(self) -> dict:
+        cutoff = archive_cutoff()
+        with self._running:
+            db = SessionLocal()
+            try:
+                counts = archive_before(db, cutoff)
+            finally:
+                db.close()
+        self.last_run = {"at": datetime.now().isoformat(), "cutoff": str(cutoff), "moved": counts}
+        if any(counts.values()):
+            print(f"[INFO] Archived rows older than {cutoff}: {counts}")
+        return counts
+
+    def start(self):
+        if self._thread is not None or ARCHIVE_AFTER_DAYS <= 0:
+            return
+        self._stopping.clear()
+        # The first pass may have a lot of history to move, so it runs on the
+        # job's thread rather than delaying startup
+        self._thread = threading.Thread(target=self._run, name="archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.run()
+            except Exception as e:
+                print(f"[WARNING] Archiving failed: {e}")
+            if self._stopping.wait(self.interval):
+                return
+
+
+archiver = Archiver()
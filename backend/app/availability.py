@@ -0,0 +1,257 @@
+from bisect import bisect_right
+from itertools import islice
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Meeting, Occurrence, RecurrenceRule, meeting_participant
+from app.occurrences import occurrence_maintainer
+from app.recurrence import expand_rule
+from app.loading import RECURRENCE_WITH_MEETING
+
+Interval = tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: list[Interval]) -> list[Interval]:
+    """Sort and coalesce overlapping or touching intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def load_busy_intervals(
+    db: Session, participant_ids: list[int], start: date, end: date
+) -> dict[int, list[Interval]]:
+    """Per-participant merged busy intervals for meetings dated in [start, end).
+
+    Both one-off meetings and materialised recurring occurrences are read
+    through the participant side of meeting_participant, so only the
+    requested participants' rows inside the window are touched.
+    """
+    busy = {participant_id: [] for participant_id in participant_ids}
+    mp = meeting_participant
+
+    def add(participant_id, day, start_time, end_time):
+        busy[participant_id].append(
+            (datetime.combine(day, start_time), datetime.combine(day, end_time))
+        )
+
+    meetings = db.execute(
+        select(mp.c.participant_id, Meeting.date, Meeting.start_time, Meeting.end_time)
+        .join(Meeting, Meeting.id == mp.c.meeting_id)
+        .where(
+            mp.c.participant_id.in_(participant_ids),
+            Meeting.date >= start,
+            Meeting.date < end,
+        )
+    )
+    for row in meetings:
+        add(*row)
+
+    horizon = occurrence_maintainer.horizon
+    stored_end = min(end, horizon) if horizon else start
+    if start < stored_end:
+        occurrences = db.execute(
+            select(
+                mp.c.participant_id,
+                Occurrence.occurrence_date,
+                Occurrence.start_time,
+                Occurrence.end_time,
+            )
+            .join(Occurrence, Occurrence.meeting_id == mp.c.meeting_id)
+            .where(
+                mp.c.participant_id.in_(participant_ids),
+                Occurrence.occurrence_date >= start,
+                Occurrence.occurrence_date < stored_end,
+            )
+        )
+        for row in occurrences:
+            add(*row)
+
+    if stored_end < end:
+        # Past the materialised horizon: expand these participants' rules directly
+        rules = (
+            db.query(RecurrenceRule, mp.c.participant_id)
+            .select_from(RecurrenceRule)
+            .join(Meeting, RecurrenceRule.meeting_id == Meeting.id)
+            .join(mp, mp.c.meeting_id == Meeting.id)
+            .options(*RECURRENCE_WITH_MEETING)
+            .filter(mp.c.participant_id.in_(participant_ids), Meeting.date < end)
+            .all()
+        )
+        for rule, participant_id in rules:
+            meeting = rule.meeting
+            for day in expand_rule(rule, max(start, stored_end), end):
+                add(participant_id, day, meeting.start_time, meeting.end_time)
+
+    return {
+        participant_id: merge_intervals(intervals)
+        for participant_id, intervals in busy.items()
+    }
+
+
+def working_windows(
+    start: datetime,
+    end: datetime,
+    day_start: time,
+    day_end: time,
+    include_weekends: bool,
+) -> list[Interval]:
+    windows = []
+    day = start.date()
+    while day <= end.date():
+        if include_weekends or day.weekday() < 5:
+            window_start = max(start, datetime.combine(day, day_start))
+            window_end = min(end, datetime.combine(day, day_end))
+            if window_start < window_end:
+                windows.append((window_start, window_end))
+        day += timedelta(days=1)
+    return windows
+
+
+def find_free_slots(
+    busy: dict[int, list[Interval]],
+    windows: list[Interval],
+    duration: timedelta,
+    max_results: int,
+    mode: str = "earliest",
+) -> list[Interval]:
+    """Common free slots of at least `duration` inside the given windows.
+
+    Sweep line: the start and end points of every participant's busy
+    intervals are walked in time order while counting how many participants
+    are busy. Wherever the count is zero inside a window, everyone is free.
+    "earliest" returns slots in time order; "best" prefers the slots with
+    the most free time around them.
+    """
+    points = []
+    for intervals in busy.values():
+        for busy_start, busy_end in intervals:
+            points.append((busy_start, 1))
+            points.append((busy_end, -1))
+    # At equal times process ends before starts so back-to-back meetings leave no gap
+    points.sort(key=lambda p: (p[0], p[1]))
+
+    # Number of participants busy right after each point, so each window can
+    # start its scan with a binary search instead of walking from the beginning
+    running = []
+    busy_count = 0
+    for _, delta in points:
+        busy_count += delta
+        running.append(busy_count)
+
+    gaps = []
+    for window_start, window_end in windows:
+        first = bisect_right(points, (window_start, 1))
+        busy_count = running[first - 1] if first else 0
+        gaps.extend(_free_gaps(points, first, busy_count, window_start, window_end))
+
+    gaps = [(s, e) for s, e in gaps if e - s >= duration]
+    if mode == "best":
+        gaps.sort(key=lambda g: (-(g[1] - g[0]), g[0]))
+    return [(s, s + duration) for s, e in gaps[:max_results]]
+
+
+def _free_gaps(
+    points: list, first: int, busy_count: int, window_start: datetime, window_end: datetime
+) -> list[Interval]:
+    gaps = []
+    cursor = window_start
+    for at, delta in islice(points, first, None):
+        if at >= window_end:
+            break
+        if busy_count == 0 and delta == 1 and at > cursor:
+            gaps.append((cursor, at))
+        busy_count += delta
+        if busy_count == 0:
+            cursor = at
+    if busy_count == 0 and cursor < window_end:
+        gaps.append((cursor, window_end))
+    return gaps
+
+
+def find_conflicts(
+    db: Session,
+    participant_ids: list[int],
+    day: date,
+    start_time: time,
+    end_time: time,
+) -> list[dict]:
+    """Meetings (one-off or recurring) on `day` that overlap [start_time, end_time)
+    for any of the participants, with the participants they clash for.
+
+    Each lookup goes through the participant index on meeting_participant
+    and is bounded to a single date, so its cost doesn't grow with the
+    size of the meetings table.
+    """
+    mp = meeting_participant
+    clashes = {}
+
+    rows = db.execute(
+        select(mp.c.meeting_id, mp.c.participant_id)
+        .join(Meeting, Meeting.id == mp.c.meeting_id)
+        .where(
+            mp.c.participant_id.in_(participant_ids),
+            Meeting.date == day,
+            Meeting.start_time < end_time,
+            Meeting.end_time > start_time,
+        )
+    ).all()
+
+    horizon = occurrence_maintainer.horizon
+    if horizon and day < horizon:
+        rows += db.execute(
+            select(mp.c.meeting_id, mp.c.participant_id)
+            .join(Occurrence, Occurrence.meeting_id == mp.c.meeting_id)
+            .where(
+                mp.c.participant_id.in_(participant_ids),
+                Occurrence.occurrence_date == day,
+                Occurrence.start_time < end_time,
+                Occurrence.end_time > start_time,
+            )
+        ).all()
+    else:
+        rules = (
+            db.query(RecurrenceRule, mp.c.participant_id)
+            .select_from(RecurrenceRule)
+            .join(Meeting, RecurrenceRule.meeting_id == Meeting.id)
+            .join(mp, mp.c.meeting_id == Meeting.id)
+            .options(*RECURRENCE_WITH_MEETING)
+            .filter(
+                mp.c.participant_id.in_(participant_ids),
+                Meeting.date <= day,
+                Meeting.start_time < end_time,
+                Meeting.end_time > start_time,
+            )
+            .all()
+        )
+        for rule, participant_id in rules:
+            if expand_rule(rule, day, day + timedelta(days=1)):
+                rows.append((rule.meeting_id, participant_id))
+
+    for meeting_id, participant_id in rows:
+        clashes.setdefault(meeting_id, set()).add(participant_id)
+    if not clashes:
+        return []
+
+    meetings = (
+        db.query(Meeting.id, Meeting.title, Meeting.start_time, Meeting.end_time)
+        .filter(Meeting.id.in_(clashes))
+        .order_by(Meeting.start_time)
+        .all()
+    )
+    return [
+        {
+            "id": m.id,
+            "title": m.title,
+            "date": str(day),
+            "start_time": str(m.start_time),
+            "end_time": str(m.end_time),
+            "participant_ids": sorted(clashes[m.id]),
+        }
+        for m in meetings
+    ]
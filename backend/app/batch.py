@@ -0,0 +1,103 @@
+from typing import Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy import Table, insert, select, update
+from sqlalchemy.orm import Session
+
+MAX_BATCH_SIZE = 1000
+
+
+OPERATION_ORDER = {"create": 0, "update": 1, "delete": 2}
+
+
+class BatchResults:
+    """Per-item outcome of a batch request."""
+
+    def __init__(self):
+        self.items = []
+
+    def ok(self, op: str, index: int, item_id: int):
+        self.items.append({"op": op, "index": index, "id": item_id, "status": "ok"})
+
+    def error(self, op: str, index: int, detail: str, item_id: int = None):
+        self.items.append(
+            {"op": op, "index": index, "id": item_id, "status": "error", "detail": detail}
+        )
+
+    def as_response(self) -> dict:
+        items = sorted(
+            self.items, key=lambda item: (OPERATION_ORDER[item["op"]], item["index"])
+        )
+        failed = sum(1 for item in items if item["status"] == "error")
+        return {
+            "results": items,
+            "summary": {"ok": len(self.items) - failed, "error": failed},
+        }
+
+
+def check_batch_size(*operations: list):
+    if sum(len(op) for op in operations) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400, detail=f"A batch cannot exceed {MAX_BATCH_SIZE} items"
+        )
+
+
+def collect_ids(items: Iterable, field: str) -> set:
+    ids = set()
+    for item in items:
+        ids.update(getattr(item, field, None) or [])
+    return ids
+
+
+def item_error(item, model, link_fields: tuple[str, ...] = ()) -> Optional[str]:
+    """Problems with a batch item that its request model doesn't catch.
+
+    An explicit null for a NOT NULL column would fail the whole batch at
+    write time, and a repeated id in a link list (e.g. participant_ids)
+    would break the association table's primary key.
+    """
+    columns = model.__table__.columns
+    for name in sorted(item.model_fields_set):
+        if name in columns and not columns[name].nullable and getattr(item, name) is None:
+            return f"{name} cannot be null"
+    for field in link_fields:
+        ids = getattr(item, field, None) or []
+        if len(ids) != len(set(ids)):
+            return f"{field} contains repeated ids"
+    return None
+
+
+def time_order_error(start, end) -> Optional[str]:
+    if start is not None and end is not None and end <= start:
+        return "end_time must be after start_time"
+    return None
+
+
+def bulk_insert(db: Session, model, rows: list[dict], version: int) -> list[int]:
+    """INSERT all rows with one executemany and return their ids in row order.
+
+    Every row carries the batch's freshly reserved sync `version`, which no
+    other row has, so the new ids can be read back with one indexed query.
+    SQLite hands out increasing rowids within the write transaction, so
+    ordering by id matches the order of `rows`. (RETURNING would force
+    SQLite to insert one row per statement to keep the order.)
+    """
+    if not rows:
+        return []
+    db.execute(insert(model), [{**row, "version": version} for row in rows])
+    return db.scalars(
+        select(model.id).where(model.version == version).order_by(model.id)
+    ).all()
+
+
+def bulk_update(db: Session, model, rows: list[dict]):
+    """UPDATE by primary key; rows sharing the same columns go in one executemany."""
+    if rows:
+        db.execute(update(model), rows)
+
+
+def replace_links(db: Session, table: Table, owner_column: str, owner_ids, rows: list[dict]):
+    """Swap the association rows of the given owners for `rows`."""
+    if owner_ids:
+        db.execute(table.delete().where(table.c[owner_column].in_(owner_ids)))
+    if rows:
+        db.execute(table.insert(), rows)
@@ -1,11 +1,207 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 db_folder = os.path.join(os.path.dirname(__file__), "../data")
 os.makedirs(db_folder, exist_ok=True)
 
-DATABASE_URL = f"sqlite:///{os.path.join(db_folder, 'app.db')}"
+DATABASE_PATH = os.environ.get("DATABASE_PATH", os.path.join(db_folder, "app.db"))
+DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+# Cold storage for old meetings, tasks and reminders (see app.archive),
+# attached to every connection as the "archive" schema
+ARCHIVE_DATABASE_PATH = os.environ.get(
+    "ARCHIVE_DATABASE_PATH", os.path.join(db_folder, "archive.db")
+)
+# Tables with an archive counterpart of the same name and columns
+ARCHIVED_TABLES = (
+    "meetings",
+    "tasks",
+    "reminders",
+    "meeting_participant",
+    "category_meeting",
+    "task_participant",
+    "category_task",
+    "reminder_participant",
+)
+
+# SQLite tuning, applied to every new connection
+SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+# NORMAL is durable in WAL mode except for the last commits on power loss
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Negative values are KiB, so this is a 64 MB page cache per connection
+SQLITE_CACHE_SIZE = int(os.environ.get("SQLITE_CACHE_SIZE", "-65536"))
+# How long (ms) a connection waits for a lock before failing with "database is locked"
+SQLITE_BUSY_TIMEOUT = int(os.environ.get("SQLITE_BUSY_TIMEOUT", "5000"))
+
+# Connection pools; readers get their own so they never queue behind writers
+SQLITE_POOL_SIZE = int(os.environ.get("SQLITE_POOL_SIZE", "5"))
+SQLITE_MAX_OVERFLOW = int(os.environ.get("SQLITE_MAX_OVERFLOW", "5"))
+SQLITE_READ_POOL_SIZE = int(os.environ.get("SQLITE_READ_POOL_SIZE", "10"))
+SQLITE_READ_MAX_OVERFLOW = int(os.environ.get("SQLITE_READ_MAX_OVERFLOW", "10"))
+SQLITE_ARCHIVE_POOL_SIZE = int(os.environ.get("SQLITE_ARCHIVE_POOL_SIZE", "2"))
+SQLITE_POOL_TIMEOUT = float(os.environ.get("SQLITE_POOL_TIMEOUT", "30"))
+
+
+def _configure(sqlite_engine, begin: str, read_only: bool, with_archive: bool = False):
+    @event.listens_for(sqlite_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        # Let SQLAlchemy issue BEGIN itself (see below) instead of the
+        # driver's implicit transactions
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        # Attached before the pragmas so that journal_mode applies to it too
+        cursor.execute("ATTACH DATABASE ? AS archive", (ARCHIVE_DATABASE_PATH,))
+        if with_archive:
+            # Unqualified names resolve to temp objects first, so on these
+            # connections every query sees hot and archived rows together
+            for table in ARCHIVED_TABLES:
+                cursor.execute(
+                    f"CREATE TEMP VIEW {table} AS "
+                    f"SELECT * FROM main.{table} UNION ALL SELECT * FROM archive.{table}"
+                )
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    @event.listens_for(sqlite_engine, "begin")
+    def begin_transaction(connection):
+        connection.exec_driver_sql(begin)
+
+
+def _create_engine(
+    pool_size: int, max_overflow: int, begin: str, read_only: bool, with_archive: bool = False
+):
+    sqlite_engine = create_engine(
+        DATABASE_URL,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": SQLITE_BUSY_TIMEOUT / 1000,
+        },
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=SQLITE_POOL_TIMEOUT,
+    )
+    _configure(sqlite_engine, begin, read_only, with_archive)
+    return sqlite_engine
+
+
+def _create_async_engine(
+    pool_size: int, max_overflow: int, begin: str, read_only: bool, with_archive: bool = False
+):
+    sqlite_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        connect_args={"timeout": SQLITE_BUSY_TIMEOUT / 1000},
+        # aiosqlite defaults to NullPool for files, i.e. a new connection
+        # (and thread) per session
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=SQLITE_POOL_TIMEOUT,
+    )
+    _configure(sqlite_engine.sync_engine, begin, read_only, with_archive)
+    return sqlite_engine
+
+
+# Write transactions take the write lock up front (BEGIN IMMEDIATE). A
+# deferred transaction that reads first and writes later can't wait for the
+# lock when another writer got in between and fails with "database is
+# locked" straight away; IMMEDIATE makes it wait up to busy_timeout instead.
+engine = _create_engine(SQLITE_POOL_SIZE, SQLITE_MAX_OVERFLOW, "BEGIN IMMEDIATE", False)
+# Readers see a consistent snapshot for the whole transaction and, in WAL
+# mode, never wait for writers
+read_engine = _create_engine(SQLITE_READ_POOL_SIZE, SQLITE_READ_MAX_OVERFLOW, "BEGIN", True)
+# Read-only and for the explicit include_archived paths only
+archive_read_engine = _create_engine(
+    SQLITE_ARCHIVE_POOL_SIZE, SQLITE_READ_MAX_OVERFLOW, "BEGIN", True, with_archive=True
+)
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+ArchiveReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=archive_read_engine)
+
+# Async counterparts (SQLAlchemy asyncio on aiosqlite) for async def handlers,
+# which wait on SQLite without holding a threadpool worker. The same pragmas
+# and BEGIN behaviour apply. Objects are not expired on commit because
+# reloading them would be implicit IO, which AsyncSession doesn't allow; sync
+# helpers can still be called with `await session.run_sync(helper, ...)`.
+async_engine = _create_async_engine(SQLITE_POOL_SIZE, SQLITE_MAX_OVERFLOW, "BEGIN IMMEDIATE", False)
+async_read_engine = _create_async_engine(
+    SQLITE_READ_POOL_SIZE, SQLITE_READ_MAX_OVERFLOW, "BEGIN", True
+)
+async_archive_read_engine = _create_async_engine(
+    SQLITE_ARCHIVE_POOL_SIZE, SQLITE_READ_MAX_OVERFLOW, "BEGIN", True, with_archive=True
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, autoflush=False, expire_on_commit=False
+)
+AsyncArchiveReadSessionLocal = async_sessionmaker(
+    async_archive_read_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def get_db():
+    """Read-write session dependency, for endpoints that change data."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db():
+    """Read-only session dependency, for endpoints that only query."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_list_db(include_archived: bool = False):
+    """Read-only session that also sees archived rows with `?include_archived=true`."""
+    db = ArchiveReadSessionLocal() if include_archived else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Read-write AsyncSession dependency."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """Read-only AsyncSession dependency."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def get_async_list_db(include_archived: bool = False):
+    """Read-only AsyncSession for list endpoints.
+
+    Sees only the hot tables unless the request asks for
+    `?include_archived=true`.
+    """
+    factory = AsyncArchiveReadSessionLocal if include_archived else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
+
+
+async def dispose_async_engines():
+    # aiosqlite runs each connection on a non-daemon thread, so pooled
+    # connections have to be closed for the process to exit
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+    await async_archive_read_engine.dispose()
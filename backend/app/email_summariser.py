@@ -1,5 +1,12 @@
+import asyncio
 import os
 import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
 from dotenv import load_dotenv
 from langchain.docstore.document import Document
 from langchain_community.document_loaders import PyPDFLoader
@@ -7,12 +14,27 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_openai.embeddings import OpenAIEmbeddings
 from langchain_openai import ChatOpenAI
 from langchain_chroma import Chroma
+from app.embedding_cache import CachedEmbeddings, EmbeddingCache, chunk_id
+from app.email_threads import normalise_thread
+from app.summary_cache import SummaryAbandoned, summary_cache, summary_key
 
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # Or pass in as param
-EMBEDDINGS = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
+# Embeddings already computed for a text are reused from this file, across users
+EMBEDDING_CACHE_PATH = os.environ.get("EMBEDDING_CACHE_PATH", "./chromadb/embedding_cache.db")
+_openai_embeddings = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
+EMBEDDINGS = CachedEmbeddings(
+    _openai_embeddings, EmbeddingCache(EMBEDDING_CACHE_PATH), model=_openai_embeddings.model
+)
 MODEL_NAME = "gpt-4"  # or "gpt-3.5-turbo", etc.
+# Earlier chunks passed to the model as context
+RETRIEVAL_QUERY = "email summary"
+RETRIEVAL_K = 4
+# Per-user Chroma stores kept open between requests
+VECTOR_STORE_CACHE_SIZE = int(os.environ.get("VECTOR_STORE_CACHE_SIZE", "32"))
+# Seconds an unused store stays open
+VECTOR_STORE_IDLE_TIMEOUT = float(os.environ.get("VECTOR_STORE_IDLE_TIMEOUT", "600"))
 
 
 def get_persist_directory(user_id: str) -> str:
@@ -37,51 +59,237 @@ def text_to_documents(text: str) -> list[Document]:
     return [Document(page_content=text)]
 
 
+def normalise_documents(docs: list[Document]) -> list[Document]:
+    """Strip quoted history, signatures and disclaimers before splitting,
+    embedding and prompting (see app.email_threads)."""
+    seen = set()  # Shared so that pages of one PDF dedupe against each other
+    normalised = []
+    for doc in docs:
+        text = normalise_thread(doc.page_content, seen)
+        if text:
+            normalised.append(Document(page_content=text, metadata=doc.metadata))
+    before = sum(len(doc.page_content) for doc in docs)
+    after = sum(len(doc.page_content) for doc in normalised)
+    print(f"[INFO] Normalised email thread from {before} to {after} characters")
+    # Nothing recognisable as new content; better to send it as it was
+    return normalised or docs
+
+
 def split_documents(docs: list[Document]) -> list[Document]:
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
     return text_splitter.split_documents(docs)
 
 
-def create_new_vector_store(docs: list[Document], persist_directory: str):
-    print("[INFO] Creating a new Chroma store...")
-    db = Chroma.from_documents(
-        documents=docs,
-        embedding=EMBEDDINGS,
-        persist_directory=persist_directory,
-    )
-    return db
-
-
 def load_existing_vector_store(persist_directory: str) -> Chroma:
+    # Creates the store if the directory doesn't exist yet
     print("[INFO] Loading existing Chroma store...")
     db = Chroma(persist_directory=persist_directory, embedding_function=EMBEDDINGS)
     return db
 
 
-def update_vector_store(user_id: str, new_docs: list[Document]) -> Chroma:
-    persist_directory = get_persist_directory(user_id)
-    print(f"[DEBUG] Number of input documents: {len(new_docs)}")
-
-    for doc in new_docs:
+def close_vector_store(db: Chroma):
+    """Stop the chromadb System behind `db`, releasing its files and memory.
+
+    chromadb keeps one System per persist directory in a class-level
+    registry, so dropping the Chroma object alone doesn't free anything.
+    """
+    try:
+        client = db._client
+        system = type(client)._identifier_to_system.pop(client._identifier, None)
+        if system is not None:
+            system.stop()
+    except Exception as e:
+        print(f"[WARNING] Failed to close Chroma store: {e}")
+
+
+@dataclass
+class _OpenStore:
+    store: Chroma
+    last_used: float
+    users: int = 0
+    # Dropped from the cache while in use; closed when the last user is done
+    evicted: bool = False
+
+
+class VectorStoreCache:
+    """Process-wide cache of open per-user Chroma stores.
+
+    Opening a store builds a chromadb client and loads its collection, which
+    used to happen twice per summary. Stores are keyed by persist directory,
+    kept in LRU order and capped at `max_open`; stores unused for
+    `idle_timeout` seconds are closed on the next access. A store that is
+    evicted while a request is still using it is closed once released.
+    """
+
+    def __init__(
+        self,
+        max_open: int = VECTOR_STORE_CACHE_SIZE,
+        idle_timeout: float = VECTOR_STORE_IDLE_TIMEOUT,
+        open_store: Callable[[str], Chroma] = load_existing_vector_store,
+        close_store: Callable[[Chroma], None] = close_vector_store,
+    ):
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._open_store = open_store
+        self._close_store = close_store
+        self._stores: OrderedDict[str, _OpenStore] = OrderedDict()
+        # Evicted while in use, waiting for their last user
+        self._draining: dict[str, _OpenStore] = {}
+        self._lock = threading.Lock()
+        # One lock per directory being opened, so concurrent first requests
+        # for a user open the store once without blocking other users
+        self._opening: dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def use(self, persist_directory: str) -> Iterator[Chroma]:
+        entry = self._acquire(persist_directory)
+        try:
+            yield entry.store
+        finally:
+            self._release(persist_directory, entry)
+
+    def _acquire(self, persist_directory: str) -> _OpenStore:
+        with self._lock:
+            evicted = self._evict_idle()
+            entry = self._checkout(persist_directory)
+            if entry is None:
+                opening = self._opening.setdefault(persist_directory, threading.Lock())
+            else:
+                # A store taken back from draining can push the cache over the cap
+                evicted += self._evict_over_capacity()
+        # Closing touches disk, so it happens outside the lock; the stores
+        # are already out of the cache
+        for store in evicted:
+            self._close_store(store)
+        if entry is not None:
+            return entry
+
+        with opening:
+            with self._lock:
+                # Opened by another request while this one waited
+                entry = self._checkout(persist_directory)
+                if entry is not None:
+                    return entry
+                self.misses += 1
+            store = self._open_store(persist_directory)
+            with self._lock:
+                entry = _OpenStore(store=store, last_used=time.monotonic(), users=1)
+                self._stores[persist_directory] = entry
+                self._opening.pop(persist_directory, None)
+                evicted = self._evict_over_capacity()
+        for store in evicted:
+            self._close_store(store)
+        return entry
+
+    def _checkout(self, persist_directory: str):
+        entry = self._stores.get(persist_directory)
+        if entry is None and persist_directory in self._draining:
+            # Still open, and chromadb would hand a new client the same
+            # System anyway, so take it back instead of opening another
+            entry = self._draining.pop(persist_directory)
+            entry.evicted = False
+            self._stores[persist_directory] = entry
+        if entry is not None:
+            self._stores.move_to_end(persist_directory)
+            entry.users += 1
+            self.hits += 1
+        return entry
+
+    def _release(self, persist_directory: str, entry: _OpenStore):
+        with self._lock:
+            entry.users -= 1
+            entry.last_used = time.monotonic()
+            close = entry.evicted and entry.users == 0
+            if close:
+                self._draining.pop(persist_directory, None)
+        if close:
+            self._close_store(entry.store)
+
+    def _evict(self, persist_directory: str) -> list[Chroma]:
+        entry = self._stores.pop(persist_directory)
+        if entry.users:
+            entry.evicted = True
+            self._draining[persist_directory] = entry
+            return []
+        return [entry.store]
+
+    def _evict_over_capacity(self) -> list[Chroma]:
+        evicted = []
+        while len(self._stores) > self.max_open:
+            oldest = next(iter(self._stores))
+            evicted += self._evict(oldest)
+        return evicted
+
+    def _evict_idle(self) -> list[Chroma]:
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [
+            directory
+            for directory, entry in self._stores.items()
+            if entry.users == 0 and entry.last_used < cutoff
+        ]
+        evicted = []
+        for directory in idle:
+            evicted += self._evict(directory)
+        return evicted
+
+    def close_all(self):
+        with self._lock:
+            evicted = []
+            for directory in list(self._stores):
+                evicted += self._evict(directory)
+        for store in evicted:
+            self._close_store(store)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "open": len(self._stores),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else None,
+            }
+
+
+vector_stores = VectorStoreCache()
+
+
+def prepare_chunks(docs: list[Document]) -> dict[str, Document]:
+    """Split `docs` into chunks keyed by content hash (repeats collapse)."""
+    print(f"[DEBUG] Number of input documents: {len(docs)}")
+
+    for doc in docs:
         print(f"[DEBUG] Document content: {doc.page_content[:100]}...")
 
-    splitted_docs = split_documents(new_docs)
+    splitted_docs = split_documents(docs)
     print(f"[DEBUG] Number of split documents: {len(splitted_docs)}")
 
     if len(splitted_docs) == 0:
         raise ValueError(
             "No content to add to vector store. Check the input documents."
         )
+    return {chunk_id(doc.page_content): doc for doc in splitted_docs}
+
+
+def store_chunks(persist_directory: str, chunks: dict[str, Document]):
+    # Chunks are stored under their content hash, so text that is already in
+    # the store (e.g. quoted again in a forwarded thread) is skipped before
+    # it costs an embedding or a second vector
+    with vector_stores.use(persist_directory) as db:
+        existing = set(db.get(ids=list(chunks), include=[])["ids"])
+        new_docs = {id: doc for id, doc in chunks.items() if id not in existing}
+        if new_docs:
+            db.add_documents(list(new_docs.values()), ids=list(new_docs))
+    print(
+        f"[INFO] Added {len(new_docs)} chunks to the Chroma store, "
+        f"skipped {len(chunks) - len(new_docs)} duplicates"
+    )
 
-    if not os.path.exists(persist_directory):
-        print("[INFO] Creating a new Chroma store...")
-        db = create_new_vector_store(splitted_docs, persist_directory)
-    else:
-        print("[INFO] Updating existing Chroma store...")
-        db = load_existing_vector_store(persist_directory)
-        db.add_documents(splitted_docs)
 
-    return db
+def update_vector_store(user_id: str, new_docs: list[Document]):
+    store_chunks(get_persist_directory(user_id), prepare_chunks(new_docs))
 
 
 def build_summary_prompt(
@@ -109,36 +317,110 @@ Please provide a well-structured summary.
 """
 
 
-def summarize_and_update(
-    user_id: str, docs: list[Document], user_instructions: str = ""
-) -> str:
-    formatted_new_doc_content = "\n\n".join(doc.page_content for doc in docs)
+def _search(persist_directory: str, query_vector: list[float], k: int) -> list[Document]:
+    with vector_stores.use(persist_directory) as db:
+        return db.similarity_search_by_vector(query_vector, k=k)
 
-    # Step 1: Retrieve context from vector store if available
-    persist_directory = get_persist_directory(user_id)
-    retrieved_context = ""
-    if os.path.exists(persist_directory):
-        print("[INFO] Using existing vector store for context...")
-        db = load_existing_vector_store(persist_directory)
-        retriever = db.as_retriever()
-        retrieved_docs = retriever.invoke("email summary")
-        retrieved_context = "\n\n".join(doc.page_content for doc in retrieved_docs)
 
-    # Step 2: Build the summary prompt
-    prompt = build_summary_prompt(
-        main_email_content=formatted_new_doc_content,
-        additional_context=retrieved_context,
-        user_instructions=user_instructions,
+async def retrieve_context(persist_directory: str, exclude_ids: set) -> list[Document]:
+    """The RETRIEVAL_K stored chunks closest to RETRIEVAL_QUERY, leaving out
+    `exclude_ids` (the chunks of the email being summarised, which are in
+    the store already if it was submitted before)."""
+    if not os.path.exists(persist_directory):
+        return []
+    print("[INFO] Using existing vector store for context...")
+    query_vector = await EMBEDDINGS.aembed_query(RETRIEVAL_QUERY)
+    retrieved_docs = await asyncio.to_thread(
+        _search, persist_directory, query_vector, RETRIEVAL_K + len(exclude_ids)
     )
+    return [
+        doc for doc in retrieved_docs if chunk_id(doc.page_content) not in exclude_ids
+    ][:RETRIEVAL_K]
+
+
+def _prepare(docs: list[Document]) -> tuple[list[Document], dict[str, Document]]:
+    docs = normalise_documents(docs)
+    return docs, prepare_chunks(docs)
+
 
-    # Step 3: Generate summary using LLM
-    llm = ChatOpenAI(model_name=MODEL_NAME, openai_api_key=OPENAI_API_KEY)
-    summary = llm.invoke(prompt)
+async def summarize_and_update(
+    user_id: str, docs: list[Document], user_instructions: str = "", use_cache: bool = True
+) -> str:
+    # Thread cleanup and splitting are CPU-bound, and Chroma calls block on
+    # disk, so they run on worker threads; the model and embedding calls
+    # use the async OpenAI clients
+    docs, chunks = await asyncio.to_thread(_prepare, docs)
+    formatted_new_doc_content = "\n\n".join(doc.page_content for doc in docs)
+    persist_directory = get_persist_directory(user_id)
 
-    # Step 4: Update vector store with new documents
-    print("[INFO] Updating the vector store with new content...")
-    update_vector_store(user_id, docs)
+    # Embed the new chunks (filling the embedding cache) while context is
+    # retrieved and the summary generated, so storing them afterwards
+    # makes no API calls
+    embedding = asyncio.create_task(
+        EMBEDDINGS.aembed_documents([doc.page_content for doc in chunks.values()])
+    )
+    try:
+        # Step 1: Retrieve context from vector store if available
+        retrieved_docs = await retrieve_context(persist_directory, set(chunks))
+        retrieved_context = "\n\n".join(doc.page_content for doc in retrieved_docs)
 
+        # The same user resubmitting the same content with the same context
+        # gets the earlier summary; its chunks are already in their store
+        key = summary_key(
+            persist_directory,
+            [doc.page_content for doc in docs],
+            user_instructions,
+            MODEL_NAME,
+            [chunk_id(doc.page_content) for doc in retrieved_docs],
+        )
+        while use_cache:
+            cached = summary_cache.claim(key)
+            if cached is None:
+                break
+            try:
+                # Shielded so that this request being cancelled doesn't
+                # cancel the result other requests are waiting on
+                summary = await asyncio.shield(asyncio.wrap_future(cached))
+            except SummaryAbandoned:
+                # The request computing it was cancelled; compute it here
+                continue
+            print("[INFO] Returning cached summary")
+            return summary
+
+        try:
+            # Step 2: Build the summary prompt
+            prompt = build_summary_prompt(
+                main_email_content=formatted_new_doc_content,
+                additional_context=retrieved_context,
+                user_instructions=user_instructions,
+            )
+
+            # Step 3: Generate summary using LLM
+            llm = ChatOpenAI(model_name=MODEL_NAME, openai_api_key=OPENAI_API_KEY)
+            summary = await llm.ainvoke(prompt)
+
+            # Step 4: Update vector store with new documents
+            print("[INFO] Updating the vector store with new content...")
+            await embedding
+            await asyncio.to_thread(store_chunks, persist_directory, chunks)
+        except Exception as e:
+            if use_cache:
+                summary_cache.fail(key, e)
+            raise
+        except BaseException:
+            # Cancelled (e.g. the client went away): let a waiting request
+            # take over rather than failing it too
+            if use_cache:
+                summary_cache.release(key)
+            raise
+    finally:
+        # Unused on a cache hit or after a failure
+        if not embedding.done():
+            embedding.cancel()
+        elif not embedding.cancelled():
+            embedding.exception()  # Retrieved, so asyncio doesn't log it
+
+    summary_cache.resolve(key, summary)
     return summary
 
 # if __name__ == "__main__":
@@ -0,0 +1,221 @@
+import re
+
+# Lines that start a new message within a pasted or exported thread
+_MESSAGE_SEPARATOR = re.compile(
+    r"^\s*(?:-{2,}\s*(?:Original Message|Forwarded message)\s*-{2,}"
+    r"|_{10,}"
+    r"|Begin forwarded message:)\s*$",
+    re.IGNORECASE,
+)
+# First line of an Outlook-style header block ("From: ..." followed by
+# Sent/Date/To/Subject lines)
+_HEADER_START = re.compile(r"^\s*From:\s*\S", re.IGNORECASE)
+_HEADER_LINE = re.compile(r"^\s*(From|Sent|Date|To|Cc|Bcc|Subject|Reply-To):\s*(.*)$", re.IGNORECASE)
+# Headers worth keeping for the summary; recipient lists are mostly addresses
+_KEPT_HEADERS = {"from", "sent", "date", "subject"}
+
+# "On Mon, 6 Jan 2025 at 10:02, Jane Doe <jane@example.com> wrote:", which
+# clients often wrap over two lines
+_ATTRIBUTION = re.compile(r"^\s*On\b.{0,200}?\bwrote:\s*$", re.IGNORECASE | re.DOTALL)
+_ATTRIBUTION_START = re.compile(r"^\s*On\b.*\d", re.IGNORECASE)
+_QUOTED = re.compile(r"^\s*>")
+
+# The standard "-- " line; a bare "--" is as likely to be a separator in the text
+_SIGNATURE_DELIMITER = re.compile(r"^-- $")
+_MOBILE_FOOTER = re.compile(r"^\s*(Sent from my|Get Outlook for)\b", re.IGNORECASE)
+_VALEDICTION_WORDS = (
+    r"(best|kind|warm|many thanks|thanks|thank you|regards|best regards|kind regards"
+    r"|warm regards|cheers|sincerely|yours sincerely|yours truly|all the best)"
+)
+# A sign-off line: the phrase on its own ("Regards", "Thanks!") or a short
+# phrase ending in a comma ("Best wishes,"), but not a sentence that starts
+# with one ("Thanks for the update."). The phrase on its own only counts at
+# the start of a paragraph, since "Best" may just be an item in a list
+_VALEDICTION = re.compile(
+    rf"^\s*{_VALEDICTION_WORDS}(?P<ending>\s*[!.]?|(\s+\w+){{0,3}}\s*,)\s*$",
+    re.IGNORECASE,
+)
+# Lines kept after a valediction (the sender's name); anything further in a
+# short trailing block is contact details
+_NAME_LINES_KEPT = 1
+_MAX_SIGNATURE_LINES = 8
+# Longest line that still reads as a name or contact detail
+_MAX_SIGNATURE_LINE_LENGTH = 80
+# Message text rather than a title or company name ("Acme Pte. Ltd.")
+_SENTENCE = re.compile(r"\b[a-z]+\b.*\b[a-z]+\b.*[.?!]$")
+
+# Legal footers and mailing-list boilerplate, dropped from the end of a message
+_DISCLAIMER = re.compile(
+    r"intended (solely |only )?for the (use of the )?(individual|named|addressee|recipient)"
+    r"|received this (e-?mail|message|communication) in error"
+    r"|(confidential|privileged) and (may be )?(legally )?(privileged|confidential)"
+    r"|to unsubscribe|unsubscribe from",
+    re.IGNORECASE,
+)
+# Only paragraphs at least this long are dropped as repeats, so that short
+# lines like "Thanks," or "Sounds good." in later messages stay
+_MIN_REPEAT_LENGTH = 40
+
+
+def split_messages(text: str) -> list[list[str]]:
+    """Split a thread into messages, each a list of lines."""
+    messages = [[]]
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if _MESSAGE_SEPARATOR.match(line):
+            messages.append([])
+            continue
+        # A "From:" line followed by other headers starts a message even
+        # without a separator line above it
+        if (
+            _HEADER_START.match(line)
+            and messages[-1]
+            and any(_HEADER_LINE.match(next_line) for next_line in lines[i + 1:i + 3])
+        ):
+            messages.append([])
+        messages[-1].append(line)
+    return [message for message in messages if any(line.strip() for line in message)]
+
+
+def _strip_headers(lines: list[str]) -> tuple[list[str], list[str]]:
+    """Separate the leading header block, keeping only From/Sent/Subject."""
+    headers = []
+    position = 0
+    while position < len(lines):
+        line = lines[position]
+        match = _HEADER_LINE.match(line)
+        if match:
+            if match.group(1).lower() in _KEPT_HEADERS and match.group(2).strip():
+                headers.append(f"{match.group(1).capitalize()}: {match.group(2).strip()}")
+        elif line.strip() or headers:
+            break
+        position += 1
+    return headers, lines[position:]
+
+
+def _strip_quotes(lines: list[str]) -> list[str]:
+    kept = []
+    skip_next = False
+    for i, line in enumerate(lines):
+        if skip_next:
+            skip_next = False
+            continue
+        if _QUOTED.match(line):
+            continue
+        if _ATTRIBUTION.match(line):
+            continue
+        # Attribution wrapped onto a second line
+        if (
+            i + 1 < len(lines)
+            and _ATTRIBUTION_START.match(line)
+            and _ATTRIBUTION.match(f"{line} {lines[i + 1]}")
+        ):
+            skip_next = True
+            continue
+        kept.append(line)
+    return kept
+
+
+def _is_signature_block(lines: list[str]) -> bool:
+    """Whether the lines after a sign-off are only a name and contact details."""
+    content = [line.strip() for line in lines if line.strip()]
+    if len(content) > _MAX_SIGNATURE_LINES:
+        return False
+    for line in content:
+        if len(line) > _MAX_SIGNATURE_LINE_LENGTH:
+            return False
+        if _SENTENCE.search(line):
+            return False
+    return True
+
+
+def _strip_disclaimers(lines: list[str]) -> list[str]:
+    """Drop disclaimer paragraphs at the end of a message. Earlier ones are
+    kept, since they are more likely to be the message itself ("how do I
+    unsubscribe from ...?")."""
+    end = len(lines)
+    while True:
+        while end > 0 and not lines[end - 1].strip():
+            end -= 1
+        start = end
+        while start > 0 and lines[start - 1].strip():
+            start -= 1
+        if start == end or not _DISCLAIMER.search("\n".join(lines[start:end])):
+            return lines[:end]
+        end = start
+
+
+def _is_valediction(lines: list[str], i: int) -> bool:
+    match = _VALEDICTION.match(lines[i])
+    if match is None:
+        return False
+    starts_paragraph = i == 0 or not lines[i - 1].strip()
+    return match.group("ending").rstrip().endswith(",") or starts_paragraph
+
+
+def _strip_signature(lines: list[str]) -> list[str]:
+    # Everything after the last delimiter; earlier ones may be quoted or
+    # part of the text
+    delimiters = [i for i, line in enumerate(lines) if _SIGNATURE_DELIMITER.match(line)]
+    if delimiters:
+        lines = lines[:delimiters[-1]]
+    lines = [line for line in lines if not _MOBILE_FOOTER.match(line)]
+    lines = _strip_disclaimers(lines)
+
+    content = [i for i, line in enumerate(lines) if line.strip()]
+    for i in reversed(content[-_MAX_SIGNATURE_LINES - 1:]):
+        if _is_valediction(lines, i):
+            # Only cut when nothing but a name and contact details follows
+            if not _is_signature_block(lines[i + 1:]):
+                return lines
+            keep = i + 1
+            for _ in range(_NAME_LINES_KEPT):
+                while keep < len(lines) and not lines[keep].strip():
+                    keep += 1
+                keep += 1
+            return lines[:keep]
+    return lines
+
+
+def _paragraphs(lines: list[str]) -> list[str]:
+    paragraphs, current = [], []
+    for line in lines:
+        if line.strip():
+            current.append(line.rstrip())
+        elif current:
+            paragraphs.append("\n".join(current))
+            current = []
+    if current:
+        paragraphs.append("\n".join(current))
+    return paragraphs
+
+
+def _paragraph_key(paragraph: str) -> str:
+    return " ".join(paragraph.lower().split())
+
+
+def normalise_thread(text: str, seen: set = None) -> str:
+    """Reduce an email thread to the new content of each message.
+
+    Quoted lines ("> ...") and their "On ... wrote:" attributions are
+    dropped, as are signatures, mobile footers, trailing legal disclaimers and
+    recipient headers. Paragraphs already seen earlier in the thread (or in
+    `seen`, shared across the pages of one upload) are dropped too, which
+    removes history that forwarding clients include unquoted.
+    """
+    seen = set() if seen is None else seen
+    messages = []
+    for lines in split_messages(text):
+        headers, body = _strip_headers(lines)
+        body = _strip_signature(_strip_quotes(body))
+        paragraphs = []
+        for paragraph in _paragraphs(body):
+            key = _paragraph_key(paragraph)
+            if len(key) >= _MIN_REPEAT_LENGTH and key in seen:
+                continue
+            seen.add(key)
+            paragraphs.append(paragraph)
+        if paragraphs:
+            body = "\n\n".join(paragraphs)
+            messages.append("\n".join(headers) + "\n\n" + body if headers else body)
+    return "\n\n---\n\n".join(messages)
@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from langchain_core.embeddings import Embeddings
+
+
+def normalise_text(text: str) -> str:
+    """Collapse whitespace so that re-wrapped copies of a chunk share a key."""
+    return " ".join(text.split())
+
+
+def chunk_id(text: str) -> str:
+    """Content address of a chunk, used as its id in the vector store."""
+    return hashlib.sha256(normalise_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Persistent map from (model, normalised text) to its embedding.
+
+    Backed by a small SQLite file shared by every user, since the same
+    text embeds to the same vector whoever sends it. Vectors are stored
+    as float32.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{normalise_text(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({', '.join('?' * len(batch))})",
+                    batch,
+                )
+                for key, vector in rows:
+                    found[key] = array("f", vector).tolist()
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, vectors: dict[str, list[float]]):
+        with self._lock:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, array("f", vector).tobytes()) for key, vector in vectors.items()],
+            )
+            self._connection.execute("COMMIT")
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else None,
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings that only call the underlying model for unseen text.
+
+    Used for both ingestion (embed_documents) and retrieval (embed_query),
+    with async counterparts for the summariser. Duplicate texts within one
+    call are embedded once.
+    """
+
+    def __init__(self, underlying: Embeddings, cache: EmbeddingCache, model: str):
+        self.underlying = underlying
+        self.cache = cache
+        self.model = model
+
+    @staticmethod
+    def _missing(keys: list[str], texts: list[str], vectors: dict) -> dict[str, str]:
+        """First text for each key not found in the cache."""
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+        return missing
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [EmbeddingCache.key(self.model, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+        missing = self._missing(keys, texts, vectors)
+        if missing:
+            embedded = dict(zip(missing, self.underlying.embed_documents(list(missing.values()))))
+            self.cache.put_many(embedded)
+            vectors.update(embedded)
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        # The cache is a local file, read and written on a worker thread;
+        # the model is called through its own async client
+        keys = [EmbeddingCache.key(self.model, text) for text in texts]
+        vectors = await asyncio.to_thread(self.cache.get_many, keys)
+        missing = self._missing(keys, texts, vectors)
+        if missing:
+            embedded = dict(
+                zip(missing, await self.underlying.aembed_documents(list(missing.values())))
+            )
+            await asyncio.to_thread(self.cache.put_many, embedded)
+            vectors.update(embedded)
+        return [vectors[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.aembed_documents([text]))[0]
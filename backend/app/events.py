@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Event:
+    type: str  # e.g. "meeting.created"
+    data: dict
+    id: int = None  # Sync version of the change, when there is one
+
+
+@dataclass(eq=False)
+class Subscription:
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue
+    # Set when the subscriber fell too far behind and missed events
+    overflowed: bool = field(default=False)
+
+    def deliver(self, event: Event):
+        # Runs on the subscriber's event loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBus:
+    """Publish/subscribe interface for calendar change events.
+
+    Routers only call publish(); the SSE endpoint only calls subscribe() and
+    unsubscribe(). A broker-backed bus (e.g. Redis pub/sub) can replace the
+    in-process one by implementing the same three methods.
+    """
+
+    def publish(self, event: Event):
+        raise NotImplementedError
+
+    def subscribe(self, max_queued: int = 100) -> Subscription:
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription: Subscription):
+        raise NotImplementedError
+
+
+class InProcessEventBus(EventBus):
+    def __init__(self):
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event: Event):
+        # Safe to call from sync handlers running in the threadpool
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                self.unsubscribe(subscription)
+
+    def subscribe(self, max_queued: int = 100) -> Subscription:
+        subscription = Subscription(
+            loop=asyncio.get_running_loop(), queue=asyncio.Queue(max_queued)
+        )
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+
+event_bus: EventBus = InProcessEventBus()
+
+
+def publish_change(entity: str, action: str, obj) -> None:
+    """Broadcast that a synced row was created, updated or deleted.
+
+    `entity` matches the /sync payload keys (e.g. "meetings"); clients can
+    fetch the full change with /sync?since=<previous cursor>.
+    """
+    publish_row_change(entity, action, obj.id, getattr(obj, "version", None))
+
+
+def publish_row_change(entity: str, action: str, row_id: int, version: int = None) -> None:
+    """publish_change for callers that only have the row id, e.g. bulk writes."""
+    event_bus.publish(
+        Event(
+            type=f"{entity}.{action}",
+            data={"entity": entity, "action": action, "id": row_id, "version": version},
+            id=version,
+        )
+    )
@@ -0,0 +1,331 @@
+import codecs
+import os
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncIterator, Iterable, Iterator, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.models import Meeting, RecurrenceFrequency, Task
+from app.recurrence import nth_occurrence
+
+# Domain part of exported UIDs. RFC 5545 recommends a globally unique id, so
+# deployments should set this to a domain they own; it must stay the same
+# afterwards, or clients will see re-exported items as new ones
+UID_DOMAIN = os.environ.get("ICAL_UID_DOMAIN", "booksmart")
+PRODID = "-//BookSmart//Calendar Export//EN"
+MAX_LINE_OCTETS = 75
+
+FREQUENCIES = {
+    RecurrenceFrequency.DAILY: "DAILY",
+    RecurrenceFrequency.WEEKLY: "WEEKLY",
+    RecurrenceFrequency.MONTHLY: "MONTHLY",
+    RecurrenceFrequency.YEARLY: "YEARLY",
+}
+PARSED_FREQUENCIES = {value: key for key, value in FREQUENCIES.items()}
+
+DURATION = re.compile(
+    r"^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+
+# -- Export ------------------------------------------------------------------
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line at 75 octets, without splitting UTF-8 sequences."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Back up to the start of a UTF-8 character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+        # Continuation lines start with a space, which counts towards the limit
+        limit = MAX_LINE_OCTETS - 1
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _format_datetime(d: date, t: time) -> str:
+    # Times are stored without a timezone, so they are exported as floating times
+    return datetime.combine(d, t).strftime("%Y%m%dT%H%M%S")
+
+
+def _common_properties(kind: str, item, stamp: str) -> list[str]:
+    lines = [
+        f"UID:{kind}-{item.id}@{UID_DOMAIN}",
+        f"DTSTAMP:{stamp}",
+        f"SUMMARY:{escape_text(item.title)}",
+    ]
+    if item.description:
+        lines.append(f"DESCRIPTION:{escape_text(item.description)}")
+    if item.categories:
+        lines.append(
+            "CATEGORIES:" + ",".join(escape_text(c.name) for c in item.categories)
+        )
+    for participant in item.participants:
+        lines.append(
+            f'ATTENDEE;CN="{participant.name.replace(chr(34), "")}":mailto:{participant.email}'
+        )
+    if item.color:
+        lines.append(f"X-APP-COLOR:{escape_text(item.color)}")
+    return lines
+
+
+def meeting_component(meeting: Meeting, stamp: str) -> str:
+    lines = ["BEGIN:VEVENT"]
+    lines += _common_properties("meeting", meeting, stamp)
+    lines.append(f"DTSTART:{_format_datetime(meeting.date, meeting.start_time)}")
+    lines.append(f"DTEND:{_format_datetime(meeting.date, meeting.end_time)}")
+    rule = meeting.recurrence_rule
+    if rule:
+        rrule = f"RRULE:FREQ={FREQUENCIES[rule.frequency]};INTERVAL={rule.interval or 1}"
+        if rule.end_date:
+            # UNTIL must have the same value type as DTSTART
+            rrule += f";UNTIL={_format_datetime(rule.end_date, time(23, 59, 59))}"
+        lines.append(rrule)
+    lines.append("END:VEVENT")
+    return "".join(fold_line(line) for line in lines)
+
+
+def task_component(task: Task, stamp: str) -> str:
+    lines = ["BEGIN:VTODO"]
+    lines += _common_properties("task", task, stamp)
+    lines.append(f"DUE;VALUE=DATE:{task.due_date.strftime('%Y%m%d')}")
+    lines.append("END:VTODO")
+    return "".join(fold_line(line) for line in lines)
+
+
+def calendar_stream(meetings: Iterable[Meeting], tasks: Iterable[Task]) -> Iterator[str]:
+    """Yield a VCALENDAR one component at a time."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{PRODID}\r\nCALSCALE:GREGORIAN\r\n"
+    for meeting in meetings:
+        yield meeting_component(meeting, stamp)
+    for task in tasks:
+        yield task_component(task, stamp)
+    yield "END:VCALENDAR\r\n"
+
+
+# -- Import ------------------------------------------------------------------
+
+
+class ICalendarError(ValueError):
+    pass
+
+
+async def _physical_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def unfolded_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream and yield logical (unfolded) content lines."""
+    current = None
+    async for line in _physical_lines(chunks):
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def parse_content_line(line: str) -> tuple[str, dict, str]:
+    """Split "NAME;PARAM=x:value" into its name, parameters and value."""
+    in_quotes = False
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            head, value = line[:index], line[index + 1:]
+            break
+    else:
+        raise ICalendarError(f"Malformed content line: {line[:60]!r}")
+    name, *raw_params = head.split(";")
+    params = {}
+    for raw in raw_params:
+        key, _, param_value = raw.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def unescape_text(value: str) -> str:
+    return re.sub(
+        r"\\([\\;,nN])",
+        lambda m: "\n" if m.group(1) in "nN" else m.group(1),
+        value,
+    )
+
+
+def split_text_list(value: str) -> list[str]:
+    """Split a comma separated TEXT list, honouring escaped commas."""
+    return [unescape_text(part) for part in re.split(r"(?<!\\),", value) if part]
+
+
+async def iter_components(lines: AsyncIterator[str]) -> AsyncIterator[tuple[str, list]]:
+    """Yield (component name, [(name, params, value), ...]) for each VEVENT and VTODO.
+
+    Only one component is held in memory at a time; nested components such
+    as VALARM are skipped.
+    """
+    stack = []
+    properties = None
+    async for line in lines:
+        name, params, value = parse_content_line(line)
+        if name == "BEGIN":
+            stack.append(value.upper())
+            if value.upper() in ("VEVENT", "VTODO") and len(stack) == 2:
+                properties = []
+        elif name == "END":
+            component = stack.pop() if stack else None
+            if component in ("VEVENT", "VTODO") and properties is not None and len(stack) == 1:
+                yield component, properties
+                properties = None
+        elif properties is not None and len(stack) == 2:
+            properties.append((name, params, value))
+
+
+def parse_date_time(value: str, params: dict) -> tuple[date, Optional[time]]:
+    """Parse a DATE or DATE-TIME into local (naive) date and time.
+
+    UTC times and times with a TZID are converted to the server's local
+    time, matching how meetings are stored. The time is None for DATE values.
+    """
+    try:
+        if params.get("VALUE") == "DATE" or len(value) == 8:
+            return datetime.strptime(value, "%Y%m%d").date(), None
+        parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    except ValueError:
+        raise ICalendarError(f"Invalid date or time: {value!r}")
+    if value.endswith("Z"):
+        parsed = parsed.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    elif "TZID" in params:
+        try:
+            zone = ZoneInfo(params["TZID"])
+        except (ZoneInfoNotFoundError, ValueError):
+            zone = None
+        if zone is not None:
+            parsed = parsed.replace(tzinfo=zone).astimezone().replace(tzinfo=None)
+    return parsed.date(), parsed.time()
+
+
+def parse_duration(value: str) -> timedelta:
+    match = DURATION.match(value)
+    if not match:
+        raise ICalendarError(f"Invalid duration: {value!r}")
+    parts = {key: int(v) for key, v in match.groupdict().items() if v and key != "sign"}
+    duration = timedelta(
+        weeks=parts.get("weeks", 0),
+        days=parts.get("days", 0),
+        hours=parts.get("hours", 0),
+        minutes=parts.get("minutes", 0),
+        seconds=parts.get("seconds", 0),
+    )
+    return -duration if match.group("sign") == "-" else duration
+
+
+def parse_rrule(value: str, start: date) -> Optional[dict]:
+    """Map an RRULE onto a RecurrenceRule's fields.
+
+    Only FREQ, INTERVAL, UNTIL and COUNT are understood; rules with other
+    frequencies (e.g. HOURLY) return None and the event is imported as a
+    one-off meeting.
+    """
+    parts = dict(
+        part.split("=", 1) for part in value.upper().split(";") if "=" in part
+    )
+    frequency = PARSED_FREQUENCIES.get(parts.get("FREQ"))
+    if frequency is None:
+        return None
+    try:
+        interval = max(int(parts.get("INTERVAL", "1")), 1)
+        end_date = None
+        if "UNTIL" in parts:
+            end_date, _ = parse_date_time(parts["UNTIL"], {})
+        elif "COUNT" in parts:
+            end_date = nth_occurrence(start, frequency, interval, max(int(parts["COUNT"]), 1) - 1)
+    except ValueError:
+        raise ICalendarError(f"Invalid RRULE: {value!r}")
+    return {"frequency": frequency, "interval": interval, "end_date": end_date}
+
+
+def _text_fields(properties: list) -> dict:
+    fields = {"title": None, "description": None, "color": None, "categories": [], "attendees": []}
+    for name, params, value in properties:
+        if name == "SUMMARY":
+            fields["title"] = unescape_text(value)
+        elif name == "DESCRIPTION":
+            fields["description"] = unescape_text(value)
+        elif name == "X-APP-COLOR":
+            fields["color"] = unescape_text(value)
+        elif name == "CATEGORIES":
+            fields["categories"] += split_text_list(value)
+        elif name == "ATTENDEE" and value.lower().startswith("mailto:"):
+            fields["attendees"].append(value[len("mailto:"):].strip().lower())
+    fields["title"] = fields["title"] or "(No title)"
+    return fields
+
+
+def parse_event(properties: list) -> Optional[dict]:
+    """Turn a VEVENT's properties into meeting fields (None if it has no start)."""
+    fields = _text_fields(properties)
+    props = {name: (params, value) for name, params, value in properties}
+    if "DTSTART" not in props:
+        return None
+    start_date, start_time = parse_date_time(props["DTSTART"][1], props["DTSTART"][0])
+    start = datetime.combine(start_date, start_time or time.min)
+    if "DTEND" in props:
+        end_date, end_time = parse_date_time(props["DTEND"][1], props["DTEND"][0])
+        end = datetime.combine(end_date, end_time or time.min)
+    elif "DURATION" in props:
+        end = start + parse_duration(props["DURATION"][1])
+    else:
+        end = start + timedelta(days=1) if start_time is None else start
+    if end.date() > start_date:
+        # Meetings are stored per day; all-day and overnight events end at midnight
+        end_of_day = time(23, 59, 59)
+    else:
+        end_of_day = max(end.time(), start.time())
+    fields.update(date=start_date, start_time=start.time(), end_time=end_of_day)
+    fields["recurrence"] = (
+        parse_rrule(props["RRULE"][1], start_date) if "RRULE" in props else None
+    )
+    return fields
+
+
+def parse_todo(properties: list) -> Optional[dict]:
+    """Turn a VTODO's properties into task fields (None if it has no due date)."""
+    fields = _text_fields(properties)
+    props = {name: (params, value) for name, params, value in properties}
+    due = props.get("DUE") or props.get("DTSTART")
+    if due is None:
+        return None
+    fields["due_date"], _ = parse_date_time(due[1], due[0])
+    return fields
@@ -0,0 +1,76 @@
+from sqlalchemy.orm import contains_eager, selectinload
+from app.models import (
+    Category,
+    Meeting,
+    Participant,
+    RecurrenceRule,
+    Reminder,
+    Task,
+    category_meeting,
+    category_task,
+    meeting_participant,
+    reminder_participant,
+    task_participant,
+)
+from app.projections import Link, ListProjection
+
+# Loader options for each list endpoint, so serialising N rows costs a fixed
+# number of queries instead of one per row and relationship.
+#
+# Collections (many-to-many) use selectinload: one extra "WHERE id IN (...)"
+# query per relationship, without multiplying the parent rows like a JOIN would.
+# Many-to-one relationships that the query already joins reuse that JOIN
+# through contains_eager.
+
+MEETING_LIST = (
+    selectinload(Meeting.categories),
+    selectinload(Meeting.participants),
+)
+
+TASK_LIST = (
+    selectinload(Task.categories),
+    selectinload(Task.participants),
+)
+
+REMINDER_LIST = (selectinload(Reminder.participants),)
+
+# For queries of RecurrenceRule that already .join(Meeting)
+RECURRENCE_WITH_MEETING = (contains_eager(RecurrenceRule.meeting),)
+
+# Column projections for the read-only list endpoints (see app.projections).
+# They produce the same JSON as the response models without building ORM
+# objects.
+
+MEETING_VIEW = ListProjection(
+    columns=(
+        Meeting.id, Meeting.title, Meeting.description, Meeting.date,
+        Meeting.start_time, Meeting.end_time, Meeting.color,
+    ),
+    links=(
+        Link("categories", category_meeting, "meeting_id", "category_id", Category, ("id", "name")),
+        Link("participants", meeting_participant, "meeting_id", "participant_id",
+             Participant, ("id", "name", "email")),
+    ),
+)
+
+TASK_VIEW = ListProjection(
+    columns=(Task.id, Task.title, Task.description, Task.due_date, Task.color),
+    links=(
+        Link("categories", category_task, "task_id", "category_id", Category, ("id", "name")),
+        Link("participants", task_participant, "task_id", "participant_id",
+             Participant, ("id", "name", "email")),
+    ),
+)
+
+REMINDER_VIEW = ListProjection(
+    columns=(
+        Reminder.id, Reminder.message, Reminder.reminder_time,
+        Reminder.task_id, Reminder.meeting_id,
+    ),
+    links=(
+        Link("participants", reminder_participant, "reminder_id", "participant_id",
+             Participant, ("id", "name", "email")),
+    ),
+    # The reminders list has always sent "YYYY-MM-DD HH:MM:SS"
+    formatters={"reminder_time": str},
+)
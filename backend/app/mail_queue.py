@@ -0,0 +1,210 @@
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import OutboundEmail, EmailStatus
+from app.smtp_client import send_email
+
+MAIL_WORKERS = int(os.environ.get("MAIL_WORKERS", "2"))
+MAIL_MAX_ATTEMPTS = int(os.environ.get("MAIL_MAX_ATTEMPTS", "5"))
+MAIL_RETRY_BASE_DELAY = float(os.environ.get("MAIL_RETRY_BASE_DELAY", "30"))  # seconds
+MAIL_RETRY_MAX_DELAY = float(os.environ.get("MAIL_RETRY_MAX_DELAY", "3600"))
+# Upper bound on how long an idle worker sleeps before checking the outbox again
+MAIL_POLL_INTERVAL = float(os.environ.get("MAIL_POLL_INTERVAL", "30"))
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with a little jitter so retries don't line up."""
+    delay = min(MAIL_RETRY_BASE_DELAY * 2 ** (attempts - 1), MAIL_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class MailWorkerPool:
+    """Background threads that drain the outbound_emails table."""
+
+    def __init__(self, workers: int = MAIL_WORKERS):
+        self.workers = workers
+        self._threads: list[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stopping.clear()
+        self._requeue_interrupted()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"mail-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _requeue_interrupted(self):
+        # Rows left in SENDING were being sent when the process died
+        db = SessionLocal()
+        try:
+            db.query(OutboundEmail).filter(
+                OutboundEmail.status == EmailStatus.SENDING
+            ).update(
+                {OutboundEmail.status: EmailStatus.PENDING},
+                synchronize_session=False,
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            db = SessionLocal()
+            try:
+                email = self._claim_next(db)
+                if email is None:
+                    timeout = self._seconds_until_next_due(db)
+                else:
+                    self._deliver(db, email)
+                    continue
+            except Exception as e:
+                print(f"[WARNING] Mail worker error: {e}")
+                timeout = MAIL_POLL_INTERVAL
+            finally:
+                db.close()
+
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def _claim_next(self, db: Session):
+        now = datetime.now()
+        candidates = (
+            db.query(OutboundEmail.id)
+            .filter(
+                OutboundEmail.status == EmailStatus.PENDING,
+                OutboundEmail.next_attempt_at <= now,
+            )
+            .order_by(OutboundEmail.next_attempt_at)
+            .limit(self.workers)
+            .all()
+        )
+        for (email_id,) in candidates:
+            # Only one worker wins the PENDING -> SENDING transition
+            claimed = (
+                db.query(OutboundEmail)
+                .filter(
+                    OutboundEmail.id == email_id,
+                    OutboundEmail.status == EmailStatus.PENDING,
+                )
+                .update(
+                    {
+                        OutboundEmail.status: EmailStatus.SENDING,
+                        OutboundEmail.attempts: OutboundEmail.attempts + 1,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if claimed:
+                return db.query(OutboundEmail).filter(OutboundEmail.id == email_id).one()
+        return None
+
+    def _seconds_until_next_due(self, db: Session) -> float:
+        next_due = (
+            db.query(func.min(OutboundEmail.next_attempt_at))
+            .filter(OutboundEmail.status == EmailStatus.PENDING)
+            .scalar()
+        )
+        if next_due is None:
+            return MAIL_POLL_INTERVAL
+        seconds = (next_due - datetime.now()).total_seconds()
+        return min(max(seconds, 0), MAIL_POLL_INTERVAL)
+
+    def _deliver(self, db: Session, email: OutboundEmail):
+        # Recipients reached on an earlier attempt don't get the email again
+        delivered = list(email.delivered_to or [])
+        remaining = [recipient for recipient in email.recipients if recipient not in delivered]
+        sent = []
+        try:
+            send_email(email.subject, email.body, remaining, sent=sent)
+        except Exception as e:
+            email.delivered_to = delivered + sent
+            email.last_error = str(e)
+            if email.attempts >= MAIL_MAX_ATTEMPTS:
+                print(f"[WARNING] Giving up on email {email.id}: {e}")
+                email.status = EmailStatus.FAILED
+            else:
+                email.status = EmailStatus.PENDING
+                email.next_attempt_at = datetime.now() + timedelta(
+                    seconds=retry_delay(email.attempts)
+                )
+        else:
+            email.status = EmailStatus.SENT
+            email.delivered_to = delivered + sent
+            email.sent_at = datetime.now()
+            email.last_error = None
+        db.commit()
+
+
+mail_workers = MailWorkerPool()
+
+
+def enqueue_email(
+    db: Session, subject: str, body: str, recipients: list, commit: bool = True
+) -> OutboundEmail:
+    """Persist an email to the outbox; a background worker sends it.
+
+    With commit=False the row is only added to the session, so a caller
+    queueing a batch can commit once and then call mail_workers.wake().
+    """
+    now = datetime.now()
+    email = OutboundEmail(
+        subject=subject,
+        body=body,
+        recipients=list(recipients),
+        status=EmailStatus.PENDING,
+        attempts=0,
+        next_attempt_at=now,
+        created_at=now,
+    )
+    db.add(email)
+    if commit:
+        db.commit()
+        db.refresh(email)
+        mail_workers.wake()
+    return email
+
+
+def enqueue_emails(db: Session, emails: list[tuple[str, str, list]]):
+    """Add many (subject, body, recipients) emails to the outbox with one executemany.
+
+    Doesn't commit; call mail_workers.wake() after committing.
+    """
+    if not emails:
+        return
+    now = datetime.now()
+    db.execute(
+        insert(OutboundEmail),
+        [
+            {
+                "subject": subject,
+                "body": body,
+                "recipients": list(recipients),
+                "status": EmailStatus.PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+            }
+            for subject, body, recipients in emails
+        ],
+    )
@@ -1,6 +1,13 @@
 from fastapi import FastAPI
-from app.routers import meetings, participants, recurrences, tasks, categories, reminders, notifications, summarizer, signup, login
+from app.routers import meetings, participants, recurrences, tasks, categories, reminders, notifications, summarizer, signup, login, calendar, sync, events, ical, cache, search, archive
 from fastapi.middleware.cors import CORSMiddleware
+from app.smtp_client import close_smtp_pool
+from app.mail_queue import mail_workers
+from app.occurrences import occurrence_maintainer
+from app.reminder_scheduler import reminder_scheduler
+from app.archive import archiver
+from app.email_summariser import vector_stores
+from app.database import dispose_async_engines
 
 app = FastAPI()
 
@@ -10,6 +17,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  
     allow_headers=["*"],  
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
 @app.get("/")
@@ -17,6 +25,29 @@ async def root():
     return {"message": "Hello World"}
 
 
+@app.on_event("startup")
+def startup():
+    mail_workers.start()
+    occurrence_maintainer.start()
+    reminder_scheduler.start()
+    archiver.start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    archiver.stop()
+    reminder_scheduler.stop()
+    mail_workers.stop()
+    occurrence_maintainer.stop()
+    close_smtp_pool()
+    vector_stores.close_all()
+
+
+@app.on_event("shutdown")
+async def close_database():
+    await dispose_async_engines()
+
+
 app.include_router(meetings.router, prefix="/meetings", tags=["Meetings"])
 app.include_router(participants.router, prefix="/participants", tags=["Participants"])
 app.include_router(recurrences.router, prefix="/recurrences", tags=["Recurring Meetings"])
@@ -27,3 +58,10 @@ app.include_router(notifications.router, prefix="/notifications", tags=["Notific
 app.include_router(summarizer.router, prefix="/summarizer", tags=["Summarizer"])
 app.include_router(signup.router, prefix="/signup", tags=["Signup"])
 app.include_router(login.router, prefix="/login", tags=["Login"])
+app.include_router(calendar.router, prefix="/calendar", tags=["Calendar"])
+app.include_router(sync.router, prefix="/sync", tags=["Sync"])
+app.include_router(events.router, prefix="/events", tags=["Events"])
+app.include_router(ical.router, tags=["iCalendar"])
+app.include_router(cache.router, prefix="/cache", tags=["Cache"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+app.include_router(archive.router, prefix="/archive", tags=["Archive"])
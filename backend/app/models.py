@@ -8,10 +8,17 @@ from sqlalchemy import (
     Table,
     Enum,
     DateTime,
+    JSON,
+    Index,
+    UniqueConstraint,
+    literal,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.schema import CreateTable
 from sqlalchemy.orm import relationship
 from app.database import engine  # Import engine from database.py
+from app.search import create_search_index
 from passlib.context import CryptContext
 import enum
 
@@ -27,11 +34,20 @@ class RecurrenceFrequency(enum.Enum):
     YEARLY = "yearly"
 
 
+class EmailStatus(enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 task_participant = Table(
     "task_participant",
     Base.metadata,
     Column("task_id", Integer, ForeignKey("tasks.id"), primary_key=True),
     Column("participant_id", Integer, ForeignKey("participants.id"), primary_key=True),
+    # The primary key only helps lookups by task; this covers "tasks of a participant"
+    Index("ix_task_participant_participant", "participant_id", "task_id"),
 )
 
 meeting_participant = Table(
@@ -39,6 +55,7 @@ meeting_participant = Table(
     Base.metadata,
     Column("meeting_id", Integer, ForeignKey("meetings.id"), primary_key=True),
     Column("participant_id", Integer, ForeignKey("participants.id"), primary_key=True),
+    Index("ix_meeting_participant_participant", "participant_id", "meeting_id"),
 )
 
 category_task = Table(
@@ -55,11 +72,20 @@ category_meeting = Table(
     Column("meeting_id", Integer, ForeignKey("meetings.id"), primary_key=True),
 )
 
+# Single-row counter handing out sync change versions
+sync_state = Table(
+    "sync_state",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
 reminder_participant = Table(
     "reminder_participant",
     Base.metadata,
     Column("reminder_id", Integer, ForeignKey("reminders.id"), primary_key=True),
     Column("participant_id", Integer, ForeignKey("participants.id"), primary_key=True),
+    Index("ix_reminder_participant_participant", "participant_id", "reminder_id"),
 )
 
 
@@ -67,10 +93,13 @@ class Reminder(Base):
     __tablename__ = "reminders"
 
     id = Column(Integer, primary_key=True, index=True)
+    # Change version for delta sync, stamped by app.sync on every insert/update
+    version = Column(Integer, nullable=False, default=0, index=True)
     message = Column(String, nullable=False)
-    reminder_time = Column(DateTime, nullable=False)
+    reminder_time = Column(DateTime, nullable=False, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=True)
+    dispatched_at = Column(DateTime, nullable=True)  # Set once the reminder email is queued
 
     # Relationships
     participants = relationship(
@@ -79,26 +108,63 @@ class Reminder(Base):
     task = relationship("Task", back_populates="reminders")
     meeting = relationship("Meeting", back_populates="reminders")
 
+    __table_args__ = (
+        # Partial index: the scheduler only ever looks for reminders not yet sent
+        Index(
+            "ix_reminders_pending_time",
+            "reminder_time",
+            sqlite_where=text("dispatched_at IS NULL"),
+        ),
+        # Ids are never handed out again once the newest rows are archived
+        {"sqlite_autoincrement": True},
+    )
+
 
 class RecurrenceRule(Base):
     __tablename__ = "recurrence_rules"
 
     id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False, default=0, index=True)
     meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
     frequency = Column(Enum(RecurrenceFrequency), nullable=False)
     interval = Column(Integer, default=1)  # Every n days, weeks, months, etc.
     end_date = Column(Date, nullable=True)  # Optional end date for the recurrence
+    # Occurrences before this date (exclusive) are stored in the occurrences table
+    materialized_until = Column(Date, nullable=True, index=True)
 
     meeting = relationship("Meeting", back_populates="recurrence_rule")
+    occurrences = relationship("Occurrence", back_populates="recurrence_rule")
+
+
+class Occurrence(Base):
+    __tablename__ = "occurrences"
+
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False)
+    recurrence_rule_id = Column(
+        Integer, ForeignKey("recurrence_rules.id"), nullable=False, index=True
+    )
+    occurrence_date = Column(Date, nullable=False)
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+
+    meeting = relationship("Meeting")
+    recurrence_rule = relationship("RecurrenceRule", back_populates="occurrences")
+
+    __table_args__ = (
+        UniqueConstraint("meeting_id", "occurrence_date"),
+        Index("ix_occurrences_date_meeting", "occurrence_date", "meeting_id"),
+    )
 
 
 class Task(Base):
     __tablename__ = "tasks"
 
     id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False, default=0, index=True)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    due_date = Column(Date, nullable=False)
+    due_date = Column(Date, nullable=False, index=True)
     color = Column(String, nullable=True)
     participants = relationship(
         "Participant", secondary=task_participant, back_populates="tasks"
@@ -109,11 +175,14 @@ class Task(Base):
     )
     reminders = relationship("Reminder", back_populates="task")
 
+    __table_args__ = {"sqlite_autoincrement": True}
+
 
 class Meeting(Base):
     __tablename__ = "meetings"
 
     id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False, default=0, index=True)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     date = Column(Date, nullable=False)
@@ -132,11 +201,18 @@ class Meeting(Base):
     )
     reminders = relationship("Reminder", back_populates="meeting")
 
+    __table_args__ = (
+        # Serves date range scans and same-day overlap checks (date = d AND start < e AND end > s)
+        Index("ix_meetings_date_time", "date", "start_time", "end_time"),
+        {"sqlite_autoincrement": True},
+    )
+
 
 class Category(Base):
     __tablename__ = "categories"
 
     id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False, default=0, index=True)
     name = Column(String, nullable=False, unique=True)
 
     tasks = relationship("Task", secondary=category_task, back_populates="categories")
@@ -149,6 +225,7 @@ class Participant(Base):
     __tablename__ = "participants"
 
     id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, nullable=False, default=0, index=True)
     name = Column(String, nullable=False)
     email = Column(String, nullable=False, unique=True)
     hashed_password = Column(String, nullable=False)
@@ -170,4 +247,119 @@ class Participant(Base):
         return pwd_context.verify(password, self.hashed_password)
 
 
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String, nullable=False)  # e.g. "meetings"
+    entity_id = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False, index=True)
+
+
+class OutboundEmail(Base):
+    __tablename__ = "outbound_emails"
+
+    id = Column(Integer, primary_key=True, index=True)
+    subject = Column(String, nullable=False)
+    body = Column(String, nullable=False)
+    recipients = Column(JSON, nullable=False)  # List of email addresses
+    # Recipients already sent to, skipped when the email is retried
+    delivered_to = Column(JSON, nullable=True)
+    status = Column(Enum(EmailStatus), nullable=False, default=EmailStatus.PENDING, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, index=True)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+
 Base.metadata.create_all(bind=engine)
+
+
+def _existing_columns(connection, table_name: str) -> set[str]:
+    return {row[1] for row in connection.execute(text(f"PRAGMA table_info({table_name})"))}
+
+
+def add_missing_columns(table: Table) -> list[str]:
+    """Add columns declared since `table` was created, returning their names.
+
+    create_all only creates missing tables, so databases from before a
+    column was introduced (e.g. materialized_until, version, dispatched_at)
+    need it added. Existing rows get the column's default.
+    """
+    added = []
+    with engine.begin() as connection:
+        existing = _existing_columns(connection, table.name)
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = (
+                f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                f"{column.type.compile(dialect=engine.dialect)}"
+            )
+            default = column.default.arg if column.default is not None and column.default.is_scalar else None
+            if default is not None:
+                value = literal(default, column.type).compile(
+                    dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+                )
+                ddl += f" DEFAULT {value}"
+                # SQLite only accepts NOT NULL on a new column with a default
+                if not column.nullable:
+                    ddl += " NOT NULL"
+            connection.execute(text(ddl))
+            added.append(column.name)
+    if added:
+        print(f"[INFO] Added columns to {table.name}: {', '.join(added)}")
+    return added
+
+
+def add_autoincrement(table: Table):
+    """Rebuild a table created before it was declared AUTOINCREMENT.
+
+    Without AUTOINCREMENT SQLite reuses the ids of deleted rows at the top of
+    the range, and archived rows (see app.archive) have left the table while
+    their ids are still in use in the archive. Indexes and triggers go with
+    the old table and are recreated below.
+    """
+    with engine.begin() as connection:
+        sql = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": table.name},
+        ).scalar()
+        if "AUTOINCREMENT" in sql.upper():
+            return
+        rebuilt = f"{table.name}_rebuilt"
+        ddl = str(CreateTable(table).compile(bind=engine)).replace(
+            f"CREATE TABLE {table.name} ", f"CREATE TABLE {rebuilt} ", 1
+        )
+        # Columns missing from the old table take their defaults
+        existing = _existing_columns(connection, table.name)
+        columns = ", ".join(column.name for column in table.columns if column.name in existing)
+        connection.execute(text(ddl))
+        connection.execute(text(f"INSERT INTO {rebuilt} ({columns}) SELECT {columns} FROM {table.name}"))
+        connection.execute(text(f"DROP TABLE {table.name}"))
+        connection.execute(text(f"ALTER TABLE {rebuilt} RENAME TO {table.name}"))
+    print(f"[INFO] Rebuilt {table.name} with AUTOINCREMENT ids")
+
+
+versioned_tables = [
+    table.name for table in Base.metadata.sorted_tables if "version" in add_missing_columns(table)
+]
+if versioned_tables:
+    # Rows from before change versions existed are stamped as the first
+    # change, so that a full /sync (since=0) still returns them
+    with engine.begin() as connection:
+        for name in versioned_tables:
+            connection.execute(text(f"UPDATE {name} SET version = 1 WHERE version = 0"))
+        connection.execute(text("INSERT OR IGNORE INTO sync_state (id, version) VALUES (1, 1)"))
+
+for model in (Meeting, Task, Reminder):
+    add_autoincrement(model.__table__)
+
+# create_all skips tables that already exist, so add any indexes introduced since
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+with engine.begin() as connection:
+    create_search_index(connection)
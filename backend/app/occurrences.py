@@ -0,0 +1,171 @@
+import os
+import threading
+from datetime import date, timedelta
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import Meeting, Occurrence, RecurrenceRule
+from app.recurrence import expand_rule
+from app.loading import RECURRENCE_WITH_MEETING
+
+# How far past today the occurrences table is kept filled in
+OCCURRENCE_HORIZON_DAYS = int(os.environ.get("OCCURRENCE_HORIZON_DAYS", "365"))
+# How often the background job rolls the horizon forward (seconds)
+OCCURRENCE_REFRESH_INTERVAL = float(os.environ.get("OCCURRENCE_REFRESH_INTERVAL", "3600"))
+
+
+def horizon_date() -> date:
+    return date.today() + timedelta(days=OCCURRENCE_HORIZON_DAYS)
+
+
+def materialize_rule(db: Session, rule: RecurrenceRule, until: date):
+    """Store the rule's occurrences from where it was last materialised up to `until`."""
+    start = rule.materialized_until or rule.meeting.date
+    if start >= until:
+        return
+
+    meeting = rule.meeting
+    rows = [
+        {
+            "meeting_id": meeting.id,
+            "recurrence_rule_id": rule.id,
+            "occurrence_date": occurrence_date,
+            "start_time": meeting.start_time,
+            "end_time": meeting.end_time,
+        }
+        for occurrence_date in expand_rule(rule, start, until)
+    ]
+    if rows:
+        db.execute(insert(Occurrence), rows)
+    rule.materialized_until = until
+
+
+def rebuild_rule(db: Session, rule: RecurrenceRule, until: date = None, commit: bool = True):
+    """Drop and regenerate the stored occurrences of one rule.
+
+    Call this whenever a rule or its meeting's date/times change.
+    """
+    db.query(Occurrence).filter(Occurrence.recurrence_rule_id == rule.id).delete(
+        synchronize_session=False
+    )
+    rule.materialized_until = None
+    materialize_rule(db, rule, until or horizon_date())
+    if commit:
+        db.commit()
+
+
+def extend_all(db: Session, until: date) -> int:
+    """Roll every unfinished rule forward to `until`. Returns the number of rules touched."""
+    rules = (
+        db.query(RecurrenceRule)
+        .join(Meeting)
+        .options(*RECURRENCE_WITH_MEETING)
+        .filter(
+            or_(
+                RecurrenceRule.materialized_until.is_(None),
+                RecurrenceRule.materialized_until < until,
+            ),
+            # Rules that ended before the materialised range have nothing left to add
+            or_(
+                RecurrenceRule.end_date.is_(None),
+                RecurrenceRule.materialized_until.is_(None),
+                RecurrenceRule.end_date >= RecurrenceRule.materialized_until,
+            ),
+        )
+        .all()
+    )
+    for rule in rules:
+        materialize_rule(db, rule, until)
+    db.commit()
+    return len(rules)
+
+
+def query_occurrences(db: Session, start: date, end: date) -> list[tuple]:
+    """(Meeting, RecurrenceRule, date) for every occurrence in [start, end).
+
+    The materialised part of the window is a single indexed range scan; any
+    part beyond the horizon falls back to expanding the rules on the fly.
+    """
+    result = []
+    horizon = occurrence_maintainer.horizon
+
+    if horizon is not None and start < horizon:
+        rows = (
+            db.query(Meeting, RecurrenceRule, Occurrence.occurrence_date)
+            .select_from(Occurrence)
+            .join(Meeting, Occurrence.meeting_id == Meeting.id)
+            .join(RecurrenceRule, Occurrence.recurrence_rule_id == RecurrenceRule.id)
+            .filter(
+                Occurrence.occurrence_date >= start,
+                Occurrence.occurrence_date < min(end, horizon),
+            )
+            .all()
+        )
+        result.extend(tuple(row) for row in rows)
+        start = horizon
+
+    if start < end:
+        rules = (
+            db.query(RecurrenceRule)
+            .join(Meeting)
+            .options(*RECURRENCE_WITH_MEETING)
+            .filter(
+                Meeting.date < end,
+                or_(RecurrenceRule.end_date.is_(None), RecurrenceRule.end_date >= start),
+            )
+            .all()
+        )
+        for rule in rules:
+            for occurrence_date in expand_rule(rule, start, end):
+                result.append((rule.meeting, rule, occurrence_date))
+
+    return result
+
+
+class OccurrenceMaintainer:
+    """Background job that keeps the occurrences table filled up to the horizon."""
+
+    def __init__(self, interval: float = OCCURRENCE_REFRESH_INTERVAL):
+        self.interval = interval
+        # Every rule is materialised at least up to this date (None until the first pass)
+        self.horizon = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def refresh(self):
+        until = horizon_date()
+        db = SessionLocal()
+        try:
+            touched = extend_all(db, until)
+        finally:
+            db.close()
+        self.horizon = until
+        if touched:
+            print(f"[INFO] Materialised occurrences for {touched} rules up to {until}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        # First pass runs before the app serves requests
+        self.refresh()
+        self._thread = threading.Thread(
+            target=self._run, name="occurrence-maintainer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[WARNING] Occurrence refresh failed: {e}")
+
+
+occurrence_maintainer = OccurrenceMaintainer()
@@ -0,0 +1,56 @@
+import base64
+from typing import Callable, Optional
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, parse_value: Callable):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        sort_value, row_id = raw.rsplit("|", 1)
+        return parse_value(sort_value), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    query: Query,
+    sort_column,
+    id_column,
+    parse_value: Callable,
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> list:
+    """Keyset pagination ordered by (sort_column, id_column).
+
+    Each page picks up strictly after the (sort value, id) pair encoded in
+    the cursor, so the database seeks straight to it on the sort column's
+    index instead of counting past an OFFSET. When there are more rows the
+    cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, parse_value)
+        query = query.filter(tuple_(sort_column, id_column) > (last_value, last_id))
+
+    query = query.order_by(sort_column, id_column)
+    if limit is None:
+        return query.all()
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    return rows
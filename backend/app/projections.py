@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Table, select
+from sqlalchemy.orm import Query, Session
+import orjson
+from app.database import ReadSessionLocal
+from app.pagination import NEXT_CURSOR_HEADER
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Rows fetched per round trip while streaming NDJSON
+STREAM_BATCH_SIZE = 1000
+# Owner ids per IN (...) when loading links, well under SQLite's variable limit
+LINK_CHUNK_SIZE = 900
+
+
+@dataclass(frozen=True)
+class Link:
+    """A many-to-many collection loaded as plain rows, e.g. a meeting's participants."""
+
+    key: str  # Field name in the response
+    table: Table  # Association table
+    owner_column: str
+    target_column: str
+    model: type
+    columns: tuple[str, ...]  # Attributes of the target model to include
+
+    def load(self, db: Session, owner_ids: list[int]) -> dict[int, list[dict]]:
+        owner = self.table.c[self.owner_column]
+        statement = select(owner, *(getattr(self.model, name) for name in self.columns)).join(
+            self.model, self.model.id == self.table.c[self.target_column]
+        )
+        grouped = {}
+        for start in range(0, len(owner_ids), LINK_CHUNK_SIZE):
+            rows = db.execute(
+                statement.where(owner.in_(owner_ids[start:start + LINK_CHUNK_SIZE]))
+            )
+            for owner_id, *values in rows:
+                grouped.setdefault(owner_id, []).append(dict(zip(self.columns, values)))
+        return grouped
+
+
+@dataclass(frozen=True)
+class ListProjection:
+    """Column-projected query and serialisation for a read-only list endpoint.
+
+    Selects only the listed columns (no ORM objects are built), loads each
+    link with one query per page, and hands plain dicts to orjson. The
+    first column must be the primary key.
+    """
+
+    columns: tuple
+    links: tuple = ()
+    # Per-field converters for values whose JSON form differs from orjson's
+    formatters: dict = field(default_factory=dict)
+
+    def query(self, db: Session) -> Query:
+        return db.query(*self.columns)
+
+    def serialize(self, db: Session, rows: Iterable) -> list[dict]:
+        items = [row._asdict() for row in rows]
+        for key, formatter in self.formatters.items():
+            for item in items:
+                if item[key] is not None:
+                    item[key] = formatter(item[key])
+        if items and self.links:
+            ids = [item["id"] for item in items]
+            for link in self.links:
+                grouped = link.load(db, ids)
+                for item in items:
+                    item[link.key] = grouped.get(item["id"], [])
+        return items
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def list_response(items: list[dict], response: Response) -> ORJSONResponse:
+    """Serialise with orjson, keeping the pagination header set by paginate()."""
+    headers = {}
+    if NEXT_CURSOR_HEADER in response.headers:
+        headers[NEXT_CURSOR_HEADER] = response.headers[NEXT_CURSOR_HEADER]
+    return ORJSONResponse(items, headers=headers)
+
+
+def ndjson_response(
+    projection: ListProjection,
+    build_query: Callable[[Session], Query],
+    session_factory: Callable[[], Session] = ReadSessionLocal,
+) -> StreamingResponse:
+    """Stream every matching row as one JSON object per line.
+
+    Rows are read from the cursor STREAM_BATCH_SIZE at a time and each batch
+    is serialised and sent before the next is fetched, so memory stays
+    bounded however many rows match.
+    """
+
+    def lines() -> Iterator[bytes]:
+        # The request's session is closed before a streaming body is sent
+        db = session_factory()
+        try:
+            rows = db.execute(
+                build_query(db).statement,
+                execution_options={"yield_per": STREAM_BATCH_SIZE},
+            )
+            for batch in rows.partitions():
+                yield b"".join(
+                    orjson.dumps(item) + b"\n" for item in projection.serialize(db, batch)
+                )
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
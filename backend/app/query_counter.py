@@ -0,0 +1,67 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.database import (
+    archive_read_engine,
+    async_archive_read_engine,
+    async_engine,
+    async_read_engine,
+    engine as write_engine,
+    read_engine,
+)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """Record every SQL statement executed on `engine` (default: all of the
+    read-write, read-only and archive engines, sync and async) inside the block.
+
+    with count_queries() as counter:
+        client.get("/meetings/")
+    print(counter.count)
+    """
+    counter = QueryCounter()
+    engines = [engine] if engine is not None else [
+        write_engine,
+        read_engine,
+        async_engine.sync_engine,
+        async_read_engine.sync_engine,
+        archive_read_engine,
+        async_archive_read_engine.sync_engine,
+    ]
+    for target in engines:
+        event.listen(target, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", counter)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine=None):
+    """Fail if the block runs more than `limit` SQL statements.
+
+    Use in tests to catch N+1 regressions, e.g.:
+
+    with assert_max_queries(3):
+        client.get("/meetings/")
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        statements = "\n".join(counter.statements)
+        raise AssertionError(
+            f"Expected at most {limit} queries, got {counter.count}:\n{statements}"
+        )
@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+from typing import Optional
+import numpy as np
+from app.models import RecurrenceFrequency, RecurrenceRule
+
+DAY_STEPS = {RecurrenceFrequency.DAILY: 1, RecurrenceFrequency.WEEKLY: 7}
+MONTH_STEPS = {RecurrenceFrequency.MONTHLY: 1, RecurrenceFrequency.YEARLY: 12}
+
+
+def _month_index(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def occurrence_dates(
+    start: date,
+    frequency: RecurrenceFrequency,
+    interval: int,
+    end_date: Optional[date],
+    window_start: date,
+    window_end: date,
+) -> list[date]:
+    """Dates of a recurrence that fall inside [window_start, window_end).
+
+    The k-th occurrence is computed directly from the first one (start plus
+    k * interval units), so only the occurrences inside the window are ever
+    generated, however far the rule extends. Monthly and yearly rules keep
+    the original day of month and clamp it to the end of shorter months
+    (a rule starting on Jan 31 falls on Feb 28/29, then Mar 31).
+    """
+    interval = max(interval or 1, 1)
+    upper = window_end
+    if end_date is not None:
+        # end_date is inclusive
+        upper = min(upper, end_date + timedelta(days=1))
+    lower = max(window_start, start)
+    if lower >= upper:
+        return []
+
+    if frequency in DAY_STEPS:
+        step = DAY_STEPS[frequency] * interval
+        k = _ceil_div((lower - start).days, step)
+        first = np.datetime64(start, "D") + k * step
+        dates = np.arange(first, np.datetime64(upper, "D"), step)
+        return dates.tolist()
+
+    step = MONTH_STEPS[frequency] * interval
+    anchor = _month_index(start)
+    k_lo = max(_ceil_div(_month_index(lower) - anchor, step), 0)
+    k_hi = (_month_index(upper - timedelta(days=1)) - anchor) // step
+    if k_hi < k_lo:
+        return []
+
+    months = np.datetime64(start, "M") + np.arange(k_lo, k_hi + 1) * step
+    month_starts = months.astype("datetime64[D]")
+    month_lengths = ((months + 1).astype("datetime64[D]") - month_starts).astype(int)
+    dates = month_starts + (np.minimum(start.day, month_lengths) - 1)
+    dates = dates[
+        (dates >= np.datetime64(lower, "D")) & (dates < np.datetime64(upper, "D"))
+    ]
+    return dates.tolist()
+
+
+def expand_rule(rule: RecurrenceRule, window_start: date, window_end: date) -> list[date]:
+    return occurrence_dates(
+        start=rule.meeting.date,
+        frequency=rule.frequency,
+        interval=rule.interval,
+        end_date=rule.end_date,
+        window_start=window_start,
+        window_end=window_end,
+    )
+
+
+def nth_occurrence(start: date, frequency: RecurrenceFrequency, interval: int, n: int) -> date:
+    """Date of the n-th occurrence (0 is the first), e.g. to turn a COUNT into an end date."""
+    interval = max(interval or 1, 1)
+    if frequency in DAY_STEPS:
+        return start + timedelta(days=DAY_STEPS[frequency] * interval * n)
+    month = np.datetime64(start, "M") + MONTH_STEPS[frequency] * interval * n
+    month_start = month.astype("datetime64[D]")
+    month_length = ((month + 1).astype("datetime64[D]") - month_start).astype(int)
+    return (month_start + (min(start.day, month_length) - 1)).tolist()
@@ -0,0 +1,193 @@
+import heapq
+import os
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session, selectinload
+from app.database import ReadSessionLocal, SessionLocal
+from app.models import Meeting, Reminder, Task
+from app.mail_queue import enqueue_email, mail_workers
+
+# Reminders due within this many seconds are held in memory; later ones are
+# loaded from the reminder_time index when the window rolls forward
+REMINDER_LOOKAHEAD = float(os.environ.get("REMINDER_LOOKAHEAD", "3600"))
+# Reminders missed while the server was down are still sent if they are at
+# most this many seconds late
+REMINDER_GRACE_PERIOD = float(os.environ.get("REMINDER_GRACE_PERIOD", "86400"))
+
+
+class ReminderScheduler:
+    """Fires reminders at their reminder_time.
+
+    Upcoming reminders sit in a min-heap keyed by reminder_time and a single
+    thread sleeps until the earliest one is due (or a new, earlier one is
+    scheduled), so the reminders table is never polled.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, int]] = []
+        # reminder_time each queued reminder is due at; heap entries that no
+        # longer match (the reminder was rescheduled) are skipped when popped
+        self._scheduled: dict[int, datetime] = {}
+        self._condition = threading.Condition()
+        self._window_end = None
+        self._thread = None
+        self._stopping = False
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        now = datetime.now()
+        # Recover anything missed while the server was down
+        self._load(now - timedelta(seconds=REMINDER_GRACE_PERIOD), now)
+        self._thread = threading.Thread(
+            target=self._run, name="reminder-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def schedule(self, reminder_id: int, reminder_time: datetime):
+        """Register a new or rescheduled reminder without rescanning the table."""
+        with self._condition:
+            if self._window_end is None or reminder_time >= self._window_end:
+                # Picked up when the window reaches it
+                self._scheduled.pop(reminder_id, None)
+                return
+            self._push(reminder_time, reminder_id)
+            if self._heap[0][1] == reminder_id:
+                # New earliest deadline; wake the thread so it sleeps less
+                self._condition.notify()
+
+    def _push(self, reminder_time: datetime, reminder_id: int):
+        if self._scheduled.get(reminder_id) != reminder_time:
+            self._scheduled[reminder_id] = reminder_time
+            heapq.heappush(self._heap, (reminder_time, reminder_id))
+
+    def _load(self, since: datetime, now: datetime):
+        """Queue every pending reminder from `since` up to the end of the next window."""
+        window_end = now + timedelta(seconds=REMINDER_LOOKAHEAD)
+        db = ReadSessionLocal()
+        try:
+            rows = (
+                db.query(Reminder.id, Reminder.reminder_time)
+                .filter(
+                    Reminder.dispatched_at.is_(None),
+                    Reminder.reminder_time >= since,
+                    Reminder.reminder_time < window_end,
+                )
+                .all()
+            )
+        finally:
+            db.close()
+        with self._condition:
+            for reminder_id, reminder_time in rows:
+                self._push(reminder_time, reminder_id)
+            self._window_end = window_end
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    now = datetime.now()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    if now >= self._window_end:
+                        break
+                    wake_at = self._window_end
+                    if self._heap:
+                        wake_at = min(wake_at, self._heap[0][0])
+                    self._condition.wait((wake_at - now).total_seconds())
+                if self._stopping:
+                    return
+
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    reminder_time, reminder_id = heapq.heappop(self._heap)
+                    if self._scheduled.get(reminder_id) == reminder_time:
+                        del self._scheduled[reminder_id]
+                        due.append((reminder_time, reminder_id))
+                window_end = self._window_end
+
+            try:
+                if due:
+                    self._dispatch([reminder_id for _, reminder_id in due])
+                    due = []
+                if now >= window_end:
+                    self._load(window_end, now)
+            except Exception as e:
+                print(f"[WARNING] Reminder dispatch failed: {e}")
+                with self._condition:
+                    # Nothing was committed (e.g. "database is locked"), so
+                    # retry the batch unless a reminder was rescheduled meanwhile
+                    for reminder_time, reminder_id in due:
+                        if reminder_id not in self._scheduled:
+                            self._push(reminder_time, reminder_id)
+                    self._condition.wait(5)
+
+    def _dispatch(self, reminder_ids: list[int]):
+        db = SessionLocal()
+        try:
+            dispatch_reminders(db, reminder_ids)
+        finally:
+            db.close()
+
+
+def reminder_recipients(reminder: Reminder) -> list[str]:
+    participants = reminder.participants
+    if not participants:
+        # Fall back to whoever is on the task or meeting
+        target = reminder.task or reminder.meeting
+        participants = target.participants if target else []
+    return [participant.email for participant in participants]
+
+
+def dispatch_reminders(db: Session, reminder_ids: list[int]) -> int:
+    """Queue the emails for a batch of due reminders in one transaction."""
+    now = datetime.now()
+    reminders = (
+        db.query(Reminder)
+        .options(
+            selectinload(Reminder.participants),
+            selectinload(Reminder.task).selectinload(Task.participants),
+            selectinload(Reminder.meeting).selectinload(Meeting.participants),
+        )
+        # A reminder moved to a later time since it was queued isn't due yet
+        .filter(
+            Reminder.id.in_(reminder_ids),
+            Reminder.dispatched_at.is_(None),
+            Reminder.reminder_time <= now,
+        )
+        .all()
+    )
+    for reminder in reminders:
+        recipients = reminder_recipients(reminder)
+        if recipients:
+            enqueue_email(
+                db,
+                subject=reminder.message,
+                body=f"""
+Hi there,
+
+This is a reminder: {reminder.message}
+
+Best regards,
+The Team
+    """,
+                recipients=recipients,
+                commit=False,
+            )
+        reminder.dispatched_at = now
+    db.commit()
+    if reminders:
+        mail_workers.wake()
+    return len(reminders)
+
+
+reminder_scheduler = ReminderScheduler()
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+from fastapi import Request, Response
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+class ResponseCache:
+    """In-process cache of serialised JSON bodies for read-mostly list endpoints.
+
+    Entries are filled on the first read and dropped by invalidate(), which
+    the write handlers call after committing. Each key has a generation
+    number so that a read racing with a write never stores the older body.
+    Only writes made through this process are seen, so run a single worker
+    (or move the cache out of process) when relying on it.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, CachedResponse] = {}
+        self._generations: dict[str, int] = {}
+        self._modified: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str, load: Callable[[], Awaitable[object]]) -> CachedResponse:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            generation = self._generations.get(key, 0)
+
+        body = json.dumps(await load(), separators=(",", ":")).encode("utf-8")
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            last_modified=self._modified.get(key) or datetime.now(timezone.utc),
+        )
+        with self._lock:
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = entry
+        return entry
+
+    def invalidate(self, *keys: str):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+                self._modified[key] = now
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else None,
+                "entries": sorted(self._entries),
+            }
+
+
+response_cache = ResponseCache()
+
+
+async def cached_json_response(
+    request: Request, key: str, load: Callable[[], Awaitable[object]]
+) -> Response:
+    """Serve `key` from the cache, answering conditional requests with 304.
+
+    `load` is awaited on a miss to produce the JSON-serialisable payload.
+    """
+    entry = await response_cache.get(key, load)
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": format_datetime(entry.last_modified, usegmt=True),
+        # Let clients keep a copy but revalidate it on every use
+        "Cache-Control": "no-cache",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, entry.etag) or (
+        if_none_match is None
+        and not_modified_since(request.headers.get("if-modified-since"), entry.last_modified)
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.archive import ARCHIVE_AFTER_DAYS, archive_cutoff, archive_stats, archiver
+from app.database import get_read_db
+
+router = APIRouter()
+
+
+@router.get("/")
+def get_archive_status(db: Session = Depends(get_read_db)):
+    """Row counts in the hot and archive tables, and the last archiving pass."""
+    return {
+        "archive_after_days": ARCHIVE_AFTER_DAYS,
+        "cutoff": str(archive_cutoff()),
+        "tables": archive_stats(db),
+        "last_run": archiver.last_run,
+    }
+
+
+@router.post("/run")
+def run_archiver():
+    """Archive everything older than the cutoff now instead of waiting for the job."""
+    return {"moved": archiver.run()}
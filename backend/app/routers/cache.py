@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from app.response_cache import response_cache
+
+router = APIRouter()
+
+
+@router.get("/stats")
+def cache_stats():
+    """Hit/miss counters of the in-process response cache."""
+    return response_cache.stats()
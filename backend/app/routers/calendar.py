@@ -0,0 +1,209 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import Session
+from app.database import get_list_db
+from app.models import (
+    Meeting,
+    Task,
+    Participant,
+    Category,
+    RecurrenceRule,
+    meeting_participant,
+    task_participant,
+    category_meeting,
+    category_task,
+)
+from app.occurrences import query_occurrences
+from datetime import date, timedelta
+from typing import Literal, Optional
+
+router = APIRouter()
+
+MAX_WINDOW_DAYS = 366
+# Default window length when only start is given; a month grid shows six weeks
+VIEW_DAYS = {"month": 42, "week": 7, "day": 1}
+
+
+def load_links(db: Session, meeting_ids: set, task_ids: set) -> dict:
+    """Participant and category ids of the given meetings and tasks, in one query."""
+    links = {
+        ("meeting", "participant"): {},
+        ("meeting", "category"): {},
+        ("task", "participant"): {},
+        ("task", "category"): {},
+    }
+    selects = []
+    if meeting_ids:
+        selects += [
+            select(
+                literal("meeting"), literal("participant"),
+                meeting_participant.c.meeting_id, meeting_participant.c.participant_id,
+            ).where(meeting_participant.c.meeting_id.in_(meeting_ids)),
+            select(
+                literal("meeting"), literal("category"),
+                category_meeting.c.meeting_id, category_meeting.c.category_id,
+            ).where(category_meeting.c.meeting_id.in_(meeting_ids)),
+        ]
+    if task_ids:
+        selects += [
+            select(
+                literal("task"), literal("participant"),
+                task_participant.c.task_id, task_participant.c.participant_id,
+            ).where(task_participant.c.task_id.in_(task_ids)),
+            select(
+                literal("task"), literal("category"),
+                category_task.c.task_id, category_task.c.category_id,
+            ).where(category_task.c.task_id.in_(task_ids)),
+        ]
+    if not selects:
+        return links
+
+    for owner, kind, owner_id, linked_id in db.execute(union_all(*selects)):
+        links[(owner, kind)].setdefault(owner_id, []).append(linked_id)
+    return links
+
+
+@router.get("/")
+def get_calendar(
+    start: date,
+    end: Optional[date] = None,
+    view: Literal["month", "week", "day"] = "month",
+    participant_id: Optional[int] = None,
+    db: Session = Depends(get_list_db),
+):
+    """Everything the calendar needs to render [start, end) in one response.
+
+    Meetings, tasks and recurring occurrences reference participants and
+    categories by id; each participant and category appears once in the
+    top-level lookup lists however many events share it. Pass
+    include_archived=true to include archived meetings and tasks.
+    """
+    end = end or start + timedelta(days=VIEW_DAYS[view])
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if (end - start).days > MAX_WINDOW_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Window cannot exceed {MAX_WINDOW_DAYS} days"
+        )
+
+    # One-off meetings; recurring ones are returned through their occurrences
+    meeting_query = (
+        db.query(
+            Meeting.id, Meeting.title, Meeting.description, Meeting.date,
+            Meeting.start_time, Meeting.end_time, Meeting.color,
+        )
+        .outerjoin(RecurrenceRule, RecurrenceRule.meeting_id == Meeting.id)
+        .filter(RecurrenceRule.id.is_(None), Meeting.date >= start, Meeting.date < end)
+    )
+    task_query = db.query(
+        Task.id, Task.title, Task.description, Task.due_date, Task.color
+    ).filter(Task.due_date >= start, Task.due_date < end)
+    if participant_id:
+        meeting_query = meeting_query.filter(
+            Meeting.participants.any(Participant.id == participant_id)
+        )
+        task_query = task_query.filter(
+            Task.participants.any(Participant.id == participant_id)
+        )
+    meetings = meeting_query.order_by(Meeting.date, Meeting.start_time).all()
+    tasks = task_query.order_by(Task.due_date, Task.id).all()
+
+    occurrences = query_occurrences(db, start, end)
+    recurring = {meeting.id: (meeting, rule) for meeting, rule, _ in occurrences}
+
+    links = load_links(
+        db, {m.id for m in meetings} | set(recurring), {t.id for t in tasks}
+    )
+    meeting_participants = links[("meeting", "participant")]
+    meeting_categories = links[("meeting", "category")]
+    task_participants = links[("task", "participant")]
+    task_categories = links[("task", "category")]
+
+    if participant_id:
+        recurring = {
+            meeting_id: value
+            for meeting_id, value in recurring.items()
+            if participant_id in meeting_participants.get(meeting_id, [])
+        }
+
+    participant_ids = set()
+    category_ids = set()
+    for meeting_id in [m.id for m in meetings] + list(recurring):
+        participant_ids.update(meeting_participants.get(meeting_id, []))
+        category_ids.update(meeting_categories.get(meeting_id, []))
+    for task in tasks:
+        participant_ids.update(task_participants.get(task.id, []))
+        category_ids.update(task_categories.get(task.id, []))
+
+    participants = (
+        db.query(Participant.id, Participant.name, Participant.email)
+        .filter(Participant.id.in_(participant_ids))
+        .all()
+        if participant_ids
+        else []
+    )
+    categories = (
+        db.query(Category.id, Category.name).filter(Category.id.in_(category_ids)).all()
+        if category_ids
+        else []
+    )
+
+    return {
+        "start": str(start),
+        "end": str(end),
+        "meetings": [
+            {
+                "id": m.id,
+                "title": m.title,
+                "description": m.description,
+                "date": str(m.date),
+                "start_time": str(m.start_time),
+                "end_time": str(m.end_time),
+                "color": m.color,
+                "participant_ids": meeting_participants.get(m.id, []),
+                "category_ids": meeting_categories.get(m.id, []),
+            }
+            for m in meetings
+        ],
+        "tasks": [
+            {
+                "id": t.id,
+                "title": t.title,
+                "description": t.description,
+                "due_date": str(t.due_date),
+                "color": t.color,
+                "participant_ids": task_participants.get(t.id, []),
+                "category_ids": task_categories.get(t.id, []),
+            }
+            for t in tasks
+        ],
+        "recurring_meetings": [
+            {
+                "meeting_id": meeting.id,
+                "recurrence_id": rule.id,
+                "title": meeting.title,
+                "description": meeting.description,
+                "start_time": str(meeting.start_time),
+                "end_time": str(meeting.end_time),
+                "color": meeting.color,
+                "frequency": rule.frequency.value,
+                "interval": rule.interval,
+                "end_date": str(rule.end_date) if rule.end_date else None,
+                "participant_ids": meeting_participants.get(meeting.id, []),
+                "category_ids": meeting_categories.get(meeting.id, []),
+            }
+            for meeting, rule in recurring.values()
+        ],
+        "occurrences": sorted(
+            (
+                {"meeting_id": meeting.id, "date": str(occurrence_date)}
+                for meeting, _, occurrence_date in occurrences
+                if meeting.id in recurring
+            ),
+            key=lambda o: (o["date"], o["meeting_id"]),
+        ),
+        "participants": [
+            {"id": p.id, "name": p.name, "email": p.email} for p in participants
+        ],
+        "categories": [{"id": c.id, "name": c.name} for c in categories],
+    }
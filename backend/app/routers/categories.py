@@ -1,72 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
 from app.models import Category
+from app.response_cache import cached_json_response, response_cache
 from typing import List
 
 router = APIRouter()
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/", response_model=List[dict])
-def get_categories(db: Session = Depends(get_db)):
-    categories = db.query(Category).all()
-    return [{"id": c.id, "name": c.name} for c in categories]
+async def get_categories(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    async def load():
+        categories = await db.scalars(select(Category))
+        return [{"id": c.id, "name": c.name} for c in categories]
+
+    return await cached_json_response(request, "categories", load)
 
 
 @router.get("/{category_id}", response_model=dict)
-def get_category(category_id: int, db: Session = Depends(get_db)):
-    category = db.query(Category).filter(Category.id == category_id).first()
+async def get_category(category_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    category = await db.get(Category, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     return {"id": category.id, "name": category.name, "color": category.color}
 
 
 @router.post("/", response_model=dict)
-def create_category(name: str, color: str, db: Session = Depends(get_db)):
+async def create_category(name: str, color: str, db: AsyncSession = Depends(get_async_db)):
     # Check if category name is unique
-    existing_category = db.query(Category).filter(Category.name == name).first()
+    existing_category = await db.scalar(select(Category).where(Category.name == name))
     if existing_category:
         raise HTTPException(status_code=400, detail="Category with this name already exists")
 
     category = Category(name=name, color=color)
     db.add(category)
-    db.commit()
-    db.refresh(category)
+    await db.commit()
+    response_cache.invalidate("categories")
     return {"message": "Category created successfully", "category_id": category.id}
 
 
 @router.put("/{category_id}", response_model=dict)
-def update_category(category_id: int, name: str = None, color: str = None, db: Session = Depends(get_db)):
-    category = db.query(Category).filter(Category.id == category_id).first()
+async def update_category(category_id: int, name: str = None, color: str = None, db: AsyncSession = Depends(get_async_db)):
+    category = await db.get(Category, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
     if name:
         # Ensure the new name is unique
-        existing_category = db.query(Category).filter(Category.name == name, Category.id != category_id).first()
+        existing_category = await db.scalar(
+            select(Category).where(Category.name == name, Category.id != category_id)
+        )
         if existing_category:
             raise HTTPException(status_code=400, detail="Category with this name already exists")
         category.name = name
     if color:
         category.color = color
 
-    db.commit()
+    await db.commit()
+    response_cache.invalidate("categories")
     return {"message": "Category updated successfully"}
 
 
 @router.delete("/{category_id}", response_model=dict)
-def delete_category(category_id: int, db: Session = Depends(get_db)):
-    category = db.query(Category).filter(Category.id == category_id).first()
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+    category = await db.get(Category, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
-    db.delete(category)
-    db.commit()
+    await db.delete(category)
+    await db.commit()
+    response_cache.invalidate("categories")
     return {"message": "Category deleted successfully"}
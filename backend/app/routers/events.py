@@ -0,0 +1,51 @@
+import asyncio
+import json
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from app.events import event_bus
+
+router = APIRouter()
+
+# Comment line sent on idle connections so proxies don't close them
+HEARTBEAT_INTERVAL = 15
+
+
+def format_sse(event) -> str:
+    message = f"event: {event.type}\n"
+    if event.id is not None:
+        message += f"id: {event.id}\n"
+    return message + f"data: {json.dumps(event.data)}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(request: Request):
+    """Server-Sent Events feed of calendar changes.
+
+    Each event's id is the change's sync version, so a client that
+    reconnects can catch up with /sync?since=<last event id>.
+    """
+    subscription = event_bus.subscribe()
+
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                if subscription.overflowed:
+                    # Too slow to keep up; tell the client to resync and hang up
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=HEARTBEAT_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
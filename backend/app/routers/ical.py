@@ -0,0 +1,242 @@
+import os
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from app.database import ReadSessionLocal, SessionLocal
+from app.models import (
+    Category,
+    Meeting,
+    Participant,
+    RecurrenceRule,
+    Task,
+    category_meeting,
+    category_task,
+    meeting_participant,
+    task_participant,
+)
+from app.batch import bulk_insert, replace_links
+from app.events import publish_row_change
+from app.ical import ICalendarError, calendar_stream, iter_components, parse_event, parse_todo, unfolded_lines
+from app.loading import RECURRENCE_WITH_MEETING
+from app.occurrences import rebuild_rule
+from app.response_cache import etag_matches
+from app.sync import current_version, next_version
+from typing import Optional
+
+router = APIRouter()
+
+# Rows fetched per round trip while streaming an export
+ICS_EXPORT_BATCH_SIZE = int(os.environ.get("ICS_EXPORT_BATCH_SIZE", "500"))
+# Parsed components inserted per transaction while importing
+ICS_IMPORT_CHUNK_SIZE = int(os.environ.get("ICS_IMPORT_CHUNK_SIZE", "500"))
+
+
+def _export_rows(db: Session, participant_id: Optional[int], category_id: Optional[int]):
+    # Takes over the handler's session (and closes it), so the rows come from
+    # the same snapshot as the ETag; the request's own session would be closed
+    # before a streaming body is sent
+    try:
+        meetings = db.query(Meeting).options(
+            selectinload(Meeting.participants),
+            selectinload(Meeting.categories),
+            selectinload(Meeting.recurrence_rule),
+        )
+        tasks = db.query(Task).options(
+            selectinload(Task.participants), selectinload(Task.categories)
+        )
+        if participant_id:
+            meetings = meetings.filter(Meeting.participants.any(Participant.id == participant_id))
+            tasks = tasks.filter(Task.participants.any(Participant.id == participant_id))
+        if category_id:
+            meetings = meetings.filter(Meeting.categories.any(Category.id == category_id))
+            tasks = tasks.filter(Task.categories.any(Category.id == category_id))
+        # yield_per streams rows from the cursor in batches instead of loading
+        # the whole calendar; the eager loads run once per batch
+        yield from calendar_stream(
+            meetings.order_by(Meeting.id).yield_per(ICS_EXPORT_BATCH_SIZE),
+            tasks.order_by(Task.id).yield_per(ICS_EXPORT_BATCH_SIZE),
+        )
+    finally:
+        db.close()
+
+
+@router.get("/calendar.ics")
+def export_calendar(
+    request: Request,
+    participant_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+):
+    """iCalendar feed of meetings (VEVENT, with RRULE) and tasks (VTODO).
+
+    The ETag is the current sync version, which changes whenever any synced
+    row does or rows are archived, so an unchanged feed is answered with 304
+    without touching the meetings or tasks tables. It is read in the same
+    transaction as the feed, so a change committed in between can't be
+    served under the older ETag.
+    """
+    db = ReadSessionLocal()
+    try:
+        etag = f'W/"{current_version(db)}"'
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            db.close()
+            return Response(status_code=304, headers={"ETag": etag})
+
+        if participant_id and not db.get(Participant, participant_id):
+            raise HTTPException(status_code=404, detail="Participant not found")
+        if category_id and not db.get(Category, category_id):
+            raise HTTPException(status_code=404, detail="Category not found")
+    except BaseException:
+        db.close()
+        raise
+
+    return StreamingResponse(
+        _export_rows(db, participant_id, category_id),
+        media_type="text/calendar; charset=utf-8",
+        headers={
+            "ETag": etag,
+            "Content-Disposition": 'attachment; filename="calendar.ics"',
+        },
+    )
+
+
+def _import_chunk(events: list[dict], todos: list[dict]) -> dict:
+    """Insert one chunk of parsed components in a single transaction."""
+    db = SessionLocal()
+    try:
+        items = events + todos
+        emails = {email for item in items for email in item["attendees"]}
+        participant_ids = dict(
+            db.query(func.lower(Participant.email), Participant.id)
+            .filter(func.lower(Participant.email).in_(emails))
+            .all()
+        ) if emails else {}
+        names = {name for item in items for name in item["categories"]}
+        category_ids = dict(
+            db.query(Category.name, Category.id).filter(Category.name.in_(names)).all()
+        ) if names else {}
+
+        version = next_version(db)
+
+        def link_rows(owner: str, owner_ids: list[int], source: list[dict]):
+            participants, categories = [], []
+            for owner_id, item in zip(owner_ids, source):
+                # Unknown attendees and categories are dropped, not created
+                participants += [
+                    {owner: owner_id, "participant_id": participant_ids[email]}
+                    for email in set(item["attendees"]) if email in participant_ids
+                ]
+                categories += [
+                    {owner: owner_id, "category_id": category_ids[name]}
+                    for name in set(item["categories"]) if name in category_ids
+                ]
+            return participants, categories
+
+        meeting_ids = bulk_insert(
+            db,
+            Meeting,
+            [
+                {
+                    "title": e["title"],
+                    "description": e["description"],
+                    "date": e["date"],
+                    "start_time": e["start_time"],
+                    "end_time": e["end_time"],
+                    "color": e["color"],
+                }
+                for e in events
+            ],
+            version,
+        )
+        participants, categories = link_rows("meeting_id", meeting_ids, events)
+        replace_links(db, meeting_participant, "meeting_id", [], participants)
+        replace_links(db, category_meeting, "meeting_id", [], categories)
+
+        rule_ids = bulk_insert(
+            db,
+            RecurrenceRule,
+            [
+                {"meeting_id": meeting_id, **e["recurrence"]}
+                for meeting_id, e in zip(meeting_ids, events)
+                if e["recurrence"]
+            ],
+            version,
+        )
+        if rule_ids:
+            rules = (
+                db.query(RecurrenceRule)
+                .join(RecurrenceRule.meeting)
+                .options(*RECURRENCE_WITH_MEETING)
+                .filter(RecurrenceRule.id.in_(rule_ids))
+            )
+            for rule in rules:
+                rebuild_rule(db, rule, commit=False)
+
+        task_ids = bulk_insert(
+            db,
+            Task,
+            [
+                {
+                    "title": t["title"],
+                    "description": t["description"],
+                    "due_date": t["due_date"],
+                    "color": t["color"],
+                }
+                for t in todos
+            ],
+            version,
+        )
+        participants, categories = link_rows("task_id", task_ids, todos)
+        replace_links(db, task_participant, "task_id", [], participants)
+        replace_links(db, category_task, "task_id", [], categories)
+
+        db.commit()
+    finally:
+        db.close()
+
+    for meeting_id in meeting_ids:
+        publish_row_change("meetings", "created", meeting_id, version)
+    for rule_id in rule_ids:
+        publish_row_change("recurrence_rules", "created", rule_id, version)
+    for task_id in task_ids:
+        publish_row_change("tasks", "created", task_id, version)
+    return {"meetings": len(meeting_ids), "recurrence_rules": len(rule_ids), "tasks": len(task_ids)}
+
+
+@router.post("/calendar.ics")
+async def import_calendar(request: Request):
+    """Import the VEVENTs and VTODOs of an iCalendar body (text/calendar).
+
+    The body is parsed as it arrives and inserted every ICS_IMPORT_CHUNK_SIZE
+    components, so a large file is never held in memory. Each chunk is its
+    own transaction; if the file turns out to be malformed, the chunks
+    before the error stay imported. No invitation emails are sent.
+    """
+    counts = {"meetings": 0, "recurrence_rules": 0, "tasks": 0, "skipped": 0}
+    events, todos = [], []
+
+    async def flush():
+        if events or todos:
+            imported = await run_in_threadpool(_import_chunk, events[:], todos[:])
+            for key, value in imported.items():
+                counts[key] += value
+            events.clear()
+            todos.clear()
+
+    try:
+        async for component, properties in iter_components(unfolded_lines(request.stream())):
+            parsed = parse_event(properties) if component == "VEVENT" else parse_todo(properties)
+            if parsed is None:
+                counts["skipped"] += 1
+                continue
+            (events if component == "VEVENT" else todos).append(parsed)
+            if len(events) + len(todos) >= ICS_IMPORT_CHUNK_SIZE:
+                await flush()
+    except ICalendarError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{e} (imported before the error: {counts})",
+        )
+    await flush()
+    return counts
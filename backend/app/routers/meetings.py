@@ -1,11 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.models import Meeting, Participant, Category
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import date, time
-from app.routers.notifications import notify_meeting
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.database import (
+    ArchiveReadSessionLocal,
+    ReadSessionLocal,
+    get_async_db,
+    get_async_list_db,
+    get_async_read_db,
+)
+from app.models import (
+    Meeting,
+    Participant,
+    Category,
+    Occurrence,
+    RecurrenceRule,
+    category_meeting,
+    meeting_participant,
+)
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional
+import datetime as dt
+from datetime import date, datetime, time, timedelta
+from app.routers.notifications import notify_meeting, meeting_invitation_email
+from app.mail_queue import enqueue_emails, mail_workers
+from app.occurrences import rebuild_rule
+from app.sync import current_version, next_version
+from app.batch import (
+    BatchResults,
+    bulk_insert,
+    bulk_update,
+    check_batch_size,
+    collect_ids,
+    item_error,
+    replace_links,
+    time_order_error,
+)
+from app.pagination import paginate, MAX_PAGE_SIZE
+from app.loading import MEETING_VIEW
+from app.projections import list_response, ndjson_response, wants_ndjson
+from app.events import publish_change, publish_row_change
+from app.availability import (
+    find_conflicts,
+    find_free_slots,
+    load_busy_intervals,
+    working_windows,
+)
 
 router = APIRouter()
 
@@ -20,6 +60,23 @@ class MeetingCreate(BaseModel):
     category_ids: Optional[List[int]] = None
     color: Optional[str] = None
 
+class MeetingUpdate(BaseModel):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    # dt.date: a bare `date` here would refer to this field's own default
+    date: Optional[dt.date] = None
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    color: Optional[str] = None
+    participant_ids: Optional[List[int]] = None
+    category_ids: Optional[List[int]] = None
+
+class MeetingBatch(BaseModel):
+    create: List[MeetingCreate] = []
+    update: List[MeetingUpdate] = []
+    delete: List[int] = []
+
 class ParticipantResponse(BaseModel):
     id: int
     name: str
@@ -49,23 +106,69 @@ class MeetingResponse(BaseModel):
     class Config:
         orm_mode = True
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+class FindSlotsRequest(BaseModel):
+    participant_ids: List[int]
+    duration_minutes: int = Field(gt=0)
+    start: datetime
+    end: datetime
+    day_start: time = time(9, 0)
+    day_end: time = time(18, 0)
+    include_weekends: bool = False
+    mode: Literal["earliest", "best"] = "earliest"
+    max_results: int = Field(5, ge=1, le=50)
+
+    @field_validator("start", "end")
+    @classmethod
+    def to_local_time(cls, value: datetime) -> datetime:
+        # Meetings are stored in naive server-local time; clients often send
+        # UTC (e.g. JavaScript's toISOString())
+        if value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value
+
+class ConflictCheckRequest(BaseModel):
+    date: date
+    start_time: time
+    end_time: time
+    participant_ids: List[int]
+
+class SlotResponse(BaseModel):
+    start: datetime
+    end: datetime
+
+MAX_SLOT_SEARCH_DAYS = 92
 
 @router.post("/", response_model=MeetingResponse)
-def create_meeting(meeting_data: MeetingCreate, db: Session = Depends(get_db)):
-    participants = db.query(Participant).filter(Participant.id.in_(meeting_data.participant_ids)).all()
+async def create_meeting(
+    meeting_data: MeetingCreate,
+    check_conflicts: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    participants = (
+        await db.scalars(select(Participant).where(Participant.id.in_(meeting_data.participant_ids)))
+    ).all()
     if len(participants) != len(meeting_data.participant_ids):
         raise HTTPException(status_code=404, detail="One or more participants not found")
 
+    if check_conflicts:
+        conflicts = await db.run_sync(
+            find_conflicts,
+            meeting_data.participant_ids,
+            meeting_data.date,
+            meeting_data.start_time,
+            meeting_data.end_time,
+        )
+        if conflicts:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Participants are already booked", "conflicts": conflicts},
+            )
+
     categories = []
     if meeting_data.category_ids:
-        categories = db.query(Category).filter(Category.id.in_(meeting_data.category_ids)).all()
+        categories = (
+            await db.scalars(select(Category).where(Category.id.in_(meeting_data.category_ids)))
+        ).all()
         if len(categories) != len(meeting_data.category_ids):
             raise HTTPException(status_code=404, detail="One or more categories not found")
 
@@ -81,18 +184,279 @@ def create_meeting(meeting_data: MeetingCreate, db: Session = Depends(get_db)):
     )
 
     db.add(meeting)
-    db.commit()
-    db.refresh(meeting)
+    await db.commit()
+    publish_change("meetings", "created", meeting)
 
-    # Trigger email notification
+    # Queue email notification (sent in the background)
     try:
-        notify_meeting(meeting_id=meeting.id, db=db)
+        await db.run_sync(lambda session: notify_meeting(meeting_id=meeting.id, db=session))
     except Exception as e:
-        print(f"[WARNING] Failed to send meeting notification: {e}")
+        print(f"[WARNING] Failed to queue meeting notification: {e}")
 
     return meeting
 
 @router.get("/", response_model=List[MeetingResponse])
-def get_meetings(db: Session = Depends(get_db)):
-    meetings = db.query(Meeting).all()
-    return meetings
+async def get_meetings(
+    request: Request,
+    response: Response,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    participant_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_list_db),
+):
+    """List meetings.
+
+    Send "Accept: application/x-ndjson" to stream every matching meeting as
+    one JSON object per line; limit and cursor are ignored then.
+
+    Archived meetings (see app.archive) are left out unless
+    include_archived is true.
+    """
+    def filtered(db: Session):
+        query = MEETING_VIEW.query(db)
+        if start:
+            query = query.filter(Meeting.date >= start)
+        if end:
+            query = query.filter(Meeting.date < end)
+        if participant_id:
+            query = query.filter(Meeting.participants.any(Participant.id == participant_id))
+        if category_id:
+            query = query.filter(Meeting.categories.any(Category.id == category_id))
+        return query
+
+    if wants_ndjson(request):
+        return ndjson_response(
+            MEETING_VIEW,
+            lambda db: filtered(db).order_by(Meeting.date, Meeting.id),
+            ArchiveReadSessionLocal if include_archived else ReadSessionLocal,
+        )
+
+    def load(db: Session):
+        rows = paginate(
+            filtered(db), Meeting.date, Meeting.id, date.fromisoformat, response, limit, cursor
+        )
+        return MEETING_VIEW.serialize(db, rows)
+
+    return list_response(await db.run_sync(load), response)
+
+@router.post("/conflicts")
+async def check_meeting_conflicts(
+    request: ConflictCheckRequest, db: AsyncSession = Depends(get_async_read_db)
+):
+    if request.end_time <= request.start_time:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    conflicts = await db.run_sync(
+        find_conflicts, request.participant_ids, request.date, request.start_time, request.end_time
+    )
+    return {"conflicts": conflicts}
+
+
+@router.post("/find-slots", response_model=List[SlotResponse])
+async def find_slots(request: FindSlotsRequest, db: AsyncSession = Depends(get_async_read_db)):
+    if request.end <= request.start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if (request.end - request.start).days > MAX_SLOT_SEARCH_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Search window cannot exceed {MAX_SLOT_SEARCH_DAYS} days",
+        )
+
+    participant_ids = list(set(request.participant_ids))
+    found = await db.scalar(
+        select(func.count(Participant.id)).where(Participant.id.in_(participant_ids))
+    )
+    if found != len(participant_ids):
+        raise HTTPException(status_code=404, detail="One or more participants not found")
+
+    busy = await db.run_sync(
+        load_busy_intervals,
+        participant_ids,
+        request.start.date(),
+        request.end.date() + timedelta(days=1),
+    )
+    windows = working_windows(
+        request.start,
+        request.end,
+        request.day_start,
+        request.day_end,
+        request.include_weekends,
+    )
+    slots = find_free_slots(
+        busy,
+        windows,
+        timedelta(minutes=request.duration_minutes),
+        request.max_results,
+        request.mode,
+    )
+    return [{"start": start, "end": end} for start, end in slots]
+
+
+@router.post("/batch")
+async def batch_meetings(batch: MeetingBatch, db: AsyncSession = Depends(get_async_db)):
+    """Create, update and delete many meetings in one transaction.
+
+    Referenced participants and categories are validated with one query
+    each, rows are written with executemany, and invitation emails for all
+    new meetings are queued in the same commit. Items that fail validation
+    are reported in the results without aborting the rest of the batch.
+    """
+    return await db.run_sync(apply_meeting_batch, batch)
+
+
+def apply_meeting_batch(db: Session, batch: MeetingBatch) -> dict:
+    check_batch_size(batch.create, batch.update, batch.delete)
+    results = BatchResults()
+    edits = batch.create + batch.update
+
+    requested = collect_ids(edits, "participant_ids")
+    participant_emails = dict(
+        db.query(Participant.id, Participant.email)
+        .filter(Participant.id.in_(requested))
+        .all()
+    ) if requested else {}
+    requested = collect_ids(edits, "category_ids")
+    category_ids = {
+        category_id
+        for (category_id,) in db.query(Category.id).filter(Category.id.in_(requested))
+    } if requested else set()
+    requested = {item.id for item in batch.update} | set(batch.delete)
+    # Current times, to check the order of partially updated ones
+    current_times = {
+        meeting_id: (start_time, end_time)
+        for meeting_id, start_time, end_time in db.query(
+            Meeting.id, Meeting.start_time, Meeting.end_time
+        ).filter(Meeting.id.in_(requested))
+    } if requested else {}
+    existing_ids = set(current_times)
+
+    def invalid_item(item) -> Optional[str]:
+        error = item_error(item, Meeting, ("participant_ids", "category_ids"))
+        if error:
+            return error
+        start_time, end_time = current_times.get(getattr(item, "id", None), (None, None))
+        error = time_order_error(item.start_time or start_time, item.end_time or end_time)
+        if error:
+            return error
+        if set(item.participant_ids or []) - participant_emails.keys():
+            return "One or more participants not found"
+        if set(item.category_ids or []) - category_ids:
+            return "One or more categories not found"
+        return None
+
+    # Rows written with Core bypass the ORM flush hook, so stamp them here
+    version = next_version(db)
+
+    # Creates
+    creates = []
+    for index, item in enumerate(batch.create):
+        error = invalid_item(item)
+        if error:
+            results.error("create", index, error)
+        else:
+            creates.append((index, item))
+    created_ids = bulk_insert(
+        db,
+        Meeting,
+        [item.model_dump(exclude={"participant_ids", "category_ids"}) for _, item in creates],
+        version,
+    )
+    participant_links = []
+    category_links = []
+    emails = []
+    for (index, item), meeting_id in zip(creates, created_ids):
+        participant_links += [
+            {"meeting_id": meeting_id, "participant_id": pid}
+            for pid in item.participant_ids or []
+        ]
+        category_links += [
+            {"meeting_id": meeting_id, "category_id": cid} for cid in item.category_ids or []
+        ]
+        if item.participant_ids:
+            subject, body = meeting_invitation_email(item)
+            emails.append(
+                (subject, body, [participant_emails[pid] for pid in item.participant_ids])
+            )
+        results.ok("create", index, meeting_id)
+    replace_links(db, meeting_participant, "meeting_id", [], participant_links)
+    replace_links(db, category_meeting, "meeting_id", [], category_links)
+    enqueue_emails(db, emails)
+
+    # Updates
+    updates = []
+    participant_owners, participant_links = [], []
+    category_owners, category_links = [], []
+    rescheduled = []
+    for index, item in enumerate(batch.update):
+        error = (
+            "Meeting not found" if item.id not in existing_ids else invalid_item(item)
+        )
+        if error:
+            results.error("update", index, error, item.id)
+            continue
+        values = item.model_dump(
+            exclude_unset=True, exclude={"participant_ids", "category_ids"}
+        )
+        updates.append({**values, "version": version})
+        if values.keys() & {"date", "start_time", "end_time"}:
+            rescheduled.append(item.id)
+        if item.participant_ids is not None:
+            participant_owners.append(item.id)
+            participant_links += [
+                {"meeting_id": item.id, "participant_id": pid} for pid in item.participant_ids
+            ]
+        if item.category_ids is not None:
+            category_owners.append(item.id)
+            category_links += [
+                {"meeting_id": item.id, "category_id": cid} for cid in item.category_ids
+            ]
+        results.ok("update", index, item.id)
+    bulk_update(db, Meeting, updates)
+    replace_links(db, meeting_participant, "meeting_id", participant_owners, participant_links)
+    replace_links(db, category_meeting, "meeting_id", category_owners, category_links)
+    if rescheduled:
+        for rule in db.query(RecurrenceRule).filter(RecurrenceRule.meeting_id.in_(rescheduled)):
+            rebuild_rule(db, rule, commit=False)
+
+    # Deletes go through the ORM so association rows are cleared and tombstones written
+    deleted_ids = [meeting_id for meeting_id in batch.delete if meeting_id in existing_ids]
+    for index, meeting_id in enumerate(batch.delete):
+        if meeting_id in existing_ids:
+            results.ok("delete", index, meeting_id)
+        else:
+            results.error("delete", index, "Meeting not found", meeting_id)
+    deleted_version = None
+    if deleted_ids:
+        db.query(Occurrence).filter(Occurrence.meeting_id.in_(deleted_ids)).delete(
+            synchronize_session=False
+        )
+        meetings = (
+            db.query(Meeting)
+            .options(selectinload(Meeting.recurrence_rule), selectinload(Meeting.reminders))
+            .filter(Meeting.id.in_(deleted_ids))
+            .all()
+        )
+        for meeting in meetings:
+            if meeting.recurrence_rule:
+                db.delete(meeting.recurrence_rule)
+            for reminder in meeting.reminders:
+                db.delete(reminder)
+            db.delete(meeting)
+        db.flush()
+        deleted_version = current_version(db)
+
+    db.commit()
+    if emails:
+        mail_workers.wake()
+
+    for meeting_id in created_ids:
+        publish_row_change("meetings", "created", meeting_id, version)
+    for item in updates:
+        publish_row_change("meetings", "updated", item["id"], version)
+    for meeting_id in deleted_ids:
+        publish_row_change("meetings", "deleted", meeting_id, deleted_version)
+
+    return results.as_response()
@@ -1,33 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.models import Meeting, Task
-from app.smtp_client import send_email
-from typing import List
+from app.database import get_db, get_read_db
+from app.models import Meeting, Task, OutboundEmail, EmailStatus
+from app.mail_queue import enqueue_email
+from sqlalchemy import func
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-@router.post("/notify-meeting")
-def notify_meeting(meeting_id: int, db: Session = Depends(get_db)):
-    # Fetch the meeting and its participants
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-    if not meeting:
-        raise HTTPException(status_code=404, detail="Meeting not found")
-
-    participants = meeting.participants
-    if not participants:
-        return {"message": "No participants to notify"}
-
-    # Prepare email details
+def meeting_invitation_email(meeting) -> tuple[str, str]:
     subject = f"You're Invited: {meeting.title}"
     body = f"""
 Hi there,
@@ -44,29 +25,10 @@ Feel free to reach out if you have any questions or need further details. Lookin
 Warm regards,  
 The Team 
     """
-    recipient_emails = [participant.email for participant in participants]
+    return subject, body
 
-    # Send email to participants
-    try:
-        send_email(subject, body, recipient_emails)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to send emails: {str(e)}")
 
-    return {"message": "Notification sent to participants"}
-
-
-@router.post("/notify-task")
-def notify_task(task_id: int, db: Session = Depends(get_db)):
-    # Fetch the task and its participants
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    participants = task.participants
-    if not participants:
-        return {"message": "No participants to notify"}
-
-    # Prepare email details
+def task_assignment_email(task) -> tuple[str, str]:
     subject = f"Task Assigned: {task.title}"
     body = f"""
 Hi there,
@@ -82,12 +44,90 @@ Let us know if you have any questions or if there’s anything you need to compl
 Best regards,  
 The Team 
     """
+    return subject, body
+
+
+@router.post("/notify-meeting")
+def notify_meeting(meeting_id: int, db: Session = Depends(get_db)):
+    # Fetch the meeting and its participants
+    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    participants = meeting.participants
+    if not participants:
+        return {"message": "No participants to notify"}
+
+    # Prepare email details
+    subject, body = meeting_invitation_email(meeting)
     recipient_emails = [participant.email for participant in participants]
 
-    # Send email to participants
-    try:
-        send_email(subject, body, recipient_emails)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to send emails: {str(e)}")
+    # Queue the email; the mail workers deliver it in the background
+    email = enqueue_email(db, subject, body, recipient_emails)
+
+    return {"message": "Notification queued for participants", "email_id": email.id}
+
+
+@router.post("/notify-task")
+def notify_task(task_id: int, db: Session = Depends(get_db)):
+    # Fetch the task and its participants
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    participants = task.participants
+    if not participants:
+        return {"message": "No participants to notify"}
+
+    # Prepare email details
+    subject, body = task_assignment_email(task)
+    recipient_emails = [participant.email for participant in participants]
 
-    return {"message": "Notification sent to participants"}
\ No newline at end of file
+    # Queue the email; the mail workers deliver it in the background
+    email = enqueue_email(db, subject, body, recipient_emails)
+
+    return {"message": "Notification queued for participants", "email_id": email.id}
+
+
+def serialize_email(email: OutboundEmail) -> dict:
+    return {
+        "id": email.id,
+        "subject": email.subject,
+        "recipients": email.recipients,
+        "delivered_to": email.delivered_to or [],
+        "status": email.status.value,
+        "attempts": email.attempts,
+        "next_attempt_at": str(email.next_attempt_at),
+        "last_error": email.last_error,
+        "created_at": str(email.created_at),
+        "sent_at": str(email.sent_at) if email.sent_at else None,
+    }
+
+
+@router.get("/outbox")
+def get_outbox_status(
+    status: EmailStatus = None, limit: int = 50, db: Session = Depends(get_read_db)
+):
+    counts = dict(
+        db.query(OutboundEmail.status, func.count(OutboundEmail.id))
+        .group_by(OutboundEmail.status)
+        .all()
+    )
+
+    query = db.query(OutboundEmail)
+    if status:
+        query = query.filter(OutboundEmail.status == status)
+    emails = query.order_by(OutboundEmail.id.desc()).limit(limit).all()
+
+    return {
+        "counts": {s.value: counts.get(s, 0) for s in EmailStatus},
+        "emails": [serialize_email(email) for email in emails],
+    }
+
+
+@router.get("/outbox/{email_id}")
+def get_outbox_email(email_id: int, db: Session = Depends(get_read_db)):
+    email = db.query(OutboundEmail).filter(OutboundEmail.id == email_id).first()
+    if not email:
+        raise HTTPException(status_code=404, detail="Email not found")
+    return serialize_email(email)
@@ -1,27 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
 from app.models import Participant
+from app.response_cache import cached_json_response, response_cache
 from typing import List
 
 router = APIRouter()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=dict)
-def create_participant(name: str, email: str, db: Session = Depends(get_db)):
+async def create_participant(name: str, email: str, db: AsyncSession = Depends(get_async_db)):
     participant = Participant(name=name, email=email)
     db.add(participant)
-    db.commit()
-    db.refresh(participant)
+    await db.commit()
+    response_cache.invalidate("participants")
     return {
         "message": "Participant created successfully",
         "participant_id": participant.id,
@@ -29,24 +22,28 @@ def create_participant(name: str, email: str, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[dict])
-def get_participants(db: Session = Depends(get_db)):
-    participants = db.query(Participant).all()
-    return [{"id": p.id, "name": p.name, "email": p.email} for p in participants]
+async def get_participants(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    async def load():
+        participants = await db.scalars(select(Participant))
+        return [{"id": p.id, "name": p.name, "email": p.email} for p in participants]
+
+    return await cached_json_response(request, "participants", load)
 
 
 @router.get("/{participant_id}", response_model=dict)
-def get_participant(participant_id: int, db: Session = Depends(get_db)):
-    participant = db.query(Participant).filter(Participant.id == participant_id).first()
+async def get_participant(participant_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    participant = await db.get(Participant, participant_id)
     if not participant:
         raise HTTPException(status_code=404, detail="Participant not found")
     return {"id": participant.id, "name": participant.name, "email": participant.email}
 
 
 @router.delete("/{participant_id}", response_model=dict)
-def delete_participant(participant_id: int, db: Session = Depends(get_db)):
-    participant = db.query(Participant).filter(Participant.id == participant_id).first()
+async def delete_participant(participant_id: int, db: AsyncSession = Depends(get_async_db)):
+    participant = await db.get(Participant, participant_id)
     if not participant:
         raise HTTPException(status_code=404, detail="Participant not found")
-    db.delete(participant)
-    db.commit()
+    await db.delete(participant)
+    await db.commit()
+    response_cache.invalidate("participants")
     return {"message": "Participant deleted successfully"}
@@ -1,22 +1,21 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
 from app.models import Meeting, RecurrenceRule, RecurrenceFrequency
+from app.occurrences import query_occurrences, rebuild_rule
+from app.loading import RECURRENCE_WITH_MEETING
+from app.events import publish_change
+from datetime import date
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/")
-def get_recurring_meetings(db: Session = Depends(get_db)):
-    recurring_meetings = db.query(RecurrenceRule).join(Meeting).all()
+async def get_recurring_meetings(db: AsyncSession = Depends(get_async_read_db)):
+    recurring_meetings = await db.scalars(
+        select(RecurrenceRule).join(Meeting).options(*RECURRENCE_WITH_MEETING)
+    )
 
     result = []
     for rule in recurring_meetings:
@@ -39,8 +38,42 @@ def get_recurring_meetings(db: Session = Depends(get_db)):
     return {"recurring_meetings": result}
 
 
+MAX_OCCURRENCE_WINDOW_DAYS = 731
+
+
+@router.get("/occurrences")
+async def get_occurrences(start: date, end: date, db: AsyncSession = Depends(get_async_read_db)):
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if (end - start).days > MAX_OCCURRENCE_WINDOW_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Window cannot exceed {MAX_OCCURRENCE_WINDOW_DAYS} days",
+        )
+
+    result = []
+    occurrences = await db.run_sync(query_occurrences, start, end)
+    for meeting, rule, occurrence_date in occurrences:
+        result.append(
+            {
+                "recurrence_id": rule.id,
+                "meeting_id": meeting.id,
+                "title": meeting.title,
+                "description": meeting.description,
+                "date": str(occurrence_date),
+                "start_time": str(meeting.start_time),
+                "end_time": str(meeting.end_time),
+                "frequency": rule.frequency.value,
+                "color": meeting.color,
+            }
+        )
+
+    result.sort(key=lambda o: (o["date"], o["start_time"]))
+    return {"occurrences": result}
+
+
 from pydantic import BaseModel
-from datetime import date, time
+from datetime import time
 from typing import Optional
 
 
@@ -57,8 +90,8 @@ class RecurringMeetingRequest(BaseModel):
 
 
 @router.post("/")
-def create_recurring_meeting(
-    request: RecurringMeetingRequest, db: Session = Depends(get_db)
+async def create_recurring_meeting(
+    request: RecurringMeetingRequest, db: AsyncSession = Depends(get_async_db)
 ):
     meeting = Meeting(
         title=request.title,
@@ -69,8 +102,7 @@ def create_recurring_meeting(
         color=request.color
     )
     db.add(meeting)
-    db.commit()
-    db.refresh(meeting)
+    await db.commit()
 
     recurrence = RecurrenceRule(
         meeting_id=meeting.id,
@@ -79,5 +111,11 @@ def create_recurring_meeting(
         end_date=request.end_date,
     )
     db.add(recurrence)
-    db.commit()
+    await db.commit()
+
+    # Only this rule's stored occurrences need regenerating
+    await db.run_sync(rebuild_rule, recurrence)
+
+    publish_change("meetings", "created", meeting)
+    publish_change("recurrence_rules", "created", recurrence)
     return {"message": "Recurring meeting created", "meeting_id": meeting.id}
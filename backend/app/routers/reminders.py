@@ -1,27 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.models import Reminder, Task, Meeting, Participant
-from datetime import datetime
-from typing import List
+from app.database import (
+    ArchiveReadSessionLocal,
+    ReadSessionLocal,
+    get_async_db,
+    get_async_list_db,
+)
+from app.models import Reminder, Task, Meeting, Participant, Category, reminder_participant
+from app.pagination import paginate, MAX_PAGE_SIZE
+from app.loading import REMINDER_VIEW
+from app.projections import list_response, ndjson_response, wants_ndjson
+from app.events import publish_change, publish_row_change
+from app.reminder_scheduler import reminder_scheduler
+from app.sync import current_version, next_version
+from app.batch import (
+    BatchResults,
+    bulk_insert,
+    bulk_update,
+    check_batch_size,
+    collect_ids,
+    item_error,
+    replace_links,
+)
+from pydantic import BaseModel
+from datetime import datetime, date
+from typing import List, Optional
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+class ReminderCreate(BaseModel):
+    message: str
+    reminder_time: datetime
+    task_id: Optional[int] = None
+    meeting_id: Optional[int] = None
+    participant_ids: Optional[List[int]] = None
+
+class ReminderUpdate(BaseModel):
+    id: int
+    message: Optional[str] = None
+    reminder_time: Optional[datetime] = None
+    # Setting one of these moves the reminder and clears the other
+    task_id: Optional[int] = None
+    meeting_id: Optional[int] = None
+    participant_ids: Optional[List[int]] = None
+
+class ReminderBatch(BaseModel):
+    create: List[ReminderCreate] = []
+    update: List[ReminderUpdate] = []
+    delete: List[int] = []
 
 @router.post("/", response_model=dict)
-def create_reminder(
+async def create_reminder(
     message: str,
     reminder_time: str,
     task_id: int = None,
     meeting_id: int = None,
     participant_ids: List[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     if not task_id and not meeting_id:
         raise HTTPException(status_code=400, detail="Either task_id or meeting_id must be provided.")
@@ -29,8 +66,8 @@ def create_reminder(
         raise HTTPException(status_code=400, detail="Only one of task_id or meeting_id can be provided.")
 
     # Validate task or meeting
-    task = db.query(Task).filter(Task.id == task_id).first() if task_id else None
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first() if meeting_id else None
+    task = await db.get(Task, task_id) if task_id else None
+    meeting = await db.get(Meeting, meeting_id) if meeting_id else None
 
     if task_id and not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -38,7 +75,9 @@ def create_reminder(
         raise HTTPException(status_code=404, detail="Meeting not found")
 
     # Validate participants
-    participants = db.query(Participant).filter(Participant.id.in_(participant_ids)).all() if participant_ids else []
+    participants = (
+        await db.scalars(select(Participant).where(Participant.id.in_(participant_ids)))
+    ).all() if participant_ids else []
     if len(participants) != len(participant_ids):
         raise HTTPException(status_code=404, detail="One or more participants not found")
 
@@ -51,21 +90,199 @@ def create_reminder(
     )
 
     db.add(reminder)
-    db.commit()
-    db.refresh(reminder)
+    await db.commit()
+    publish_change("reminders", "created", reminder)
+    reminder_scheduler.schedule(reminder.id, reminder.reminder_time)
     return {"message": "Reminder created successfully", "reminder_id": reminder.id}
 
 @router.get("/", response_model=List[dict])
-def get_reminders(db: Session = Depends(get_db)):
-    reminders = db.query(Reminder).all()
-    return [
-        {
-            "id": reminder.id,
-            "message": reminder.message,
-            "reminder_time": str(reminder.reminder_time),
-            "task_id": reminder.task_id,
-            "meeting_id": reminder.meeting_id,
-            "participants": [{"id": p.id, "name": p.name, "email": p.email} for p in reminder.participants],
-        }
-        for reminder in reminders
-    ]
+async def get_reminders(
+    request: Request,
+    response: Response,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    participant_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_list_db),
+):
+    """List reminders; "Accept: application/x-ndjson" streams them like GET /meetings/."""
+    def filtered(db: Session):
+        query = REMINDER_VIEW.query(db)
+        if start:
+            query = query.filter(Reminder.reminder_time >= datetime.combine(start, datetime.min.time()))
+        if end:
+            query = query.filter(Reminder.reminder_time < datetime.combine(end, datetime.min.time()))
+        if participant_id:
+            query = query.filter(Reminder.participants.any(Participant.id == participant_id))
+        if category_id:
+            # Reminders inherit the categories of the task or meeting they belong to
+            query = query.filter(
+                or_(
+                    Reminder.task.has(Task.categories.any(Category.id == category_id)),
+                    Reminder.meeting.has(Meeting.categories.any(Category.id == category_id)),
+                )
+            )
+        return query
+
+    if wants_ndjson(request):
+        return ndjson_response(
+            REMINDER_VIEW,
+            lambda db: filtered(db).order_by(Reminder.reminder_time, Reminder.id),
+            ArchiveReadSessionLocal if include_archived else ReadSessionLocal,
+        )
+
+    def load(db: Session):
+        reminders = paginate(
+            filtered(db),
+            Reminder.reminder_time,
+            Reminder.id,
+            datetime.fromisoformat,
+            response,
+            limit,
+            cursor,
+        )
+        return REMINDER_VIEW.serialize(db, reminders)
+
+    return list_response(await db.run_sync(load), response)
+
+
+@router.post("/batch")
+async def batch_reminders(batch: ReminderBatch, db: AsyncSession = Depends(get_async_db)):
+    """Create, update and delete many reminders in one transaction.
+
+    Referenced tasks, meetings and participants are validated with one query
+    each and rows are written with executemany. New and rescheduled
+    reminders are handed to the scheduler after the commit.
+    """
+    return await db.run_sync(apply_reminder_batch, batch)
+
+
+def apply_reminder_batch(db: Session, batch: ReminderBatch) -> dict:
+    check_batch_size(batch.create, batch.update, batch.delete)
+    results = BatchResults()
+    edits = batch.create + batch.update
+
+    requested = collect_ids(edits, "participant_ids")
+    participant_ids = {
+        participant_id
+        for (participant_id,) in db.query(Participant.id).filter(Participant.id.in_(requested))
+    } if requested else set()
+    requested = {item.task_id for item in edits if item.task_id}
+    task_ids = {
+        task_id for (task_id,) in db.query(Task.id).filter(Task.id.in_(requested))
+    } if requested else set()
+    requested = {item.meeting_id for item in edits if item.meeting_id}
+    meeting_ids = {
+        meeting_id for (meeting_id,) in db.query(Meeting.id).filter(Meeting.id.in_(requested))
+    } if requested else set()
+    requested = {item.id for item in batch.update} | set(batch.delete)
+    existing_ids = {
+        reminder_id for (reminder_id,) in db.query(Reminder.id).filter(Reminder.id.in_(requested))
+    } if requested else set()
+
+    def invalid_item(item) -> Optional[str]:
+        error = item_error(item, Reminder, ("participant_ids",))
+        if error:
+            return error
+        if item.task_id and item.meeting_id:
+            return "Only one of task_id or meeting_id can be provided."
+        if item.task_id and item.task_id not in task_ids:
+            return "Task not found"
+        if item.meeting_id and item.meeting_id not in meeting_ids:
+            return "Meeting not found"
+        if set(item.participant_ids or []) - participant_ids:
+            return "One or more participants not found"
+        return None
+
+    # Rows written with Core bypass the ORM flush hook, so stamp them here
+    version = next_version(db)
+
+    # Creates
+    creates = []
+    for index, item in enumerate(batch.create):
+        if not item.task_id and not item.meeting_id:
+            error = "Either task_id or meeting_id must be provided."
+        else:
+            error = invalid_item(item)
+        if error:
+            results.error("create", index, error)
+        else:
+            creates.append((index, item))
+    created_ids = bulk_insert(
+        db,
+        Reminder,
+        [item.model_dump(exclude={"participant_ids"}) for _, item in creates],
+        version,
+    )
+    participant_links = []
+    scheduled = []
+    for (index, item), reminder_id in zip(creates, created_ids):
+        participant_links += [
+            {"reminder_id": reminder_id, "participant_id": pid}
+            for pid in item.participant_ids or []
+        ]
+        scheduled.append((reminder_id, item.reminder_time))
+        results.ok("create", index, reminder_id)
+    replace_links(db, reminder_participant, "reminder_id", [], participant_links)
+
+    # Updates
+    updates = []
+    participant_owners, participant_links = [], []
+    for index, item in enumerate(batch.update):
+        error = (
+            "Reminder not found" if item.id not in existing_ids else invalid_item(item)
+        )
+        if error:
+            results.error("update", index, error, item.id)
+            continue
+        values = item.model_dump(exclude_unset=True, exclude={"participant_ids"})
+        if item.task_id:
+            values["meeting_id"] = None
+        elif item.meeting_id:
+            values["task_id"] = None
+        else:
+            values.pop("task_id", None)
+            values.pop("meeting_id", None)
+        if item.reminder_time:
+            # A new time means the reminder is due again
+            values["dispatched_at"] = None
+            scheduled.append((item.id, item.reminder_time))
+        updates.append({**values, "version": version})
+        if item.participant_ids is not None:
+            participant_owners.append(item.id)
+            participant_links += [
+                {"reminder_id": item.id, "participant_id": pid} for pid in item.participant_ids
+            ]
+        results.ok("update", index, item.id)
+    bulk_update(db, Reminder, updates)
+    replace_links(db, reminder_participant, "reminder_id", participant_owners, participant_links)
+
+    # Deletes go through the ORM so association rows are cleared and tombstones written
+    deleted_ids = [reminder_id for reminder_id in batch.delete if reminder_id in existing_ids]
+    for index, reminder_id in enumerate(batch.delete):
+        if reminder_id in existing_ids:
+            results.ok("delete", index, reminder_id)
+        else:
+            results.error("delete", index, "Reminder not found", reminder_id)
+    deleted_version = None
+    if deleted_ids:
+        for reminder in db.query(Reminder).filter(Reminder.id.in_(deleted_ids)):
+            db.delete(reminder)
+        db.flush()
+        deleted_version = current_version(db)
+
+    db.commit()
+    for reminder_id, reminder_time in scheduled:
+        reminder_scheduler.schedule(reminder_id, reminder_time)
+
+    for reminder_id in created_ids:
+        publish_row_change("reminders", "created", reminder_id, version)
+    for item in updates:
+        publish_row_change("reminders", "updated", item["id"], version)
+    for reminder_id in deleted_ids:
+        publish_row_change("reminders", "deleted", reminder_id, deleted_version)
+
+    return results.as_response()
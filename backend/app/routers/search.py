@@ -0,0 +1,176 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, exists, func, literal_column, or_, select, text, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_list_db
+from app.models import Meeting, Reminder, Task, category_meeting, category_task
+from app.search import ROWID_STRIDE, SEARCH_KINDS, match_expression, search_index
+from datetime import date, datetime, time, timedelta
+from typing import List, Literal, Optional
+
+router = APIRouter()
+
+MAX_SEARCH_RESULTS = 100
+# Most matches ranked per query. bm25 is scored for every match before the
+# top results can be picked, which takes ~2 µs a row; a term found in most
+# of a few hundred thousand rows would cost close to a second. Beyond this
+# many matches, only the most recent ones (highest ids) are ranked.
+SEARCH_RANK_WINDOW = int(os.environ.get("SEARCH_RANK_WINDOW", "10000"))
+
+
+def _kind_condition(
+    kind: str,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    category_id: Optional[int],
+    include_archived: bool,
+):
+    """Restrict matches of one kind to items in the date range and category,
+    and to items still in the hot tables unless `include_archived`.
+
+    Each condition is a primary key lookup per match, so filtering adds
+    little on top of the full-text match itself. Kind and id are worked out
+    from the rowid, as reading the unindexed columns would load each
+    matching row's stored text.
+    """
+    item_id = search_index.c.rowid // ROWID_STRIDE
+    conditions = []
+    if kind == "meeting":
+        if date_from:
+            conditions.append(Meeting.date >= date_from)
+        if date_to:
+            conditions.append(Meeting.date <= date_to)
+        if category_id:
+            conditions.append(Meeting.id.in_(
+                select(category_meeting.c.meeting_id).where(category_meeting.c.category_id == category_id)
+            ))
+        model = Meeting
+    elif kind == "task":
+        if date_from:
+            conditions.append(Task.due_date >= date_from)
+        if date_to:
+            conditions.append(Task.due_date <= date_to)
+        if category_id:
+            conditions.append(Task.id.in_(
+                select(category_task.c.task_id).where(category_task.c.category_id == category_id)
+            ))
+        model = Task
+    else:
+        if date_from:
+            conditions.append(Reminder.reminder_time >= datetime.combine(date_from, time.min))
+        if date_to:
+            conditions.append(
+                Reminder.reminder_time < datetime.combine(date_to + timedelta(days=1), time.min)
+            )
+        if category_id:
+            # Reminders have no categories of their own; use their task's or meeting's
+            conditions.append(or_(
+                Reminder.task_id.in_(
+                    select(category_task.c.task_id).where(category_task.c.category_id == category_id)
+                ),
+                Reminder.meeting_id.in_(
+                    select(category_meeting.c.meeting_id).where(category_meeting.c.category_id == category_id)
+                ),
+            ))
+        model = Reminder
+
+    condition = search_index.c.rowid % ROWID_STRIDE == SEARCH_KINDS[kind]
+    # Archived rows keep their index entries; with include_archived the
+    # session's views make the model tables cover both databases
+    if conditions or not include_archived:
+        condition = and_(condition, exists().where(model.id == item_id, *conditions))
+    return condition
+
+
+async def _item_dates(db: AsyncSession, hits: list[dict]) -> dict:
+    ids = {kind: [hit["id"] for hit in hits if hit["type"] == kind] for kind in ("meeting", "task", "reminder")}
+    dates = {}
+    if ids["meeting"]:
+        rows = await db.execute(
+            select(Meeting.id, Meeting.date, Meeting.start_time).where(Meeting.id.in_(ids["meeting"]))
+        )
+        for item_id, day, start_time in rows:
+            dates[("meeting", item_id)] = f"{day}T{start_time}"
+    if ids["task"]:
+        rows = await db.execute(select(Task.id, Task.due_date).where(Task.id.in_(ids["task"])))
+        for item_id, due_date in rows:
+            dates[("task", item_id)] = str(due_date)
+    if ids["reminder"]:
+        rows = await db.execute(
+            select(Reminder.id, Reminder.reminder_time).where(Reminder.id.in_(ids["reminder"]))
+        )
+        for item_id, reminder_time in rows:
+            dates[("reminder", item_id)] = reminder_time.isoformat()
+    return dates
+
+
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=1),
+    types: Optional[List[Literal["meeting", "task", "reminder"]]] = Query(None),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    category_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    offset: int = Query(0, ge=0),
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_list_db),
+):
+    """Full-text search over meeting and task titles/descriptions and reminder messages.
+
+    Every word of `q` matches as a prefix ("budg mar" finds "Budget review
+    in March"). Results are ranked by bm25 with title matches weighted
+    above description matches; the snippet wraps matched terms in <mark>.
+    For very common terms only the newest SEARCH_RANK_WINDOW matches are
+    ranked. Archived items are only returned with include_archived=true.
+    """
+    expression = match_expression(q)
+    if expression is None:
+        raise HTTPException(status_code=400, detail="Query must contain at least one word")
+    if date_from and date_to and date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+
+    kinds = types or ["meeting", "task", "reminder"]
+    matches = text("search_index MATCH :expression").bindparams(expression=expression)
+    filters = or_(*(
+        _kind_condition(kind, date_from, date_to, category_id, include_archived) for kind in kinds
+    ))
+    if set(kinds) == set(SEARCH_KINDS) and not (date_from or date_to or category_id) and include_archived:
+        filters = true()
+
+    # Walking the matches in rowid order is cheap (no scoring), so find
+    # where the newest SEARCH_RANK_WINDOW of them start
+    cutoff = await db.scalar(
+        select(search_index.c.rowid)
+        .where(matches, filters)
+        .order_by(search_index.c.rowid.desc())
+        .offset(SEARCH_RANK_WINDOW)
+        .limit(1)
+    )
+    statement = (
+        select(
+            search_index.c.kind,
+            search_index.c.item_id,
+            search_index.c.title,
+            func.snippet(
+                literal_column("search_index"), -1, "<mark>", "</mark>", "…", 12
+            ).label("snippet"),
+            literal_column("rank"),
+        )
+        .where(matches, filters)
+        # rank is the bm25 configured on the table, which FTS5 can sort on directly
+        .order_by(literal_column("rank"))
+        .limit(limit)
+        .offset(offset)
+    )
+    if cutoff is not None:
+        statement = statement.where(search_index.c.rowid > cutoff)
+    hits = [
+        {"type": kind, "id": item_id, "title": title, "snippet": snippet, "score": -rank}
+        for kind, item_id, title, snippet, rank in await db.execute(statement)
+    ]
+
+    dates = await _item_dates(db, hits)
+    for hit in hits:
+        hit["date"] = dates.get((hit["type"], hit["id"]))
+    return {"results": hits}
@@ -2,7 +2,8 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from app.models import Participant
-from app.database import SessionLocal
+from app.database import get_db
+from app.response_cache import response_cache
 
 router = APIRouter()
 
@@ -12,14 +13,6 @@ class SignupRequest(BaseModel):
     email: str
     password: str
 
-# Dependency to get the database session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/")
 def signup(request: SignupRequest, db: Session = Depends(get_db)):
     # Check if the email is already registered
@@ -33,5 +26,6 @@ def signup(request: SignupRequest, db: Session = Depends(get_db)):
     db.add(new_participant)
     db.commit()
     db.refresh(new_participant)
+    response_cache.invalidate("participants")
 
     return {"message": "User signed up successfully", "user_id": new_participant.id}
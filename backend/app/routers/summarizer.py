@@ -1,4 +1,5 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 from app.email_summariser import summarize_and_update, load_file, text_to_documents
 from pydantic import BaseModel
@@ -18,6 +19,8 @@ async def summarize(
     file: Optional[UploadFile] = File(None),
     user_id: str = Form(...),
     user_instructions: str = Form(""),
+    # False forces a fresh summary for content that was summarised before
+    use_cache: bool = Form(True),
 ):
     if not text and not file:
         raise HTTPException(
@@ -30,11 +33,12 @@ async def summarize(
     elif file:
         if file.content_type != "application/pdf":
             raise HTTPException(status_code=400, detail="Only PDF files are supported.")
-        docs = load_file(await file.read())
+        # PDF parsing is CPU-bound; keep it off the event loop
+        docs = await run_in_threadpool(load_file, await file.read())
 
     # Generate summary
     try:
-        summary = summarize_and_update(user_id, docs, user_instructions)
+        summary = await summarize_and_update(user_id, docs, user_instructions, use_cache)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to generate summary: {str(e)}"
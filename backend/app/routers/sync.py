@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.database import get_read_db
+from app.models import (
+    Category,
+    Meeting,
+    Participant,
+    RecurrenceRule,
+    Reminder,
+    Task,
+    Tombstone,
+)
+from app.loading import MEETING_LIST, REMINDER_LIST, TASK_LIST
+from app.sync import SYNCED_ENTITIES, current_version
+
+router = APIRouter()
+
+
+def serialize_meeting(m: Meeting) -> dict:
+    return {
+        "id": m.id,
+        "title": m.title,
+        "description": m.description,
+        "date": str(m.date),
+        "start_time": str(m.start_time),
+        "end_time": str(m.end_time),
+        "color": m.color,
+        "participant_ids": [p.id for p in m.participants],
+        "category_ids": [c.id for c in m.categories],
+        "version": m.version,
+    }
+
+
+def serialize_task(t: Task) -> dict:
+    return {
+        "id": t.id,
+        "title": t.title,
+        "description": t.description,
+        "due_date": str(t.due_date),
+        "color": t.color,
+        "participant_ids": [p.id for p in t.participants],
+        "category_ids": [c.id for c in t.categories],
+        "version": t.version,
+    }
+
+
+def serialize_reminder(r: Reminder) -> dict:
+    return {
+        "id": r.id,
+        "message": r.message,
+        "reminder_time": str(r.reminder_time),
+        "task_id": r.task_id,
+        "meeting_id": r.meeting_id,
+        "participant_ids": [p.id for p in r.participants],
+        "version": r.version,
+    }
+
+
+def serialize_recurrence_rule(r: RecurrenceRule) -> dict:
+    return {
+        "id": r.id,
+        "meeting_id": r.meeting_id,
+        "frequency": r.frequency.value,
+        "interval": r.interval,
+        "end_date": str(r.end_date) if r.end_date else None,
+        "version": r.version,
+    }
+
+
+def serialize_category(c: Category) -> dict:
+    return {"id": c.id, "name": c.name, "version": c.version}
+
+
+def serialize_participant(p: Participant) -> dict:
+    return {"id": p.id, "name": p.name, "email": p.email, "version": p.version}
+
+
+SERIALIZERS = {
+    Meeting: (serialize_meeting, MEETING_LIST),
+    Task: (serialize_task, TASK_LIST),
+    Reminder: (serialize_reminder, REMINDER_LIST),
+    RecurrenceRule: (serialize_recurrence_rule, ()),
+    Category: (serialize_category, ()),
+    Participant: (serialize_participant, ()),
+}
+
+
+@router.get("/")
+def get_changes(since: int = Query(0, ge=0), db: Session = Depends(get_read_db)):
+    """Everything created, updated or deleted after the `since` cursor.
+
+    Pass the returned cursor as `since` on the next call. since=0 returns a
+    full snapshot.
+    """
+    # Read the cursor first; rows committed after this are picked up next time
+    cursor = current_version(db)
+
+    changes = {}
+    for model, (serialize, options) in SERIALIZERS.items():
+        rows = (
+            db.query(model)
+            .options(*options)
+            .filter(model.version > since, model.version <= cursor)
+            .order_by(model.version)
+            .all()
+        )
+        changes[SYNCED_ENTITIES[model][0]] = [serialize(row) for row in rows]
+
+    deleted = {name: [] for name, _ in SYNCED_ENTITIES.values()}
+    tombstones = (
+        db.query(Tombstone.entity, Tombstone.entity_id)
+        .filter(Tombstone.version > since, Tombstone.version <= cursor)
+        .order_by(Tombstone.version)
+        .all()
+    )
+    for entity, entity_id in tombstones:
+        deleted[entity].append(entity_id)
+
+    return {"cursor": cursor, "changes": changes, "deleted": deleted}
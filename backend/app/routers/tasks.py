@@ -1,11 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.models import Task, Participant, Category
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.database import (
+    ArchiveReadSessionLocal,
+    ReadSessionLocal,
+    get_async_db,
+    get_async_list_db,
+)
+from app.models import Task, Participant, Category, category_task, task_participant
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import date
-from app.routers.notifications import notify_task
+from app.routers.notifications import notify_task, task_assignment_email
+from app.mail_queue import enqueue_emails, mail_workers
+from app.sync import current_version, next_version
+from app.batch import (
+    BatchResults,
+    bulk_insert,
+    bulk_update,
+    check_batch_size,
+    collect_ids,
+    item_error,
+    replace_links,
+)
+from app.pagination import paginate, MAX_PAGE_SIZE
+from app.loading import TASK_VIEW
+from app.projections import list_response, ndjson_response, wants_ndjson
+from app.events import publish_change, publish_row_change
 
 router = APIRouter()
 
@@ -20,6 +42,22 @@ class TaskCreate(BaseModel):
     category_ids: Optional[List[int]] = None
 
 
+class TaskUpdate(BaseModel):
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    due_date: Optional[date] = None
+    color: Optional[str] = None
+    participant_ids: Optional[List[int]] = None
+    category_ids: Optional[List[int]] = None
+
+
+class TaskBatch(BaseModel):
+    create: List[TaskCreate] = []
+    update: List[TaskUpdate] = []
+    delete: List[int] = []
+
+
 class ParticipantResponse(BaseModel):
     id: int
     name: str
@@ -50,24 +88,15 @@ class TaskResponse(BaseModel):
         orm_mode = True
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=TaskResponse)
-def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(task_data: TaskCreate, db: AsyncSession = Depends(get_async_db)):
     participants = []
     if task_data.participant_ids:
         participants = (
-            db.query(Participant)
-            .filter(Participant.id.in_(task_data.participant_ids))
-            .all()
-        )
+            await db.scalars(
+                select(Participant).where(Participant.id.in_(task_data.participant_ids))
+            )
+        ).all()
         if len(participants) != len(task_data.participant_ids):
             raise HTTPException(
                 status_code=404, detail="One or more participants not found"
@@ -76,8 +105,8 @@ def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
     categories = []
     if task_data.category_ids:
         categories = (
-            db.query(Category).filter(Category.id.in_(task_data.category_ids)).all()
-        )
+            await db.scalars(select(Category).where(Category.id.in_(task_data.category_ids)))
+        ).all()
         if len(categories) != len(task_data.category_ids):
             raise HTTPException(
                 status_code=404, detail="One or more categories not found"
@@ -93,19 +122,199 @@ def create_task(task_data: TaskCreate, db: Session = Depends(get_db)):
     )
 
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    publish_change("tasks", "created", task)
 
-    # Directly call the notify_task function
+    # Queue email notification (sent in the background)
     try:
-        notify_task(task_id=task.id, db=db)
+        await db.run_sync(lambda session: notify_task(task_id=task.id, db=session))
     except Exception as e:
-        print(f"[WARNING] Failed to send task notification: {e}")
+        print(f"[WARNING] Failed to queue task notification: {e}")
 
     return task
 
 
 @router.get("/", response_model=List[TaskResponse])
-def get_tasks(db: Session = Depends(get_db)):
-    tasks = db.query(Task).all()
-    return tasks
+async def get_tasks(
+    request: Request,
+    response: Response,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    participant_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_archived: bool = False,
+    db: AsyncSession = Depends(get_async_list_db),
+):
+    """List tasks; "Accept: application/x-ndjson" streams them like GET /meetings/."""
+    def filtered(db: Session):
+        query = TASK_VIEW.query(db)
+        if start:
+            query = query.filter(Task.due_date >= start)
+        if end:
+            query = query.filter(Task.due_date < end)
+        if participant_id:
+            query = query.filter(Task.participants.any(Participant.id == participant_id))
+        if category_id:
+            query = query.filter(Task.categories.any(Category.id == category_id))
+        return query
+
+    if wants_ndjson(request):
+        return ndjson_response(
+            TASK_VIEW,
+            lambda db: filtered(db).order_by(Task.due_date, Task.id),
+            ArchiveReadSessionLocal if include_archived else ReadSessionLocal,
+        )
+
+    def load(db: Session):
+        rows = paginate(
+            filtered(db), Task.due_date, Task.id, date.fromisoformat, response, limit, cursor
+        )
+        return TASK_VIEW.serialize(db, rows)
+
+    return list_response(await db.run_sync(load), response)
+
+
+@router.post("/batch")
+async def batch_tasks(batch: TaskBatch, db: AsyncSession = Depends(get_async_db)):
+    """Create, update and delete many tasks in one transaction.
+
+    Works like POST /meetings/batch: one validation query per referenced
+    table, executemany writes, and assignment emails queued in the same
+    commit. Invalid items are reported per item.
+    """
+    return await db.run_sync(apply_task_batch, batch)
+
+
+def apply_task_batch(db: Session, batch: TaskBatch) -> dict:
+    check_batch_size(batch.create, batch.update, batch.delete)
+    results = BatchResults()
+    edits = batch.create + batch.update
+
+    requested = collect_ids(edits, "participant_ids")
+    participant_emails = dict(
+        db.query(Participant.id, Participant.email)
+        .filter(Participant.id.in_(requested))
+        .all()
+    ) if requested else {}
+    requested = collect_ids(edits, "category_ids")
+    category_ids = {
+        category_id
+        for (category_id,) in db.query(Category.id).filter(Category.id.in_(requested))
+    } if requested else set()
+    requested = {item.id for item in batch.update} | set(batch.delete)
+    existing_ids = {
+        task_id for (task_id,) in db.query(Task.id).filter(Task.id.in_(requested))
+    } if requested else set()
+
+    def invalid_item(item) -> Optional[str]:
+        error = item_error(item, Task, ("participant_ids", "category_ids"))
+        if error:
+            return error
+        if set(item.participant_ids or []) - participant_emails.keys():
+            return "One or more participants not found"
+        if set(item.category_ids or []) - category_ids:
+            return "One or more categories not found"
+        return None
+
+    # Rows written with Core bypass the ORM flush hook, so stamp them here
+    version = next_version(db)
+
+    # Creates
+    creates = []
+    for index, item in enumerate(batch.create):
+        error = invalid_item(item)
+        if error:
+            results.error("create", index, error)
+        else:
+            creates.append((index, item))
+    created_ids = bulk_insert(
+        db,
+        Task,
+        [item.model_dump(exclude={"participant_ids", "category_ids"}) for _, item in creates],
+        version,
+    )
+    participant_links = []
+    category_links = []
+    emails = []
+    for (index, item), task_id in zip(creates, created_ids):
+        participant_links += [
+            {"task_id": task_id, "participant_id": pid}
+            for pid in item.participant_ids or []
+        ]
+        category_links += [
+            {"task_id": task_id, "category_id": cid} for cid in item.category_ids or []
+        ]
+        if item.participant_ids:
+            subject, body = task_assignment_email(item)
+            emails.append(
+                (subject, body, [participant_emails[pid] for pid in item.participant_ids])
+            )
+        results.ok("create", index, task_id)
+    replace_links(db, task_participant, "task_id", [], participant_links)
+    replace_links(db, category_task, "task_id", [], category_links)
+    enqueue_emails(db, emails)
+
+    # Updates
+    updates = []
+    participant_owners, participant_links = [], []
+    category_owners, category_links = [], []
+    for index, item in enumerate(batch.update):
+        error = "Task not found" if item.id not in existing_ids else invalid_item(item)
+        if error:
+            results.error("update", index, error, item.id)
+            continue
+        values = item.model_dump(
+            exclude_unset=True, exclude={"participant_ids", "category_ids"}
+        )
+        updates.append({**values, "version": version})
+        if item.participant_ids is not None:
+            participant_owners.append(item.id)
+            participant_links += [
+                {"task_id": item.id, "participant_id": pid} for pid in item.participant_ids
+            ]
+        if item.category_ids is not None:
+            category_owners.append(item.id)
+            category_links += [
+                {"task_id": item.id, "category_id": cid} for cid in item.category_ids
+            ]
+        results.ok("update", index, item.id)
+    bulk_update(db, Task, updates)
+    replace_links(db, task_participant, "task_id", participant_owners, participant_links)
+    replace_links(db, category_task, "task_id", category_owners, category_links)
+
+    # Deletes go through the ORM so association rows are cleared and tombstones written
+    deleted_ids = [task_id for task_id in batch.delete if task_id in existing_ids]
+    for index, task_id in enumerate(batch.delete):
+        if task_id in existing_ids:
+            results.ok("delete", index, task_id)
+        else:
+            results.error("delete", index, "Task not found", task_id)
+    deleted_version = None
+    if deleted_ids:
+        tasks = (
+            db.query(Task)
+            .options(selectinload(Task.reminders))
+            .filter(Task.id.in_(deleted_ids))
+            .all()
+        )
+        for task in tasks:
+            for reminder in task.reminders:
+                db.delete(reminder)
+            db.delete(task)
+        db.flush()
+        deleted_version = current_version(db)
+
+    db.commit()
+    if emails:
+        mail_workers.wake()
+
+    for task_id in created_ids:
+        publish_row_change("tasks", "created", task_id, version)
+    for item in updates:
+        publish_row_change("tasks", "updated", item["id"], version)
+    for task_id in deleted_ids:
+        publish_row_change("tasks", "deleted", task_id, deleted_version)
+
+    return results.as_response()
@@ -0,0 +1,144 @@
+import re
+from contextlib import contextmanager
+from typing import Optional
+from sqlalchemy import Column, Integer, MetaData, String, Table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# Kind of row indexed, and the code folded into the index rowid
+# (rowid = item id * ROWID_STRIDE + code) so that the triggers can find an
+# item's entry by rowid instead of scanning the unindexed columns
+SEARCH_KINDS = {"meeting": 1, "task": 2, "reminder": 3}
+ROWID_STRIDE = 4
+
+# Title matches outrank description matches
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+# Query-side mapping of the FTS5 table; kept out of Base.metadata so that
+# create_all doesn't try to create it as a plain table
+search_index = Table(
+    "search_index",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("kind", String),
+    Column("item_id", Integer),
+    Column("title", String),
+    Column("body", String),
+)
+
+# (table, kind, title expression, body expression)
+_SOURCES = [
+    ("meetings", "meeting", "title", "coalesce({row}.description, '')"),
+    ("tasks", "task", "title", "coalesce({row}.description, '')"),
+    ("reminders", "reminder", "message", "''"),
+]
+
+
+def _entry_values(kind: str, title: str, body: str, row: str) -> str:
+    return (
+        f"{row}.id * {ROWID_STRIDE} + {SEARCH_KINDS[kind]}, '{kind}', {row}.id, "
+        f"{row}.{title}, {body.format(row=row)}"
+    )
+
+
+def _trigger_ddl(table: str, kind: str, title: str, body: str) -> list[str]:
+    rowid = f"old.id * {ROWID_STRIDE} + {SEARCH_KINDS[kind]}"
+    columns = f"{title}, description" if kind != "reminder" else title
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO search_index(rowid, kind, item_id, title, body)
+            VALUES ({_entry_values(kind, title, body, "new")});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {columns} ON {table} BEGIN
+            DELETE FROM search_index WHERE rowid = {rowid};
+            INSERT INTO search_index(rowid, kind, item_id, title, body)
+            VALUES ({_entry_values(kind, title, body, "new")});
+        END""",
+        # Rows moved to the archive keep their entries (see retain_search_entries)
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table}
+        WHEN NOT EXISTS (SELECT 1 FROM search_index_retain) BEGIN
+            DELETE FROM search_index WHERE rowid = {rowid};
+        END""",
+    ]
+
+
+def create_search_index(connection: Connection):
+    """Create the FTS5 index and its triggers, filling it from existing rows.
+
+    The triggers keep the index in step with every write path (ORM, Core
+    batches, imports), so nothing else has to remember to update it.
+    """
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'")
+    ).first()
+    if not exists:
+        # Prefix indexes make "budg*" style queries as cheap as whole terms
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "kind UNINDEXED, item_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+        ))
+        # Make ORDER BY rank use the weighted bm25
+        connection.execute(text(
+            "INSERT INTO search_index(search_index, rank) "
+            f"VALUES ('rank', 'bm25(0, 0, {TITLE_WEIGHT}, {BODY_WEIGHT})')"
+        ))
+        for table, kind, title, body in _SOURCES:
+            connection.execute(text(
+                "INSERT INTO search_index(rowid, kind, item_id, title, body) "
+                f"SELECT {_entry_values(kind, title, body, table)} FROM {table}"
+            ))
+        print("[INFO] Built full-text search index")
+
+    # Holds a row while deletes shouldn't touch the index
+    connection.execute(text("CREATE TABLE IF NOT EXISTS search_index_retain (active INTEGER)"))
+    for table, _, _, _ in _SOURCES:
+        # Recreated so that databases with older trigger definitions get the current ones
+        for trigger in ("insert", "update", "delete"):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {table}_search_{trigger}"))
+    for source in _SOURCES:
+        for ddl in _trigger_ddl(*source):
+            connection.execute(text(ddl))
+
+
+def index_archived_rows(connection: Connection):
+    """Add entries for archived rows missing from the index.
+
+    Archiving used to delete index entries along with the hot rows; this
+    restores them for databases archived before that changed.
+    """
+    for table, kind, title, body in _SOURCES:
+        row = f"archive.{table}"
+        connection.execute(text(
+            "INSERT INTO search_index(rowid, kind, item_id, title, body) "
+            f"SELECT {_entry_values(kind, title, body, row)} FROM {row} "
+            f"WHERE NOT EXISTS (SELECT 1 FROM search_index WHERE rowid = {row}.id * {ROWID_STRIDE} + {SEARCH_KINDS[kind]})"
+        ))
+
+
+@contextmanager
+def retain_search_entries(db: Session):
+    """Delete rows inside the block without removing their index entries.
+
+    Used when moving rows to the archive, so that they stay searchable with
+    include_archived. The flag row lives in the caller's transaction, so
+    other connections never see it.
+    """
+    db.execute(text("INSERT INTO search_index_retain (active) VALUES (1)"))
+    try:
+        yield
+    finally:
+        db.execute(text("DELETE FROM search_index_retain"))
+
+
+def match_expression(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in the input are
+    treated as text rather than query syntax.
+    """
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
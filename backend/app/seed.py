@@ -1,6 +1,7 @@
 from app.database import SessionLocal
 from app.models import Base, Task, Meeting, Participant, Category, RecurrenceRule, RecurrenceFrequency, Reminder
 from app.database import engine
+from app import sync  # noqa: F401 - stamps change versions on seeded rows
 from datetime import datetime, date, time
 from passlib.context import CryptContext
 
@@ -1,32 +1,191 @@
 import os
 import smtplib
 import ssl
+import threading
+import time
+from contextlib import contextmanager
 from email.message import EmailMessage
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Mail server settings. Point these at a local stand-in (e.g. aiosmtpd on
+# localhost:8025 with SMTP_USE_SSL=false) to benchmark without hitting Gmail.
+SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.environ.get("SMTP_USE_SSL", "true").lower() in ("1", "true", "yes")
+SMTP_TIMEOUT = float(os.environ.get("SMTP_TIMEOUT", "30"))
+SMTP_POOL_SIZE = int(os.environ.get("SMTP_POOL_SIZE", "4"))
+# Servers usually drop sessions that sit idle for a while; don't bother
+# reusing one that has been parked longer than this (seconds).
+SMTP_IDLE_TIMEOUT = float(os.environ.get("SMTP_IDLE_TIMEOUT", "60"))
+
+
+class SMTPSession:
+    """An authenticated SMTP connection checked out of the pool.
+
+    Reconnects once, transparently, if the server has dropped the session.
+    """
+
+    def __init__(self, pool: "SMTPConnectionPool"):
+        self.pool = pool
+        self.smtp = None
+        self.last_used = 0.0
+
+    def connect(self):
+        self.close()
+        self.smtp = self.pool.open_connection()
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self.smtp is None:
+            return
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self.smtp = None
+
+    def sendmail(self, sender: str, receiver: str, message: str):
+        if self.smtp is None:
+            self.connect()
+        try:
+            self.smtp.sendmail(sender, receiver, message)
+        except smtplib.SMTPServerDisconnected:
+            print("[INFO] SMTP session was dropped, reconnecting...")
+            self.connect()
+            self.smtp.sendmail(sender, receiver, message)
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """Keeps up to `max_size` logged-in SMTP sessions alive between sends."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        password: str = None,
+        use_ssl: bool = True,
+        max_size: int = 4,
+        idle_timeout: float = 60,
+        timeout: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.password = password
+        self.use_ssl = use_ssl
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        # The SSL context is expensive to build, so build it once per pool
+        self.ssl_context = ssl.create_default_context() if use_ssl else None
+
+        self._idle: list[SMTPSession] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def open_connection(self):
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(
+                self.host, self.port, context=self.ssl_context, timeout=self.timeout
+            )
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.password:
+            smtp.login(self.sender, self.password)
+        return smtp
+
+    def _checkout(self) -> SMTPSession:
+        with self._lock:
+            while self._idle:
+                session = self._idle.pop()
+                if time.monotonic() - session.last_used < self.idle_timeout:
+                    return session
+                session.close()
+        return SMTPSession(self)
+
+    def _checkin(self, session: SMTPSession):
+        if session.smtp is None:
+            return
+        with self._lock:
+            self._idle.append(session)
+
+    @contextmanager
+    def session(self):
+        self._slots.acquire()
+        session = self._checkout()
+        try:
+            yield session
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # Don't hand a broken connection to the next caller
+            session.close()
+            raise
+        finally:
+            self._checkin(session)
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            session.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            email_sender = os.environ.get("EMAIL_SENDER")
+            app_password = os.environ.get("APP_PASSWORD")
+
+            if not email_sender or (SMTP_USE_SSL and not app_password):
+                raise ValueError(
+                    "Email sender or app password is not configured properly."
+                )
+
+            _pool = SMTPConnectionPool(
+                SMTP_HOST,
+                SMTP_PORT,
+                sender=email_sender,
+                password=app_password,
+                use_ssl=SMTP_USE_SSL,
+                max_size=SMTP_POOL_SIZE,
+                idle_timeout=SMTP_IDLE_TIMEOUT,
+                timeout=SMTP_TIMEOUT,
+            )
+        return _pool
+
+
+def close_smtp_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
 
 # Define reusable email-sending function
-def send_email(subject: str, body: str, recipients: list):
-    email_sender = os.environ.get("EMAIL_SENDER")
-    app_password = os.environ.get("APP_PASSWORD")
-
-    if not email_sender or not app_password:
-        raise ValueError("Email sender or app password is not configured properly.")
-
-    for email_receiver in recipients:
-        em = EmailMessage()
-        em["From"] = email_sender
-        em["To"] = email_receiver
-        em["Subject"] = subject
-        em.set_content(body)
-
-        # Add SSL (layer of security)
-        context = ssl.create_default_context()
-
-        # Log in and send the email
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as smtp:
-            smtp.login(email_sender, app_password)
-            smtp.sendmail(email_sender, email_receiver, em.as_string())
+def send_email(subject: str, body: str, recipients: list, sent: list = None):
+    """Send one message per recipient. Each delivered address is appended to
+    `sent` as it goes, so a caller retrying after a failure can skip them."""
+    pool = get_smtp_pool()
+
+    # One session for the whole recipient batch
+    with pool.session() as session:
+        for email_receiver in recipients:
+            em = EmailMessage()
+            em["From"] = pool.sender
+            em["To"] = email_receiver
+            em["Subject"] = subject
+            em.set_content(body)
+
+            session.sendmail(pool.sender, email_receiver, em.as_string())
             print(f"Email sent to {email_receiver}")
+            if sent is not None:
+                sent.append(email_receiver)
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional
+
+# Summaries kept, and for how long (seconds)
+SUMMARY_CACHE_SIZE = int(os.environ.get("SUMMARY_CACHE_SIZE", "256"))
+SUMMARY_CACHE_TTL = float(os.environ.get("SUMMARY_CACHE_TTL", "3600"))
+
+
+def summary_key(
+    store: str, contents: list[str], user_instructions: str, model: str, context_ids: list[str]
+) -> str:
+    """Everything the summary depends on: the (normalised) input, the
+    instructions, the model and which stored chunks were given as context.
+
+    `store` is the user's vector store, which a cache hit skips writing to,
+    so users never share entries.
+    """
+    payload = json.dumps([store, contents, user_instructions, model, context_ids])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryAbandoned(RuntimeError):
+    """The request computing a summary went away before it had a result."""
+
+
+class SummaryCache:
+    """In-process LRU/TTL cache of generated summaries.
+
+    A request that finds its key being computed by another request (a
+    double-click, a client retry) waits for that result instead of making a
+    second LLM call.
+    """
+
+    def __init__(self, max_entries: int = SUMMARY_CACHE_SIZE, ttl: float = SUMMARY_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def claim(self, key: str) -> Optional[Future]:
+        """The cached or in-flight result for `key`, or None.
+
+        None means the caller now owns the key and must call resolve(),
+        fail() or release() once it is done. Waiters on a released key get
+        SummaryAbandoned and should claim it again.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                future = Future()
+                future.set_result(entry[1])
+                return future
+            self._entries.pop(key, None)
+            if key in self._pending:
+                self.hits += 1
+                return self._pending[key]
+            self.misses += 1
+            self._pending[key] = Future()
+            return None
+
+    def resolve(self, key: str, value):
+        """Store `value` (also used to refresh an entry when bypassing the cache)."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            future = self._pending.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(value)
+
+    def fail(self, key: str, error: Exception):
+        with self._lock:
+            future = self._pending.pop(key, None)
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+    def release(self, key: str):
+        """Give up `key` without a result, e.g. because the request was cancelled."""
+        self.fail(key, SummaryAbandoned("summary was cancelled"))
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else None,
+            }
+
+
+summary_cache = SummaryCache()
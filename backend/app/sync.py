@@ -0,0 +1,92 @@
+from sqlalchemy import event, inspect, insert, select, update
+from sqlalchemy.orm import Session
+from app.models import (
+    Category,
+    Meeting,
+    Participant,
+    RecurrenceRule,
+    Reminder,
+    Task,
+    Tombstone,
+    sync_state,
+)
+
+# Synced models: entity name used in /sync payloads, and the attributes whose
+# changes clients care about. Back-references (e.g. Participant.meetings) and
+# bookkeeping columns (RecurrenceRule.materialized_until) are left out so that
+# touching them doesn't make unrelated rows look changed.
+SYNCED_ENTITIES = {
+    Meeting: (
+        "meetings",
+        ("title", "description", "date", "start_time", "end_time", "color",
+         "categories", "participants"),
+    ),
+    Task: (
+        "tasks",
+        ("title", "description", "due_date", "color", "categories", "participants"),
+    ),
+    Reminder: (
+        "reminders",
+        ("message", "reminder_time", "task_id", "meeting_id", "participants"),
+    ),
+    RecurrenceRule: (
+        "recurrence_rules",
+        ("meeting_id", "frequency", "interval", "end_date"),
+    ),
+    Category: ("categories", ("name",)),
+    Participant: ("participants", ("name", "email")),
+}
+
+
+def next_version(session: Session) -> int:
+    """Reserve the next change version.
+
+    Runs inside the caller's transaction, so SQLite's single writer lock
+    makes versions commit in increasing order.
+    """
+    connection = session.connection()
+    bumped = connection.execute(
+        update(sync_state)
+        .where(sync_state.c.id == 1)
+        .values(version=sync_state.c.version + 1)
+    )
+    if bumped.rowcount == 0:
+        connection.execute(insert(sync_state).values(id=1, version=1))
+    return connection.execute(
+        select(sync_state.c.version).where(sync_state.c.id == 1)
+    ).scalar_one()
+
+
+def current_version(session: Session) -> int:
+    version = session.execute(
+        select(sync_state.c.version).where(sync_state.c.id == 1)
+    ).scalar()
+    return version or 0
+
+
+def _has_tracked_changes(obj, tracked: tuple) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[key].history.has_changes() for key in tracked)
+
+
+@event.listens_for(Session, "before_flush")
+def stamp_versions(session: Session, flush_context, instances):
+    changed = []
+    for obj in session.new | session.dirty:
+        entity = SYNCED_ENTITIES.get(type(obj))
+        if entity and (obj in session.new or _has_tracked_changes(obj, entity[1])):
+            changed.append(obj)
+    deleted = [obj for obj in session.deleted if type(obj) in SYNCED_ENTITIES]
+    if not changed and not deleted:
+        return
+
+    # Everything in one flush shares a version
+    version = next_version(session)
+    for obj in changed:
+        obj.version = version
+    for obj in deleted:
+        session.add(
+            Tombstone(
+                entity=SYNCED_ENTITIES[type(obj)][0], entity_id=obj.id, version=version
+            )
+        )
@@ -0,0 +1,167 @@
+import hashlib
+import os
+import tempfile
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+# Point the app at throwaway databases before anything imports app.database
+_data_dir = tempfile.mkdtemp(prefix="booksmart-tests-")
+os.environ["DATABASE_PATH"] = os.path.join(_data_dir, "app.db")
+os.environ["ARCHIVE_DATABASE_PATH"] = os.path.join(_data_dir, "archive.db")
+# The summariser builds its OpenAI clients and embedding cache on import;
+# tests replace the clients, so no key or network is needed
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(_data_dir, "embedding_cache.db")
+os.environ["ANONYMIZED_TELEMETRY"] = "False"
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from app import sync  # noqa: E402,F401 - stamps change versions on seeded rows
+from app.database import SessionLocal  # noqa: E402
+from app.models import (  # noqa: E402
+    Category,
+    Meeting,
+    Participant,
+    RecurrenceFrequency,
+    RecurrenceRule,
+    Reminder,
+    Task,
+)
+from app.routers import ical, meetings, recurrences, reminders, tasks  # noqa: E402
+
+SEEDED_ROWS = 20
+
+
+def seed(rows: int = SEEDED_ROWS):
+    """Meetings, tasks and reminders that each have several participants and
+    categories, so that lazy loading would show up as extra queries per row."""
+    db = SessionLocal()
+    try:
+        participants = [
+            Participant(name=f"Participant {i}", email=f"p{i}@example.com", hashed_password="x")
+            for i in range(4)
+        ]
+        categories = [Category(name=f"Category {i}") for i in range(3)]
+        db.add_all(participants + categories)
+        start = date(2025, 1, 6)
+        for i in range(rows):
+            day = start + timedelta(days=i)
+            meeting = Meeting(
+                title=f"Meeting {i}",
+                description="Weekly sync",
+                date=day,
+                start_time=time(10),
+                end_time=time(11),
+                color="#FF5733",
+                participants=participants[: 2 + i % 3],
+                categories=categories[: 1 + i % 3],
+            )
+            task = Task(
+                title=f"Task {i}",
+                description="Follow up",
+                due_date=day,
+                color="#33FF57",
+                participants=participants[: 1 + i % 4],
+                categories=categories[: 1 + i % 2],
+            )
+            db.add_all([meeting, task])
+            db.add(
+                Reminder(
+                    message=f"Reminder {i}",
+                    reminder_time=datetime.combine(day, time(9)),
+                    meeting=meeting if i % 2 else None,
+                    task=None if i % 2 else task,
+                    participants=participants[: 1 + i % 3],
+                )
+            )
+            if i % 4 == 0:
+                db.add(
+                    RecurrenceRule(
+                        meeting=meeting, frequency=RecurrenceFrequency.WEEKLY, interval=1
+                    )
+                )
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    seed()
+    # Only the routers under test; app.main also starts the background
+    # workers and imports the summariser's optional dependencies
+    app = FastAPI()
+    app.include_router(meetings.router, prefix="/meetings")
+    app.include_router(tasks.router, prefix="/tasks")
+    app.include_router(reminders.router, prefix="/reminders")
+    app.include_router(recurrences.router, prefix="/recurrences")
+    app.include_router(ical.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+class FakeEmbeddings:
+    """Deterministic stand-in for OpenAIEmbeddings that records every text it embeds."""
+
+    def __init__(self):
+        self.embedded: list[str] = []
+
+    def _vector(self, text: str) -> list[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        # Exact in float32, the precision the embedding cache stores
+        return [byte / 256 for byte in digest[:8]]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self.embed_query(text)
+
+
+class FakeChat:
+    """Stand-in for ChatOpenAI; `prompts` collects every prompt sent."""
+
+    prompts: list[str] = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def ainvoke(self, prompt: str) -> str:
+        FakeChat.prompts.append(prompt)
+        return f"Summary {len(FakeChat.prompts)}"
+
+
+@pytest.fixture
+def summariser(tmp_path, monkeypatch):
+    """app.email_summariser with fake OpenAI clients and fresh caches, and
+    each user's Chroma store under `tmp_path`."""
+    email_summariser = pytest.importorskip("app.email_summariser")
+    from app.embedding_cache import CachedEmbeddings, EmbeddingCache
+    from app.summary_cache import SummaryCache
+
+    embeddings = FakeEmbeddings()
+    stores = email_summariser.VectorStoreCache()
+    monkeypatch.setattr(FakeChat, "prompts", [])
+    monkeypatch.setattr(email_summariser, "ChatOpenAI", FakeChat)
+    monkeypatch.setattr(
+        email_summariser,
+        "EMBEDDINGS",
+        CachedEmbeddings(embeddings, EmbeddingCache(str(tmp_path / "embeddings.db")), "fake"),
+    )
+    monkeypatch.setattr(email_summariser, "summary_cache", SummaryCache())
+    monkeypatch.setattr(email_summariser, "vector_stores", stores)
+    monkeypatch.setattr(
+        email_summariser, "get_persist_directory", lambda user_id: str(tmp_path / user_id)
+    )
+    try:
+        yield email_summariser
+    finally:
+        stores.close_all()
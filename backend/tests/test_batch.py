@@ -0,0 +1,75 @@
+import pytest
+
+
+def test_batch_update_reschedules_meeting(client):
+    original = next(m for m in client.get("/meetings/").json() if m["id"] == 1)
+    response = client.post(
+        "/meetings/batch",
+        json={"update": [{"id": 1, "date": "2025-03-05", "start_time": "14:00:00", "end_time": "15:00:00"}]},
+    )
+    assert response.status_code == 200
+    assert response.json()["summary"] == {"ok": 1, "error": 0}
+    moved = next(m for m in client.get("/meetings/").json() if m["id"] == 1)
+    assert (moved["date"], moved["start_time"], moved["end_time"]) == ("2025-03-05", "14:00:00", "15:00:00")
+    assert moved["title"] == original["title"]
+
+    # Put it back for the other tests
+    client.post(
+        "/meetings/batch",
+        json={"update": [{key: original[key] for key in ("id", "date", "start_time", "end_time")}]},
+    )
+
+
+NEW_MEETING = {
+    "title": "Planning",
+    "date": "2025-03-05",
+    "start_time": "10:00:00",
+    "end_time": "11:00:00",
+    "participant_ids": [1],
+}
+
+
+@pytest.mark.parametrize(
+    "path,batch,detail",
+    [
+        ("/meetings/batch", {"update": [{"id": 1, "title": None}]}, "title cannot be null"),
+        ("/meetings/batch", {"update": [{"id": 1, "date": None}]}, "date cannot be null"),
+        (
+            "/meetings/batch",
+            {"create": [{**NEW_MEETING, "participant_ids": [1, 1]}]},
+            "participant_ids contains repeated ids",
+        ),
+        (
+            "/meetings/batch",
+            {"update": [{"id": 1, "category_ids": [2, 2]}]},
+            "category_ids contains repeated ids",
+        ),
+        (
+            "/meetings/batch",
+            {"create": [{**NEW_MEETING, "end_time": "09:00:00"}]},
+            "end_time must be after start_time",
+        ),
+        # Checked against the meeting's stored start_time (10:00)
+        ("/meetings/batch", {"update": [{"id": 1, "end_time": "10:00:00"}]}, "end_time must be after start_time"),
+        ("/tasks/batch", {"update": [{"id": 1, "due_date": None}]}, "due_date cannot be null"),
+        (
+            "/tasks/batch",
+            {"update": [{"id": 1, "participant_ids": [1, 2, 1]}]},
+            "participant_ids contains repeated ids",
+        ),
+        ("/reminders/batch", {"update": [{"id": 1, "message": None}]}, "message cannot be null"),
+        (
+            "/reminders/batch",
+            {"create": [{"message": "Soon", "reminder_time": "2025-03-05T09:00:00", "task_id": 1, "participant_ids": [3, 3]}]},
+            "participant_ids contains repeated ids",
+        ),
+    ],
+)
+def test_batch_reports_invalid_items_per_item(client, path, batch, detail):
+    # A valid item alongside the invalid one still goes through
+    batch = {**batch, "update": batch.get("update", []) + [{"id": 2}]}
+    response = client.post(path, json=batch)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["detail"] for item in results if item["status"] == "error"] == [detail]
+    assert response.json()["summary"]["ok"] == 1
@@ -0,0 +1,30 @@
+import asyncio
+
+from langchain_core.documents import Document
+
+from tests.conftest import FakeChat
+
+EMAIL = "Hi team,\n\nThe launch review moves to Thursday at 3pm in room 4.\n\nThanks,\nAlice"
+
+
+def summarise(summariser, user_id: str, text: str = EMAIL) -> str:
+    return asyncio.run(summariser.summarize_and_update(user_id, [Document(page_content=text)]))
+
+
+def stored_ids(summariser, user_id: str) -> set[str]:
+    with summariser.vector_stores.use(summariser.get_persist_directory(user_id)) as db:
+        return set(db.get(include=[])["ids"])
+
+
+def test_resubmitted_email_returns_cached_summary(summariser):
+    first = summarise(summariser, "alice")
+    assert summarise(summariser, "alice") == first
+    assert len(FakeChat.prompts) == 1
+
+
+def test_summary_cache_is_per_user(summariser):
+    # Both users start with empty stores, so everything else in the key matches
+    summarise(summariser, "alice")
+    summarise(summariser, "bob")
+    assert len(FakeChat.prompts) == 2
+    assert stored_ids(summariser, "bob") == stored_ids(summariser, "alice") != set()
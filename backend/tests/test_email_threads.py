@@ -0,0 +1,76 @@
+import pytest
+
+from app.email_threads import normalise_thread
+
+CASES = [
+    (
+        "question about unsubscribing",
+        "Hi,\n\nCan you tell me how to unsubscribe from the vendor newsletter? "
+        "I keep getting it.\n\nBob",
+        "Hi,\n\nCan you tell me how to unsubscribe from the vendor newsletter? "
+        "I keep getting it.\n\nBob",
+    ),
+    (
+        "trailing disclaimer",
+        "Hi,\n\nThe contract is attached.\n\nThanks,\nBob\n\n"
+        "This email is confidential and may be privileged. If you have received "
+        "this email in error, please delete it.",
+        "Hi,\n\nThe contract is attached.\n\nThanks,\nBob",
+    ),
+    (
+        "trailing unsubscribe footer",
+        "New dates are out.\n\nTo unsubscribe from these updates, reply STOP.",
+        "New dates are out.",
+    ),
+    (
+        "bare double dash",
+        "Step 1\n--\nStep 2 is to restart the server.",
+        "Step 1\n--\nStep 2 is to restart the server.",
+    ),
+    (
+        "last signature delimiter",
+        "Part one\n-- \nPart two\n-- \nJane Doe\n+65 6123 4567",
+        "Part one\n--\nPart two",
+    ),
+    (
+        "valediction in a list",
+        "Agenda:\nBest\nWorst\nMiddle",
+        "Agenda:\nBest\nWorst\nMiddle",
+    ),
+    (
+        "valediction starting a paragraph",
+        "The deck is attached.\n\nRegards\nJane\n+65 9123 4567",
+        "The deck is attached.\n\nRegards\nJane",
+    ),
+    (
+        "sentence starting with a valediction",
+        "Thanks for the update.\n\nJane",
+        "Thanks for the update.\n\nJane",
+    ),
+    (
+        "signature with company name",
+        "See you at 3.\n\nBest regards,\nJane Doe\nSenior Manager, Acme Pte. Ltd.\n"
+        "Tel: +65 6123 4567\njane@acme.com",
+        "See you at 3.\n\nBest regards,\nJane Doe",
+    ),
+    (
+        "message after a valediction",
+        "Thanks,\nwe will proceed with the rollout on Monday.",
+        "Thanks,\nwe will proceed with the rollout on Monday.",
+    ),
+    (
+        "postscript",
+        "Sounds good.\n\nThanks,\nJane\n\nPS can you also book the room?",
+        "Sounds good.\n\nThanks,\nJane\n\nPS can you also book the room?",
+    ),
+    (
+        "mobile footer",
+        "Running late.\n\nSent from my iPhone",
+        "Running late.",
+    ),
+]
+
+
+@pytest.mark.parametrize("text,expected", [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_normalise_thread(text, expected):
+    assert normalise_thread(text) == expected
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.embedding_cache import CachedEmbeddings, EmbeddingCache, chunk_id
+from tests.conftest import FakeEmbeddings
+
+
+@pytest.fixture
+def embeddings(tmp_path):
+    return CachedEmbeddings(
+        FakeEmbeddings(), EmbeddingCache(str(tmp_path / "embeddings.db")), "model-a"
+    )
+
+
+def test_cache_is_keyed_on_model_and_normalised_text(embeddings):
+    first = embeddings.embed_documents(["Launch moves\nto Thursday."])
+    # Re-wrapped copy of the same text is a hit
+    assert embeddings.embed_documents(["Launch  moves to\n Thursday. "]) == first
+    assert embeddings.underlying.embedded == ["Launch moves\nto Thursday."]
+
+    other_model = CachedEmbeddings(embeddings.underlying, embeddings.cache, "model-b")
+    other_model.embed_documents(["Launch moves to Thursday."])
+    assert len(embeddings.underlying.embedded) == 2
+    assert embeddings.cache.stats()["hits"] == 1
+
+
+def test_duplicates_in_one_call_are_embedded_once(embeddings):
+    vectors = embeddings.embed_documents(["Room 4", "Budget", "Room  4", "Room 4"])
+    assert embeddings.underlying.embedded == ["Room 4", "Budget"]
+    assert vectors[0] == vectors[2] == vectors[3] != vectors[1]
+
+
+def test_sync_and_async_paths_agree(embeddings, tmp_path):
+    texts = ["Room 4", "Budget", "Room 4"]
+    async_embeddings = CachedEmbeddings(
+        FakeEmbeddings(), EmbeddingCache(str(tmp_path / "async.db")), "model-a"
+    )
+    expected = embeddings.embed_documents(texts)
+    assert asyncio.run(async_embeddings.aembed_documents(texts)) == expected
+    assert asyncio.run(async_embeddings.aembed_query("Budget")) == embeddings.embed_query("Budget")
+    # Vectors cached by the async path are served to the sync one
+    async_embeddings.underlying.embedded.clear()
+    assert async_embeddings.embed_documents(texts) == expected
+    assert async_embeddings.underlying.embedded == []
+
+
+def test_store_chunks_skips_ids_already_stored(summariser, tmp_path):
+    from langchain_core.documents import Document
+
+    directory = str(tmp_path / "alice")
+    first = Document(page_content="The launch review moves to Thursday.")
+    second = Document(page_content="The budget is approved.")
+    summariser.store_chunks(directory, {chunk_id(first.page_content): first})
+    embedded = summariser.EMBEDDINGS.underlying.embedded
+    assert embedded == [first.page_content]
+
+    summariser.store_chunks(
+        directory, {chunk_id(doc.page_content): doc for doc in (first, second)}
+    )
+    assert embedded == [first.page_content, second.page_content]
+    with summariser.vector_stores.use(directory) as db:
+        stored = db.get(include=[])["ids"]
+    assert sorted(stored) == sorted({chunk_id(first.page_content), chunk_id(second.page_content)})
@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+
+def test_find_slots_accepts_utc_times(client):
+    # What JavaScript's toISOString() sends
+    start = datetime(2025, 3, 3, 8, tzinfo=timezone.utc)
+    end = datetime(2025, 3, 5, 18, tzinfo=timezone.utc)
+    response = client.post(
+        "/meetings/find-slots",
+        json={
+            "participant_ids": [1, 2],
+            "duration_minutes": 30,
+            "start": start.isoformat().replace("+00:00", "Z"),
+            "end": end.isoformat().replace("+00:00", "Z"),
+        },
+    )
+    assert response.status_code == 200
+    local_start = start.astimezone().replace(tzinfo=None)
+    local_end = end.astimezone().replace(tzinfo=None)
+    slots = response.json()
+    assert slots
+    for slot in slots:
+        assert local_start <= datetime.fromisoformat(slot["start"]) < local_end
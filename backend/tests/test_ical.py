@@ -0,0 +1,35 @@
+from datetime import date, time
+
+from app.archive import archive_before
+from app.database import SessionLocal
+from app.models import Meeting
+
+
+def test_archiving_changes_export_etag(client):
+    db = SessionLocal()
+    try:
+        meeting = Meeting(
+            title="Old offsite",
+            date=date(2000, 1, 3),
+            start_time=time(9),
+            end_time=time(17),
+            color="#FF5733",
+        )
+        db.add(meeting)
+        db.commit()
+        uid = f"meeting-{meeting.id}@"
+
+        first = client.get("/calendar.ics")
+        assert first.status_code == 200
+        assert uid in first.text
+        etag = first.headers["etag"]
+        assert client.get("/calendar.ics", headers={"If-None-Match": etag}).status_code == 304
+
+        assert archive_before(db, date(2001, 1, 1))["meetings"] == 1
+    finally:
+        db.close()
+
+    second = client.get("/calendar.ics", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert uid not in second.text
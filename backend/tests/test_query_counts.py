@@ -0,0 +1,33 @@
+import pytest
+from app.query_counter import assert_max_queries
+from tests.conftest import SEEDED_ROWS
+
+# Statements per request, whatever the number of rows: BEGIN, the list
+# query, and one selectin query per eager-loaded relationship
+LIST_ENDPOINTS = [
+    ("/meetings/", 4),  # participants, categories
+    ("/tasks/", 4),  # participants, categories
+    ("/reminders/", 3),  # participants
+]
+
+
+@pytest.mark.parametrize("path,limit", LIST_ENDPOINTS)
+def test_list_endpoints_do_not_query_per_row(client, path, limit):
+    with assert_max_queries(limit):
+        response = client.get(path)
+    assert response.status_code == 200
+    assert len(response.json()) == SEEDED_ROWS
+    assert all(item["participants"] for item in response.json())
+
+
+def test_recurring_meetings_load_meetings_with_rules(client):
+    with assert_max_queries(2):  # BEGIN, rules joined to their meetings
+        response = client.get("/recurrences/")
+    assert response.status_code == 200
+    assert len(response.json()["recurring_meetings"]) == (SEEDED_ROWS + 3) // 4
+
+
+def test_assert_max_queries_reports_statements(client):
+    with pytest.raises(AssertionError, match="Expected at most 1 queries, got 4"):
+        with assert_max_queries(1):
+            client.get("/meetings/")
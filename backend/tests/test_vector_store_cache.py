@@ -0,0 +1,108 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+email_summariser = pytest.importorskip("app.email_summariser")
+
+
+class FakeStores:
+    """open_store/close_store hooks that record which stores are open."""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.opened: list[str] = []
+        self.closed: list[str] = []
+
+    def open(self, persist_directory: str) -> str:
+        time.sleep(self.delay)
+        self.opened.append(persist_directory)
+        return persist_directory
+
+    def close(self, store: str):
+        self.closed.append(store)
+
+
+def make_cache(stores: FakeStores, max_open: int = 2, idle_timeout: float = 600):
+    return email_summariser.VectorStoreCache(
+        max_open=max_open,
+        idle_timeout=idle_timeout,
+        open_store=stores.open,
+        close_store=stores.close,
+    )
+
+
+def use(cache, directory: str):
+    with cache.use(directory):
+        pass
+
+
+def test_least_recently_used_store_is_closed_at_capacity():
+    stores = FakeStores()
+    cache = make_cache(stores, max_open=2)
+    for directory in ("a", "b", "a", "c"):
+        use(cache, directory)
+    assert stores.opened == ["a", "b", "c"]
+    assert stores.closed == ["b"]
+    assert cache.stats()["open"] == 2
+
+
+def test_idle_store_is_closed_on_next_access(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(email_summariser, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    stores = FakeStores()
+    cache = make_cache(stores, max_open=4, idle_timeout=10)
+    use(cache, "a")
+    clock.now = 5
+    use(cache, "b")
+    clock.now = 12
+    use(cache, "b")
+    assert stores.closed == ["a"]
+    use(cache, "a")
+    assert stores.opened == ["a", "b", "a"]
+
+
+def test_store_evicted_while_in_use_is_closed_on_release():
+    stores = FakeStores()
+    cache = make_cache(stores, max_open=1)
+    with cache.use("a") as store:
+        use(cache, "b")
+        assert stores.closed == []
+        assert store == "a"
+    assert stores.closed == ["a"]
+    assert cache.stats()["open"] == 1
+
+
+def test_draining_store_is_taken_back_instead_of_reopened():
+    stores = FakeStores()
+    cache = make_cache(stores, max_open=1)
+    with cache.use("a"):
+        use(cache, "b")
+        # "a" is draining; using it again takes it back and evicts "b"
+        with cache.use("a") as store:
+            assert store == "a"
+        assert stores.closed == ["b"]
+    assert stores.opened == ["a", "b"]
+    assert stores.closed == ["b"]
+    cache.close_all()
+    assert stores.closed == ["b", "a"]
+
+
+def test_concurrent_first_use_opens_store_once():
+    stores = FakeStores(delay=0.05)
+    cache = make_cache(stores)
+    start = threading.Barrier(8)
+
+    def first_use():
+        start.wait()
+        use(cache, "a")
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stores.opened == ["a"]
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 7
@@ -1,6 +1,6 @@
 "use client"; // Ensures this component only renders on the client side
 
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import FullCalendar from "@fullcalendar/react";
 import dayGridPlugin from "@fullcalendar/daygrid";
 import timeGridPlugin from "@fullcalendar/timegrid";
@@ -47,8 +47,33 @@ const FullCalendarComponent = () => {
   const [reminder, setReminder] = useState("");
   const [color, setColor] = useState("#0000ff");
 
+  // Visible calendar window; set by FullCalendar whenever the user navigates
+  const [visibleRange, setVisibleRange] = useState(null);
+
+  const visibleRangeRef = useRef(null);
+
+  useEffect(() => {
+    visibleRangeRef.current = visibleRange;
+    fetchEvents(visibleRange);
+  }, [visibleRange]);
+
+  // Refetch the visible window whenever another user changes the schedule
   useEffect(() => {
-    fetchEvents();
+    const source = new EventSource("http://localhost:8000/events/stream");
+    const refresh = () => fetchEvents(visibleRangeRef.current);
+    [
+      "meetings.created",
+      "meetings.updated",
+      "meetings.deleted",
+      "tasks.created",
+      "tasks.updated",
+      "tasks.deleted",
+      "recurrence_rules.created",
+      "recurrence_rules.updated",
+      "recurrence_rules.deleted",
+      "resync",
+    ].forEach((type) => source.addEventListener(type, refresh));
+    return () => source.close();
   }, []);
 
   const handleEventClick = (clickInfo) => {
@@ -109,30 +134,44 @@ const FullCalendarComponent = () => {
     }
   };
 
-  const fetchEvents = async () => {
+  const fetchEvents = async (range = visibleRange) => {
+    if (!range) return;
+
     try {
       const currentUserEmail = localStorage.getItem("email");
 
-      const [meetingsResponse, tasksResponse, recurrencesResponse] =
-        await Promise.all([
-          fetch("http://localhost:8000/meetings/", { method: "GET" }),
-          fetch("http://localhost:8000/tasks/", { method: "GET" }),
-          fetch("http://localhost:8000/recurrences/", { method: "GET" }),
-        ]);
+      const params = new URLSearchParams(range);
+      const response = await fetch(
+        `http://localhost:8000/calendar/?${params.toString()}`,
+        { method: "GET" }
+      );
+      if (!response.ok) {
+        throw new Error("Failed to fetch calendar");
+      }
+      const calendar = await response.json();
 
-      const meetings = await meetingsResponse.json();
-      const tasks = await tasksResponse.json();
-      const recurrences = await recurrencesResponse.json();
+      // Participants and categories are sent once and referenced by id
+      const participantsById = Object.fromEntries(
+        calendar.participants.map((p) => [p.id, p])
+      );
+      const categoriesById = Object.fromEntries(
+        calendar.categories.map((c) => [c.id, c])
+      );
+      const resolve = (item) => ({
+        participants: item.participant_ids.map((id) => participantsById[id]),
+        categories: item.category_ids.map((id) => categoriesById[id]),
+      });
+      const includesCurrentUser = (participants) =>
+        participants.some((p) => p.email === currentUserEmail);
 
-      console.log("Recurrences Data:", recurrences);
+      const recurringById = Object.fromEntries(
+        calendar.recurring_meetings.map((r) => [r.meeting_id, r])
+      );
 
       const events = [
-        ...meetings
-          .filter(
-            (m) =>
-              Array.isArray(m.participants) &&
-              m.participants.some((p) => p.email === currentUserEmail)
-          )
+        ...calendar.meetings
+          .map((m) => ({ ...m, ...resolve(m) }))
+          .filter((m) => includesCurrentUser(m.participants))
           .map((m) => ({
             id: `meeting-${m.id}`,
             title: m.title,
@@ -146,12 +185,9 @@ const FullCalendarComponent = () => {
               categories: m.categories,
             },
           })),
-        ...tasks
-          .filter(
-            (t) =>
-              Array.isArray(t.participants) &&
-              t.participants.some((p) => p.email === currentUserEmail)
-          )
+        ...calendar.tasks
+          .map((t) => ({ ...t, ...resolve(t) }))
+          .filter((t) => includesCurrentUser(t.participants))
           .map((t) => ({
             id: `task-${t.id}`,
             title: t.title,
@@ -164,20 +200,27 @@ const FullCalendarComponent = () => {
               categories: t.categories,
             },
           })),
+        // Recurring meetings arrive already expanded for the visible window
+        ...calendar.occurrences.map((o) => {
+          const r = recurringById[o.meeting_id];
+          const { participants, categories } = resolve(r);
+          return {
+            id: `recurring-${r.recurrence_id}-${o.date}`,
+            title: r.title,
+            start: `${o.date}T${r.start_time}`,
+            end: `${o.date}T${r.end_time}`,
+            backgroundColor: r.color || "#3788d8",
+            extendedProps: {
+              description: r.description || "No description",
+              type: "Recurring Meeting",
+              recurrence: r.frequency,
+              participants,
+              categories,
+            },
+          };
+        }),
       ];
 
-      if (
-        recurrences.recurring_meetings &&
-        Array.isArray(recurrences.recurring_meetings)
-      ) {
-        recurrences.recurring_meetings.forEach((item) => {
-          const expandedMeetings = expandRecurringMeeting(item);
-          console.log("Expanded Meetings for Recurrence:", expandedMeetings);
-          events.push(...expandedMeetings);
-        });
-      }
-
-      console.log("Final Events to Set:", events);
       setCurrentEvents(events);
     } catch (error) {
       console.error("Error fetching events:", error.message);
@@ -185,64 +228,18 @@ const FullCalendarComponent = () => {
     }
   };
 
-  const expandRecurringMeeting = (recurrence) => {
-    const {
-      recurrence_id,
-      title,
-      description,
-      date,
-      start_time,
-      end_time,
-      frequency,
-      interval,
-      color,
-      end_date,
-    } = recurrence;
-
-    const events = [];
-    const startDate = dayjs(date);
-    const calculatedEndDate = end_date
-      ? dayjs(end_date)
-      : dayjs().add(1, "year"); // Default to one year from now if end_date is null
-
-    console.log(`Expanding Recurrence ${recurrence_id}:`, recurrence);
-
-    let currentDate = startDate;
-
-    while (
-      currentDate.isBefore(calculatedEndDate) ||
-      currentDate.isSame(calculatedEndDate)
-    ) {
-      events.push({
-        id: `recurring-${recurrence_id}-${currentDate.format("YYYY-MM-DD")}`,
-        title,
-        start: `${currentDate.format("YYYY-MM-DD")}T${start_time}`,
-        end: `${currentDate.format("YYYY-MM-DD")}T${end_time}`,
-        backgroundColor: color || "#3788d8", // Default color fallback
-        extendedProps: {
-          description: description || "No description",
-          type: "Recurring Meeting",
-          recurrence: frequency,
-        },
-      });
-
-      // Increment currentDate based on the frequency
-      if (frequency === "daily") {
-        currentDate = currentDate.add(interval, "day");
-      } else if (frequency === "weekly") {
-        currentDate = currentDate.add(interval, "week");
-      } else if (frequency === "monthly") {
-        currentDate = currentDate.add(interval, "month");
-      } else if (frequency === "yearly") {
-        currentDate = currentDate.add(interval, "year");
-      }
-    }
+  const CALENDAR_VIEWS = {
+    dayGridMonth: "month",
+    timeGridWeek: "week",
+    timeGridDay: "day",
+  };
 
-    // Remove the base event from the expanded list (if it exists)
-    return events.filter(
-      (event) =>
-        event.start !== `${startDate.format("YYYY-MM-DD")}T${start_time}`
-    );
+  const handleDatesSet = (dateInfo) => {
+    setVisibleRange({
+      start: dayjs(dateInfo.start).format("YYYY-MM-DD"),
+      end: dayjs(dateInfo.end).format("YYYY-MM-DD"),
+      view: CALENDAR_VIEWS[dateInfo.view.type] || "month",
+    });
   };
 
   const handleDateSelect = (selectInfo) => {
@@ -376,6 +373,7 @@ const FullCalendarComponent = () => {
           dayMaxEvents={true}
           weekends={weekendsVisible}
           events={currentEvents}
+          datesSet={handleDatesSet}
           eventClick={handleEventClick}
           select={handleDateSelect}
         />